@@ -0,0 +1,80 @@
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.analytics import (
+    CategoryDistribution,
+    CategoryMonthTotal,
+    DailyPoint,
+    MerchantTotal,
+    MonthlySummary,
+)
+from app.services.analytics import (
+    analytics_service,
+    category_percentiles,
+    daily_series,
+    monthly_summary,
+    spending_by_category_month,
+    top_merchants,
+)
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/spending", response_model=List[CategoryMonthTotal])
+async def get_spending_by_category(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user: User = Depends(get_current_user),
+):
+    """Spend per category per month"""
+    frame = await analytics_service.get_frame(current_user.id)
+    return spending_by_category_month(frame.between(start, end))
+
+
+@router.get("/monthly", response_model=List[MonthlySummary])
+async def get_monthly_summary(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user: User = Depends(get_current_user),
+):
+    """Income, spending and net per month with month-over-month change"""
+    frame = await analytics_service.get_frame(current_user.id)
+    return monthly_summary(frame.between(start, end))
+
+
+@router.get("/daily", response_model=List[DailyPoint])
+async def get_daily_series(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    window: int = Query(30, ge=1, le=366),
+    opening_balance: float = 0.0,
+    current_user: User = Depends(get_current_user),
+):
+    """Daily spending, running balance and trailing-window spending"""
+    frame = await analytics_service.get_frame(current_user.id)
+    return daily_series(frame.between(start, end), window, opening_balance)
+
+
+@router.get("/percentiles", response_model=List[CategoryDistribution])
+async def get_category_percentiles(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user: User = Depends(get_current_user),
+):
+    """Purchase size distribution per category"""
+    frame = await analytics_service.get_frame(current_user.id)
+    return category_percentiles(frame.between(start, end))
+
+
+@router.get("/merchants", response_model=List[MerchantTotal])
+async def get_top_merchants(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+):
+    """Merchants with the highest spend"""
+    frame = await analytics_service.get_frame(current_user.id)
+    return top_merchants(frame.between(start, end), limit)
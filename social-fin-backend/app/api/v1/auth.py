@@ -2,11 +2,13 @@ from fastapi import (
     APIRouter,
     Depends,
     HTTPException,
+    Request,
+    Response,
     status,
     BackgroundTasks,
 )
 
-from typing import Optional
+from typing import List, Optional, Tuple
 from app.schemas.auth import (
     Token,
     TokenRefresh,
@@ -16,24 +18,48 @@ from app.schemas.auth import (
     PasswordReset,
     PasswordChange,
     EmailVerification,
+    EmailResend,
+    SessionResponse,
 )
+from app.config import settings
 from app.services.auth import AuthService
-from app.dependencies import get_current_user
+from app.services.session import session_service
+from app.core.security import security_utils
+from app.dependencies import get_current_user, oauth2_scheme
 from app.models.user import User
+from app.utils.etag import make_etag, check_not_modified
 from fastapi.responses import HTMLResponse
 from app.core.exceptions import (
     UserAlreadyExistsError,
     InvalidCredentialsError,
     UserNotFoundError,
     InvalidTokenError,
+    VerificationAttemptsExceededError,
+    VerificationResendThrottledError,
 )
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 auth_service = AuthService()
 
 
+def _client_info(request: Request) -> Tuple[Optional[str], Optional[str]]:
+    """Device label and IP address recorded on new sessions"""
+    device = request.headers.get("X-Device-Name") or request.headers.get("User-Agent")
+    ip_address = request.client.host if request.client else None
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    if forwarded_for:
+        ip_address = forwarded_for.split(",")[0].strip()
+    return device, ip_address
+
+
+def _session_id(token: str) -> Optional[str]:
+    """Session ID carried by an access token"""
+    payload = security_utils.decode_token(token)
+    return payload.get("sid") if payload else None
+
+
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, background_tasks: BackgroundTasks):
+async def register(user_data: UserCreate, request: Request):
     """
     Register a new user
 
@@ -45,11 +71,7 @@ async def register(user_data: UserCreate, background_tasks: BackgroundTasks):
     """
     try:
         print("Registering user:", user_data.email)
-        tokens = await auth_service.register(user_data)
-
-        # Send welcome email in background
-        # background_tasks.add_task(send_welcome_email, user_data.email, user_data.first_name)
-
+        tokens = await auth_service.register(user_data, *_client_info(request))
         return tokens
     except UserAlreadyExistsError as e:
         raise HTTPException(
@@ -64,6 +86,7 @@ async def register(user_data: UserCreate, background_tasks: BackgroundTasks):
 
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     # form_data: Optional[OAuth2PasswordRequestForm] = Depends(),
     json_data: Optional[UserLogin] = None,
 ):
@@ -86,7 +109,7 @@ async def login(
         )
 
     try:
-        tokens = await auth_service.login(email, password)
+        tokens = await auth_service.login(email, password, *_client_info(request))
         return tokens
     except InvalidCredentialsError:
         raise HTTPException(
@@ -118,12 +141,15 @@ async def refresh_token(token_data: TokenRefresh):
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(
+    current_user: User = Depends(get_current_user),
+    token: str = Depends(oauth2_scheme),
+):
     """
-    Logout current user by invalidating refresh token
+    Logout current user by invalidating refresh token and access token
     """
     try:
-        await auth_service.logout(current_user.id)
+        await auth_service.logout(current_user.id, token)
     except Exception as e:
         # Even if logout fails, we return success to the client
         pass
@@ -164,14 +190,21 @@ async def reset_password(reset_data: PasswordReset):
 
 @router.post("/password/change", status_code=status.HTTP_204_NO_CONTENT)
 async def change_password(
-    password_data: PasswordChange, current_user: User = Depends(get_current_user)
+    password_data: PasswordChange,
+    current_user: User = Depends(get_current_user),
+    token: str = Depends(oauth2_scheme),
 ):
     """
     Change password for authenticated user
+
+    Every other signed-in device is signed out.
     """
     try:
         await auth_service.change_password(
-            current_user.id, password_data.current_password, password_data.new_password
+            current_user.id,
+            password_data.current_password,
+            password_data.new_password,
+            current_session_id=_session_id(token),
         )
     except InvalidCredentialsError as e:
         raise HTTPException(
@@ -191,25 +224,70 @@ async def verify_email(verification: EmailVerification):
     """
     try:
         success = await auth_service.verify_email(verification.email, verification.code)
-        if success:
-            return {"message": "Email verified successfully"}
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid verification code",
-            )
+    except VerificationAttemptsExceededError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e)
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Email verification failed. Please try again.",
         ) from e
 
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired verification code",
+        )
+    return {"message": "Email verified successfully"}
+
+
+@router.post("/email/resend", response_model=dict)
+async def resend_verification_email(resend: EmailResend):
+    """
+    Send a new email verification code
+
+    Replaces any earlier code. Limited to one request per address per
+    cooldown period.
+    """
+    try:
+        message = await auth_service.resend_verification_code(resend.email)
+    except VerificationResendThrottledError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(settings.verification_resend_cooldown_seconds)},
+        ) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not send a verification code. Please try again.",
+        ) from e
+    return {"message": message}
+
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+):
     """
     Get current user information
+
+    Supports conditional requests: send the last `ETag` back in
+    `If-None-Match` to get a 304 without a body when nothing changed.
     """
+    etag = make_etag(
+        current_user.id,
+        current_user.updated_at.isoformat(),
+        current_user.email,
+        current_user.is_verified,
+    )
+    not_modified = check_not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+
     return UserResponse(
         id=current_user.id,
         email=current_user.email,
@@ -222,6 +300,55 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
     )
 
 
+@router.get("/sessions", response_model=List[SessionResponse])
+async def list_sessions(
+    current_user: User = Depends(get_current_user),
+    token: str = Depends(oauth2_scheme),
+):
+    """
+    List the devices signed in to this account, most recently used first
+    """
+    current_session_id = _session_id(token)
+    sessions = await session_service.list_sessions(current_user.id)
+    return [
+        SessionResponse(
+            id=session.id,
+            device=session.device,
+            ip_address=session.ip_address,
+            created_at=session.created_at,
+            last_used_at=session.last_used_at,
+            current=session.id == current_session_id,
+        )
+        for session in sessions
+    ]
+
+
+@router.delete("/sessions", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_other_sessions(
+    current_user: User = Depends(get_current_user),
+    token: str = Depends(oauth2_scheme),
+):
+    """
+    Sign out every device except the current one
+    """
+    await session_service.revoke_all(
+        current_user.id, except_session_id=_session_id(token)
+    )
+
+
+@router.delete("/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_session(
+    session_id: str, current_user: User = Depends(get_current_user)
+):
+    """
+    Sign out a single device
+    """
+    if not await session_service.revoke(current_user.id, session_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
+        )
+
+
 @router.get("/email-verified", response_class=HTMLResponse)
 async def email_verified_page():
     """
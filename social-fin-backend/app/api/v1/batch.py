@@ -0,0 +1,198 @@
+import asyncio
+import logging
+from typing import List, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.middleware.asyncexitstack import AsyncExitStackMiddleware
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.types import ASGIApp, Message
+from app.config import settings
+from app.core.serialization import dumps_bytes, loads
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.batch import (
+    BatchRequest,
+    BatchRequestItem,
+    BatchResponse,
+    BatchResponseItem,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["batch"])
+
+API_PREFIX = "/api/v1"
+BATCH_PATH = f"{API_PREFIX}/batch"
+
+# Headers taken from the outer request; sub-requests can't override them
+FORWARDED_HEADERS = ["authorization", "accept-language", "user-agent"]
+BLOCKED_HEADERS = {"authorization", "host", "content-length", "transfer-encoding"}
+
+# Endpoints that take credentials or codes. Sub-requests skip the
+# middleware stack, so batching these would get around the per-path
+# limits that guard them against brute force.
+CREDENTIAL_PATHS = {
+    f"{API_PREFIX}/auth/register",
+    f"{API_PREFIX}/auth/login",
+    f"{API_PREFIX}/auth/refresh",
+    f"{API_PREFIX}/auth/password/forgot",
+    f"{API_PREFIX}/auth/password/reset",
+    f"{API_PREFIX}/auth/password/change",
+    f"{API_PREFIX}/auth/email/verify",
+    f"{API_PREFIX}/auth/email/resend",
+}
+
+
+def _build_dispatch_app(request: Request) -> ASGIApp:
+    """
+    Route sub-requests straight to the app's router.
+
+    Only exception handling is kept from the middleware stack, so rate
+    limiting, logging and CORS are applied once to the batch itself.
+    """
+    app = request.app
+    handlers = {
+        key: handler
+        for key, handler in app.exception_handlers.items()
+        if key not in (500, Exception)
+    }
+    return ExceptionMiddleware(
+        AsyncExitStackMiddleware(app.router), handlers=handlers, debug=app.debug
+    )
+
+
+def _sub_request_path(path: str) -> Tuple[str, str]:
+    """Normalize a sub-request path and split off its query string"""
+    path, _, query = path.partition("?")
+    if not path.startswith("/"):
+        path = f"/{path}"
+    if not path.startswith(API_PREFIX):
+        path = f"{API_PREFIX}{path}"
+    return path, query
+
+
+async def _dispatch(
+    dispatch_app: ASGIApp, request: Request, item: BatchRequestItem, principal: User
+) -> BatchResponseItem:
+    """Run a single sub-request in-process and capture its response"""
+    path, query = _sub_request_path(item.path)
+    if path.rstrip("/") == BATCH_PATH:
+        return BatchResponseItem(
+            id=item.id,
+            status=status.HTTP_400_BAD_REQUEST,
+            body={"detail": "Batch requests cannot be nested"},
+        )
+    if path.rstrip("/") in CREDENTIAL_PATHS:
+        return BatchResponseItem(
+            id=item.id,
+            status=status.HTTP_400_BAD_REQUEST,
+            body={"detail": "Authentication requests cannot be batched"},
+        )
+
+    body = b"" if item.body is None else dumps_bytes(item.body)
+    headers: List[Tuple[bytes, bytes]] = [
+        (name.encode("latin-1"), value.encode("latin-1"))
+        for name, value in request.headers.items()
+        if name in FORWARDED_HEADERS
+    ]
+    headers += [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in item.headers.items()
+        if name.lower() not in BLOCKED_HEADERS
+    ]
+    if body:
+        headers.append((b"content-type", b"application/json"))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": item.method,
+        "scheme": request.url.scheme,
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query.encode("latin-1"),
+        "headers": headers,
+        "app": request.app,
+        # Lets get_current_user skip re-authenticating every sub-request
+        "state": {**request.scope.get("state", {}), "principal": principal},
+    }
+
+    body_sent = False
+
+    async def receive() -> Message:
+        nonlocal body_sent
+        if body_sent:
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    response_status = status.HTTP_500_INTERNAL_SERVER_ERROR
+    response_headers: dict = {}
+    chunks: List[bytes] = []
+
+    async def send(message: Message):
+        nonlocal response_status, response_headers
+        if message["type"] == "http.response.start":
+            response_status = message["status"]
+            response_headers = {
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in message.get("headers", [])
+            }
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await dispatch_app(scope, receive, send)
+    except Exception as e:
+        logger.error("Batch sub-request %s %s failed: %s", item.method, path, e)
+        return BatchResponseItem(
+            id=item.id,
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            body={"detail": "Internal server error"},
+        )
+
+    raw_body = b"".join(chunks)
+    response_headers.pop("content-length", None)
+    if not raw_body:
+        parsed_body = None
+    elif response_headers.get("content-type", "").startswith("application/json"):
+        parsed_body = loads(raw_body)
+    else:
+        parsed_body = raw_body.decode("utf-8", errors="replace")
+
+    return BatchResponseItem(
+        id=item.id, status=response_status, headers=response_headers, body=parsed_body
+    )
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch(
+    batch_request: BatchRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Run several API requests in one round trip
+
+    Sub-requests run concurrently against the v1 routers, sharing the
+    batch's authentication and rate-limit accounting. Each item in the
+    response carries its own status code, headers and body, in request order.
+    """
+    if len(batch_request.requests) > settings.batch_max_requests:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch can contain at most {settings.batch_max_requests} requests",
+        )
+
+    dispatch_app = _build_dispatch_app(request)
+    responses = await asyncio.gather(
+        *[
+            _dispatch(dispatch_app, request, item, current_user)
+            for item in batch_request.requests
+        ]
+    )
+    return BatchResponse(responses=list(responses))
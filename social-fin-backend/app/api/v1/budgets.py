@@ -0,0 +1,48 @@
+import re
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.budget import BudgetTotalsResponse
+from app.services.budgets import budget_service, period_of
+from app.utils.etag import make_etag, check_not_modified
+
+router = APIRouter(prefix="/budgets", tags=["budgets"])
+
+PERIOD_PATTERN = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+
+@router.get("", response_model=BudgetTotalsResponse)
+async def get_budget_totals(
+    request: Request,
+    response: Response,
+    period: Optional[str] = Query(None, description="Month as YYYY-MM"),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get spending per category for a month
+
+    - **period**: Defaults to the current month
+    """
+    period = period or period_of(date.today())
+    if not PERIOD_PATTERN.match(period):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Period must be formatted as YYYY-MM",
+        )
+
+    totals = await budget_service.get_totals(current_user.id, period)
+
+    etag = make_etag(current_user.id, period, sorted(totals.categories.items()))
+    not_modified = check_not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    return BudgetTotalsResponse(
+        period=period,
+        total=totals.total / 100,
+        categories={
+            category: cents / 100 for category, cents in totals.categories.items()
+        },
+    )
@@ -0,0 +1,142 @@
+from typing import List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from app.core.exceptions import ChallengeAccessError, ChallengeNotFoundError
+from app.dependencies import get_current_user
+from app.models.challenge import Challenge
+from app.models.user import User
+from app.schemas.challenges import (
+    ChallengeCreate,
+    ChallengeResponse,
+    LeaderboardEntryResponse,
+    StandingResponse,
+)
+from app.services.leaderboards import (
+    LeaderboardEntry,
+    Standing,
+    display_value,
+    leaderboard_service,
+)
+
+router = APIRouter(prefix="/challenges", tags=["challenges"])
+
+
+def _challenge_response(challenge: Challenge) -> ChallengeResponse:
+    return ChallengeResponse(**challenge.to_dict())
+
+
+def _entry_response(
+    challenge: Challenge, entry: LeaderboardEntry
+) -> LeaderboardEntryResponse:
+    return LeaderboardEntryResponse(
+        rank=entry.rank,
+        user_id=entry.user_id,
+        value=display_value(challenge, entry.score),
+    )
+
+
+def _standing_response(challenge: Challenge, standing: Standing) -> StandingResponse:
+    return StandingResponse(
+        rank=standing.rank,
+        participants=standing.participants,
+        neighbors=[_entry_response(challenge, e) for e in standing.neighbors],
+    )
+
+
+async def _participating_challenge(challenge_id: UUID, user: User) -> Challenge:
+    """Load a challenge the user takes part in; 404 otherwise"""
+    try:
+        challenge = await leaderboard_service.get_challenge(str(challenge_id))
+    except ChallengeNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    if not await leaderboard_service.is_participant(challenge.id, user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Challenge not found"
+        )
+    return challenge
+
+
+@router.get("", response_model=List[ChallengeResponse])
+async def get_challenges(current_user: User = Depends(get_current_user)):
+    """Get the challenges the current user takes part in"""
+    challenges = await leaderboard_service.user_challenges(current_user.id)
+    return [_challenge_response(challenge) for challenge in challenges]
+
+
+@router.post("", response_model=ChallengeResponse, status_code=status.HTTP_201_CREATED)
+async def create_challenge(
+    challenge_data: ChallengeCreate,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Start a challenge among friends
+
+    - **savings**: Most saved (income minus spending) over the months wins
+    - **category_spending**: Least spent in `category` wins
+    """
+    challenge = await leaderboard_service.create_challenge(
+        current_user.id,
+        challenge_data.name,
+        challenge_data.metric.value,
+        challenge_data.category,
+        challenge_data.start_period,
+        challenge_data.end_period,
+    )
+    return _challenge_response(challenge)
+
+
+@router.post("/{challenge_id}/join", response_model=StandingResponse)
+async def join_challenge(
+    challenge_id: UUID, current_user: User = Depends(get_current_user)
+):
+    """Join a friend's challenge"""
+    try:
+        challenge = await leaderboard_service.get_challenge(str(challenge_id))
+        standing = await leaderboard_service.join(challenge.id, current_user.id)
+    except ChallengeNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    except ChallengeAccessError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e)) from e
+    return _standing_response(challenge, standing)
+
+
+@router.delete("/{challenge_id}/join", status_code=status.HTTP_204_NO_CONTENT)
+async def leave_challenge(
+    challenge_id: UUID, current_user: User = Depends(get_current_user)
+):
+    """Leave a challenge"""
+    try:
+        await leaderboard_service.leave(str(challenge_id), current_user.id)
+    except ChallengeNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get(
+    "/{challenge_id}/leaderboard", response_model=List[LeaderboardEntryResponse]
+)
+async def get_leaderboard(
+    challenge_id: UUID,
+    limit: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the leading participants"""
+    challenge = await _participating_challenge(challenge_id, current_user)
+    entries = await leaderboard_service.top(challenge.id, limit)
+    return [_entry_response(challenge, entry) for entry in entries]
+
+
+@router.get("/{challenge_id}/standing", response_model=StandingResponse)
+async def get_standing(
+    challenge_id: UUID,
+    around: int = Query(5, ge=0, le=25),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get the current user's rank and the participants around them
+
+    - **around**: Participants to include on each side
+    """
+    challenge = await _participating_challenge(challenge_id, current_user)
+    standing = await leaderboard_service.standing(challenge.id, current_user.id, around)
+    return _standing_response(challenge, standing)
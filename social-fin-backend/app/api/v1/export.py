@@ -0,0 +1,36 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.export import ExportFormat
+from app.services.export import MEDIA_TYPES, export_service, parquet_available
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+@router.get("/transactions")
+async def export_transactions(
+    format: ExportFormat = Query(ExportFormat.CSV),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Download every transaction as a file
+
+    - **format**: `csv`, `ndjson` (one JSON object per line) or `parquet`
+
+    The file is streamed as it is read, so large histories start
+    downloading at once.
+    """
+    if format == ExportFormat.PARQUET and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export is not available",
+        )
+
+    filename = f"transactions-{date.today().isoformat()}.{format.value}"
+    return StreamingResponse(
+        export_service.stream(current_user.id, format.value),
+        media_type=MEDIA_TYPES[format.value],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,63 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.dependencies import get_current_user
+from app.models.activity import Activity
+from app.models.user import User
+from app.schemas.feed import ActivityCreate, ActivityResponse, FeedPageResponse
+from app.services.feed import feed_service
+
+router = APIRouter(prefix="/feed", tags=["feed"])
+
+
+def _activity_response(activity: Activity) -> ActivityResponse:
+    return ActivityResponse(
+        id=activity.id,
+        actor_id=activity.actor_id,
+        type=activity.type,
+        payload=activity.payload,
+        created_at=activity.created_at,
+    )
+
+
+@router.get("", response_model=FeedPageResponse)
+async def get_feed(
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get friends' activity, newest first
+
+    - **cursor**: `next_cursor` from the previous page
+    - **limit**: Page size (defaults to the configured feed page size)
+    """
+    try:
+        page = await feed_service.read(current_user.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return FeedPageResponse(
+        items=[_activity_response(activity) for activity in page.items],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.post(
+    "", response_model=ActivityResponse, status_code=status.HTTP_201_CREATED
+)
+async def publish_activity(
+    activity_data: ActivityCreate,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Share an activity with friends
+
+    Only `savings_milestone` can be posted; challenge and expense activity
+    is published by the server.
+    """
+    activity = await feed_service.publish(
+        current_user.id,
+        activity_data.type.value,
+        activity_data.payload.model_dump(exclude_none=True),
+    )
+    return _activity_response(activity)
@@ -0,0 +1,109 @@
+from typing import List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.friends import (
+    FriendListResponse,
+    FriendRequestResponse,
+    FriendSuggestionResponse,
+    MutualCountsResponse,
+)
+from app.services.friend_graph import friend_graph_service
+from app.services.friends import friend_service
+
+router = APIRouter(prefix="/friends", tags=["friends"])
+
+MAX_MUTUAL_LOOKUPS = 100
+
+
+def _other_user(current_user: User, user_id: UUID) -> str:
+    other_id = str(user_id)
+    if other_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot befriend yourself",
+        )
+    return other_id
+
+
+@router.get("", response_model=FriendListResponse)
+async def get_friends(current_user: User = Depends(get_current_user)):
+    """Get the current user's friends"""
+    friends = await friend_service.friends_of(current_user.id)
+    return FriendListResponse(friends=sorted(friends))
+
+
+@router.get("/suggestions", response_model=List[FriendSuggestionResponse])
+async def get_friend_suggestions(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+):
+    """Get friends of friends, most mutual friends first"""
+    suggestions = await friend_graph_service.suggestions(current_user.id, limit)
+    return [
+        FriendSuggestionResponse(user_id=user_id, mutual_friends=count)
+        for user_id, count in suggestions
+    ]
+
+
+@router.get("/mutual", response_model=MutualCountsResponse)
+async def get_mutual_counts(
+    user_ids: str = Query(..., description="Comma-separated user IDs"),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Count mutual friends with each of several users
+
+    - **user_ids**: Up to 100 IDs, e.g. the people on screen
+    """
+    requested = list(dict.fromkeys(uid.strip() for uid in user_ids.split(",")))
+    requested = [uid for uid in requested if uid]
+    if len(requested) > MAX_MUTUAL_LOOKUPS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_MUTUAL_LOOKUPS} user IDs per request",
+        )
+    try:
+        requested = [str(UUID(uid)) for uid in requested]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid user ID"
+        ) from e
+
+    counts = await friend_graph_service.mutual_counts(current_user.id, requested)
+    return MutualCountsResponse(counts=counts)
+
+
+@router.get("/{user_id}/mutual", response_model=FriendListResponse)
+async def get_mutual_friends(
+    user_id: UUID, current_user: User = Depends(get_current_user)
+):
+    """Get the friends shared with another user"""
+    other_id = _other_user(current_user, user_id)
+    mutual = await friend_graph_service.mutual_friends(current_user.id, other_id)
+    return FriendListResponse(friends=mutual)
+
+
+@router.post("/{user_id}", response_model=FriendRequestResponse)
+async def request_friend(user_id: UUID, current_user: User = Depends(get_current_user)):
+    """
+    Send a friend request, or accept one from this user
+
+    Returns `accepted` once the two users are friends, `pending` otherwise.
+    """
+    other_id = _other_user(current_user, user_id)
+    result = await friend_service.request_friend(current_user.id, other_id)
+    return FriendRequestResponse(status=result)
+
+
+@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_friend(user_id: UUID, current_user: User = Depends(get_current_user)):
+    """Unfriend, or cancel or decline a friend request"""
+    other_id = _other_user(current_user, user_id)
+    if not await friend_service.remove_friend(current_user.id, other_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No friendship or request with this user",
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,220 @@
+from typing import List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from app.core.exceptions import GroupAccessError, GroupNotFoundError
+from app.dependencies import get_current_user
+from app.models.group import ExpenseGroup, GroupExpense
+from app.models.user import User
+from app.schemas.groups import (
+    BalancesResponse,
+    ExpenseCreate,
+    ExpenseResponse,
+    GroupCreate,
+    GroupMemberAdd,
+    GroupResponse,
+    SettlementCreate,
+    SettleUpResponse,
+    TransferResponse,
+)
+from app.services.groups import group_service, split_equally
+
+router = APIRouter(prefix="/groups", tags=["groups"])
+
+
+def _group_response(group: ExpenseGroup) -> GroupResponse:
+    return GroupResponse(
+        id=group.id,
+        name=group.name,
+        created_by=group.created_by,
+        created_at=group.created_at,
+    )
+
+
+def _expense_response(expense: GroupExpense) -> ExpenseResponse:
+    return ExpenseResponse(
+        id=expense.id,
+        paid_by=expense.paid_by,
+        amount=expense.amount_cents / 100,
+        shares={user_id: cents / 100 for user_id, cents in expense.shares.items()},
+        description=expense.description,
+        kind=expense.kind,
+        created_at=expense.created_at,
+    )
+
+
+def _not_found(e: GroupNotFoundError) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get("", response_model=List[GroupResponse])
+async def get_groups(current_user: User = Depends(get_current_user)):
+    """Get the groups the current user belongs to"""
+    groups = await group_service.user_groups(current_user.id)
+    return [_group_response(group) for group in groups]
+
+
+@router.post("", response_model=GroupResponse, status_code=status.HTTP_201_CREATED)
+async def create_group(
+    group_data: GroupCreate, current_user: User = Depends(get_current_user)
+):
+    """Start a group with some friends"""
+    try:
+        group = await group_service.create_group(
+            current_user.id, group_data.name, group_data.member_ids
+        )
+    except GroupAccessError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e)) from e
+    return _group_response(group)
+
+
+@router.get("/{group_id}", response_model=GroupResponse)
+async def get_group(group_id: UUID, current_user: User = Depends(get_current_user)):
+    """Get a group the current user belongs to"""
+    try:
+        group = await group_service.get_group(str(group_id), current_user.id)
+    except GroupNotFoundError as e:
+        raise _not_found(e) from e
+    return _group_response(group)
+
+
+@router.post("/{group_id}/members", status_code=status.HTTP_204_NO_CONTENT)
+async def add_member(
+    group_id: UUID,
+    member: GroupMemberAdd,
+    current_user: User = Depends(get_current_user),
+):
+    """Add a friend to the group"""
+    try:
+        await group_service.add_member(str(group_id), current_user.id, member.user_id)
+    except GroupNotFoundError as e:
+        raise _not_found(e) from e
+    except GroupAccessError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e)) from e
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post(
+    "/{group_id}/expenses",
+    response_model=ExpenseResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_expense(
+    group_id: UUID,
+    expense_data: ExpenseCreate,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Add an expense to the group
+
+    - **participant_ids**: Split evenly among these members (default: everyone)
+    - **shares**: Or split by exact amounts, which must add up to `amount`
+    """
+    amount_cents = round(expense_data.amount * 100)
+    try:
+        if expense_data.shares is not None:
+            shares = {
+                user_id: round(amount * 100)
+                for user_id, amount in expense_data.shares.items()
+            }
+        else:
+            participants = expense_data.participant_ids
+            if participants is None:
+                balances = await group_service.get_balances(str(group_id))
+                participants = list(balances)
+            shares = split_equally(amount_cents, participants)
+
+        expense = await group_service.add_expense(
+            str(group_id),
+            current_user.id,
+            amount_cents,
+            shares,
+            description=expense_data.description,
+            paid_by=expense_data.paid_by,
+        )
+    except GroupNotFoundError as e:
+        raise _not_found(e) from e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    return _expense_response(expense)
+
+
+@router.delete(
+    "/{group_id}/expenses/{expense_id}", status_code=status.HTTP_204_NO_CONTENT
+)
+async def delete_expense(
+    group_id: UUID,
+    expense_id: UUID,
+    current_user: User = Depends(get_current_user),
+):
+    """Delete an expense or settlement, reversing its effect on balances"""
+    try:
+        await group_service.delete_expense(
+            str(group_id), current_user.id, str(expense_id)
+        )
+    except GroupNotFoundError as e:
+        raise _not_found(e) from e
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/{group_id}/balances", response_model=BalancesResponse)
+async def get_balances(group_id: UUID, current_user: User = Depends(get_current_user)):
+    """
+    Get every member's net balance
+
+    Positive means the member is owed money, negative that they owe.
+    """
+    try:
+        await group_service.require_member(str(group_id), current_user.id)
+    except GroupNotFoundError as e:
+        raise _not_found(e) from e
+    balances = await group_service.get_balances(str(group_id))
+    return BalancesResponse(
+        balances={user_id: cents / 100 for user_id, cents in balances.items()}
+    )
+
+
+@router.get("/{group_id}/settle-up", response_model=SettleUpResponse)
+async def get_settle_up(group_id: UUID, current_user: User = Depends(get_current_user)):
+    """Get a short list of payments that would settle every balance"""
+    try:
+        await group_service.require_member(str(group_id), current_user.id)
+    except GroupNotFoundError as e:
+        raise _not_found(e) from e
+    transfers = await group_service.settle_up_plan(str(group_id))
+    return SettleUpResponse(
+        transfers=[
+            TransferResponse(
+                from_user_id=debtor, to_user_id=creditor, amount=cents / 100
+            )
+            for debtor, creditor, cents in transfers
+        ]
+    )
+
+
+@router.post(
+    "/{group_id}/settlements",
+    response_model=ExpenseResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def record_settlement(
+    group_id: UUID,
+    settlement: SettlementCreate,
+    current_user: User = Depends(get_current_user),
+):
+    """Record a payment from the current user to another member"""
+    try:
+        expense = await group_service.settle(
+            str(group_id),
+            current_user.id,
+            settlement.to_user_id,
+            round(settlement.amount * 100),
+        )
+    except GroupNotFoundError as e:
+        raise _not_found(e) from e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    return _expense_response(expense)
@@ -0,0 +1,62 @@
+import json
+import logging
+from typing import AsyncIterator
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from app.core.exceptions import LLMError
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.insights import InsightResponse
+from app.services.insights import insight_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/insights", tags=["insights"])
+
+
+def _event(data: dict, event: str = "") -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@router.get("", response_model=InsightResponse)
+async def get_insight(current_user: User = Depends(get_current_user)):
+    """Get observations and suggestions about recent spending"""
+    try:
+        insight = await insight_service.get_insight(current_user.id)
+    except LLMError as e:
+        logger.error("Insight generation failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Insights are unavailable right now",
+        ) from e
+    return InsightResponse(
+        text=insight.text, generated_at=insight.generated_at, cached=insight.cached
+    )
+
+
+@router.get("/stream")
+async def stream_insight(current_user: User = Depends(get_current_user)):
+    """
+    Stream the insight as server-sent events
+
+    Each `data` event carries `{"text": ...}` to append; the stream ends
+    with a `done` event, or an `error` event if generation fails.
+    """
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for text in insight_service.stream_insight(current_user.id):
+                yield _event({"text": text})
+        except LLMError as e:
+            logger.error("Insight generation failed: %s", e)
+            yield _event({"detail": "Insights are unavailable right now"}, "error")
+            return
+        yield _event({}, "done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
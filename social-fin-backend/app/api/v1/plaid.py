@@ -0,0 +1,53 @@
+import logging
+from fastapi import APIRouter, HTTPException, Request, status
+from app.config import settings
+from app.core.exceptions import WebhookVerificationError
+from app.core.metrics import metrics
+from app.core.serialization import loads
+from app.services.plaid_webhooks import webhook_intake, webhook_verifier
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/plaid", tags=["plaid"])
+
+intake_latency = metrics.latency("plaid_webhook_intake")
+
+
+@router.post("/webhook")
+async def plaid_webhook(request: Request):
+    """Acknowledge a Plaid webhook; processing happens in the worker"""
+    with intake_latency.time():
+        body = await request.body()
+
+        if settings.plaid_webhook_verify:
+            try:
+                await webhook_verifier.verify(
+                    body, request.headers.get("Plaid-Verification")
+                )
+            except WebhookVerificationError as e:
+                metrics.increment("plaid_webhooks_rejected")
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e)
+                )
+
+        try:
+            webhook = loads(body)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body"
+            )
+        if not isinstance(webhook, dict):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Webhook body must be an object",
+            )
+
+        try:
+            return await webhook_intake.accept(webhook)
+        except Exception as e:
+            # Plaid retries non-2xx deliveries, so a failed intake is not lost
+            logger.error("Plaid webhook intake failed: %s", str(e))
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Webhook could not be accepted",
+            )
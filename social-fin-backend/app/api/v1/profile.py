@@ -0,0 +1,81 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.profile import ProfileResponse, ProfileUpdate
+from app.services.profile import PROFILE_COLUMNS, profile_service
+from app.utils.etag import make_etag, check_not_modified
+from app.core.exceptions import UserNotFoundError
+
+router = APIRouter(prefix="/user", tags=["profile"])
+
+
+def _parse_fields(fields: Optional[str]) -> list:
+    """Validate a comma-separated column projection"""
+    if not fields:
+        return list(PROFILE_COLUMNS)
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in PROFILE_COLUMNS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown profile fields: {', '.join(unknown)}",
+        )
+    return requested
+
+
+@router.get(
+    "/profile", response_model=ProfileResponse, response_model_exclude_unset=True
+)
+async def get_profile(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated profile columns to return"
+    ),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get the current user's profile
+
+    - **fields**: Optional projection, e.g. `first_name,last_name`
+    """
+    requested = _parse_fields(fields)
+    try:
+        # updated_at is always read so the ETag tracks changes
+        profile = await profile_service.get_profile(
+            current_user.id, list(dict.fromkeys([*requested, "updated_at"]))
+        )
+    except UserNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+
+    etag = make_etag(current_user.id, profile["updated_at"], *requested)
+    not_modified = check_not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    return ProfileResponse(**{field: profile[field] for field in requested})
+
+
+@router.patch("/profile", response_model=ProfileResponse)
+async def update_profile(
+    profile_data: ProfileUpdate, current_user: User = Depends(get_current_user)
+):
+    """
+    Partially update the current user's profile
+
+    Only the fields present in the request body are changed.
+    """
+    changes = profile_data.model_dump(exclude_unset=True)
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="No fields to update"
+        )
+
+    try:
+        profile = await profile_service.update_profile(current_user.id, changes)
+    except UserNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+
+    return ProfileResponse(**profile)
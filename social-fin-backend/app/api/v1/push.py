@@ -0,0 +1,84 @@
+import asyncio
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+from app.config import settings
+from app.core.metrics import metrics
+from app.core.push import CLOSE_POLICY, CLOSE_TRY_AGAIN_LATER, push_hub
+from app.core.revocation import revocation_list
+from app.core.security import security_utils
+
+# Registers the hooks that publish push messages
+from app.services import push_events  # noqa: F401
+
+router = APIRouter(prefix="/push", tags=["push"])
+
+
+async def _authenticate(token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """The access token's claims, or None if it is not valid right now"""
+    if not token:
+        return None
+    payload = security_utils.decode_token(token)
+    if payload is None or payload.get("type") != "access" or not payload.get("sub"):
+        return None
+    jti = payload.get("jti")
+    if jti and await revocation_list.is_revoked(jti):
+        return None
+    return payload
+
+
+def _bearer(websocket: WebSocket) -> Optional[str]:
+    scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+    return credentials if scheme.lower() == "bearer" else None
+
+
+async def _drain(websocket: WebSocket):
+    """Read (and ignore) client frames until the client goes away"""
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/ws")
+async def push_socket(websocket: WebSocket, token: Optional[str] = Query(None)):
+    """
+    Real-time updates for the current user
+
+    Authenticate with `?token=<access token>` (browsers cannot set headers
+    on WebSockets) or an `Authorization: Bearer` header. Frames are
+    `{"type": "events", "events": [...]}`, each event a `type` (budget,
+    transactions, feed, group_balances), `key` and `data` saying what to
+    refetch, or `{"type": "ping"}` when idle. Bursts are coalesced to the
+    latest event per type and key. A client that falls behind is
+    disconnected with code 1013 and should reconnect and refetch.
+    """
+    payload = await _authenticate(token or _bearer(websocket))
+    if payload is None:
+        await websocket.close(code=CLOSE_POLICY, reason="Invalid credentials")
+        return
+    if push_hub.connection_count >= settings.push_max_connections:
+        await websocket.close(code=CLOSE_TRY_AGAIN_LATER, reason="Server busy")
+        return
+
+    await websocket.accept()
+    connection = await push_hub.connect(payload["sub"])
+    metrics.increment("push.connects")
+    sender = asyncio.create_task(
+        push_hub.serve(connection, websocket.send_text, float(payload["exp"]))
+    )
+    receiver = asyncio.create_task(_drain(websocket))
+    try:
+        done, _ = await asyncio.wait(
+            {sender, receiver}, return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        receiver.cancel()
+        sender.cancel()
+        await push_hub.disconnect(connection)
+
+    # serve() returning means the server is closing; a send that raised
+    # means the client is already gone
+    if sender in done and sender.exception() is None:
+        code, reason = sender.result()
+        await websocket.close(code=code, reason=reason)
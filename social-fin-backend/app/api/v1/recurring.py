@@ -0,0 +1,36 @@
+from typing import List
+from fastapi import APIRouter, Depends
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.recurring import RecurringChargeResponse
+from app.services.recurring import recurring_detector
+
+router = APIRouter(prefix="/recurring", tags=["recurring"])
+
+
+@router.get("", response_model=List[RecurringChargeResponse])
+async def get_recurring_charges(
+    active_only: bool = False,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get detected subscriptions and recurring bills
+
+    - **active_only**: Hide charges whose next payment is overdue
+    """
+    charges = await recurring_detector.get(current_user.id)
+    return [
+        RecurringChargeResponse(
+            merchant=charge.merchant,
+            cadence=charge.cadence,
+            interval_days=charge.interval_days,
+            occurrences=charge.occurrences,
+            average_amount=charge.average_amount,
+            last_amount=charge.last_amount,
+            last_date=charge.last_date,
+            next_date=charge.next_date,
+            active=charge.active,
+        )
+        for charge in charges
+        if charge.active or not active_only
+    ]
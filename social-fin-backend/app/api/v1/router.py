@@ -1,13 +1,53 @@
-from fastapi import APIRouter
-from app.api.v1 import auth
+from fastapi import APIRouter, Depends
+from app.api.v1 import (
+    analytics,
+    auth,
+    batch,
+    budgets,
+    challenges,
+    export,
+    feed,
+    friends,
+    groups,
+    insights,
+    plaid,
+    profile,
+    push,
+    recurring,
+    search,
+)
+from app.core.metrics import metrics
+from app.dependencies import require_metrics_token
 
 api_router = APIRouter()
 
 # Include all endpoint routers
 api_router.include_router(auth.router, tags=["authentication"])
+api_router.include_router(batch.router, tags=["batch"])
+api_router.include_router(profile.router, tags=["profile"])
+api_router.include_router(plaid.router, tags=["plaid"])
+api_router.include_router(analytics.router, tags=["analytics"])
+api_router.include_router(budgets.router, tags=["budgets"])
+api_router.include_router(recurring.router, tags=["recurring"])
+api_router.include_router(feed.router, tags=["feed"])
+api_router.include_router(friends.router, tags=["friends"])
+api_router.include_router(challenges.router, tags=["challenges"])
+api_router.include_router(groups.router, tags=["groups"])
+api_router.include_router(insights.router, tags=["insights"])
+api_router.include_router(push.router, tags=["push"])
+api_router.include_router(export.router, tags=["export"])
+api_router.include_router(search.router, tags=["search"])
 
 
 # Health check endpoint at API level
 @api_router.get("/health", tags=["health"])
 async def api_health_check():
     return {"status": "healthy", "service": "SocialFin API v1"}
+
+
+# Per-worker latency, counter and queue metrics, for internal monitoring only
+@api_router.get(
+    "/metrics", tags=["health"], dependencies=[Depends(require_metrics_token)]
+)
+async def api_metrics():
+    return await metrics.snapshot()
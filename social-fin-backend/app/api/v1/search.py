@@ -0,0 +1,59 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.config import settings
+from app.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.search import SearchResponse, SearchResult
+from app.services.search import search_service
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/transactions", response_model=SearchResponse)
+async def search_transactions(
+    q: str = Query("", max_length=200),
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = Query(settings.search_page_size, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Search transactions by merchant, description and category
+
+    - **q**: words to match; the last one also matches as a prefix, for
+      type-ahead
+    - **min_amount** / **max_amount**: inclusive amount range
+    - **start_date** / **end_date**: inclusive date range
+
+    Results are newest first.
+    """
+    if min_amount is not None and max_amount is not None and min_amount > max_amount:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_amount must not exceed max_amount",
+        )
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must not be after end_date",
+        )
+
+    page = await search_service.search(
+        current_user.id,
+        q,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit,
+        offset=offset,
+    )
+    return SearchResponse(
+        results=[SearchResult(**row) for row in page.transactions],
+        total=page.total,
+        has_more=offset + limit < page.total,
+    )
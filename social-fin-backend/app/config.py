@@ -1,6 +1,6 @@
 # app/config.py
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional
 from pathlib import Path
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
@@ -30,12 +30,37 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    verification_code_ttl_seconds: int = 900
+    verification_max_attempts: int = 5
+    verification_resend_cooldown_seconds: int = 60
+    revocation_bloom_capacity: int = 100000
+    revocation_bloom_error_rate: float = 0.001
+    revocation_rebuild_seconds: int = 300
 
     # External APIs - OPTIONAL
     plaid_client_id: Optional[str] = None
     plaid_secret: Optional[str] = None
     plaid_env: str = "sandbox"
+    plaid_base_url: Optional[str] = None  # e.g. a local stand-in
+    plaid_sync_page_size: int = 500
+    plaid_sync_upsert_chunk_size: int = 500
+    plaid_sync_concurrency: int = 8
+    plaid_sync_per_institution_limit: int = 2
+    plaid_webhook_verify: bool = True
+    plaid_webhook_max_age_seconds: int = 300
+    plaid_webhook_stream_maxlen: int = 100000
+    plaid_webhook_dedup_seconds: int = 300
+    plaid_sync_lock_seconds: int = 600
+    transactions_read_page_size: int = 1000
+    export_chunk_rows: int = 1000
+    export_parquet_row_group_rows: int = 10000
+    categorization_rules_path: Optional[str] = None  # JSON rules; built-ins if unset
+    categorization_cache_size: int = 65536
+    categorization_reload_seconds: float = 30.0
     openai_api_key: Optional[str] = None
+    openai_base_url: Optional[str] = None  # e.g. a local stand-in
+    openai_model: str = "gpt-4o-mini"
+    openai_timeout_seconds: float = 60.0
 
     # Redis - OPTIONAL (with defaults)
     redis_url: str = "redis://localhost:6379"
@@ -43,12 +68,84 @@ class Settings(BaseSettings):
     # Celery - OPTIONAL (with defaults)
     celery_broker_url: str = "redis://localhost:6379/0"
     celery_result_backend: str = "redis://localhost:6379/0"
+    celery_task_always_eager: bool = False
+    job_max_retries: int = 5
+    job_retry_backoff_max_seconds: int = 600
 
     # Email - OPTIONAL
     smtp_host: Optional[str] = None
     smtp_port: int = 587
     smtp_user: Optional[str] = None
     smtp_password: Optional[str] = None
+    smtp_use_tls: bool = True
+    smtp_pool_size: int = 4
+    smtp_max_messages_per_connection: int = 100
+    smtp_domain_rate_per_second: float = 20.0
+    smtp_domain_rates: Dict[str, float] = {}
+    email_from: str = "SocialFin <no-reply@socialfin.app>"
+    password_reset_url: str = "socialfin://reset-password"
+
+    # Caching - OPTIONAL (with defaults)
+    principal_cache_ttl_seconds: int = 30
+    principal_cache_max_size: int = 10000
+    profile_cache_ttl_seconds: int = 300
+    profile_cache_max_size: int = 10000
+    invalidation_flush_interval: float = 0.05
+    invalidation_max_batch: int = 100
+    invalidation_gap_grace_seconds: float = 2.0  # Wait for reordered messages
+    idempotency_ttl_seconds: int = 86400
+    idempotency_credential_ttl_seconds: int = 300
+    analytics_cache_ttl_seconds: int = 300
+    analytics_cache_max_size: int = 256
+    friends_cache_ttl_seconds: int = 60
+    friends_cache_max_size: int = 10000
+
+    # Social - OPTIONAL (with defaults)
+    feed_fanout_threshold: int = 1000  # Larger audiences are merged at read
+    feed_fanout_batch_size: int = 1000
+    feed_timeline_max_entries: int = 800
+    feed_retention_days: int = 30
+    feed_page_size: int = 20
+    friend_graph_load_page_size: int = 10000
+    friend_graph_compact_rows: int = 10000
+    friend_suggestions_max_expansion: int = 200000
+    leaderboard_snapshot_minutes: int = 60
+    leaderboard_rebuild_delay_seconds: int = 30  # After a join or failed update
+    group_expenses_page_size: int = 1000
+    group_missing_ttl_seconds: int = 60  # Remember unknown group IDs
+    group_rebuild_attempts: int = 5  # Retries when expenses land mid-rebuild
+
+    # Insights - OPTIONAL (with defaults)
+    insights_cache_ttl_seconds: int = 7 * 86400
+    insights_lookback_months: int = 3
+    insights_max_categories: int = 8
+    insights_max_merchants: int = 5
+    insights_max_tokens: int = 300
+    insights_batch_concurrency: int = 8
+    insights_nightly_hour: int = 3  # UTC
+
+    # Push - OPTIONAL (with defaults)
+    push_max_connections: int = 10000  # Per worker
+    push_coalesce_ms: int = 50
+    push_max_pending: int = 256  # Distinct queued messages before disconnect
+    push_send_timeout_seconds: float = 5.0
+    push_heartbeat_seconds: float = 25.0
+    push_publish_batch_size: int = 1000
+
+    # Search - OPTIONAL (with defaults)
+    search_index_max_users: int = 1000  # Per worker
+    search_index_max_bytes: int = 256 * 1024 * 1024  # Per worker
+    search_changes_maxlen: int = 1000  # Sync pages kept per user
+    search_changes_ttl_seconds: int = 7 * 86400
+    search_postings_tail: int = 64  # Appended docs before a postings list repacks
+    search_compact_ratio: float = 0.25  # Tombstones per live doc before compaction
+    search_page_size: int = 20
+
+    # Monitoring - OPTIONAL
+    metrics_token: Optional[str] = None  # Bearer token for /metrics; off if unset
+
+    # Batching - OPTIONAL (with defaults)
+    batch_max_requests: int = 20
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from app.config import settings
+
+
+class TTLCache:
+    """
+    Small in-process LRU cache with per-entry expiry.
+
+    `version` is a clock that ticks on every invalidation. Loaders read it
+    before fetching and pass it back to set(), which refuses the value if
+    that key (or the whole cache) was invalidated since, so a value loaded
+    before a concurrent invalidation is never stored. Invalidating one key
+    does not refuse loads of the others.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        # Clock of each key's latest delete, oldest first, at most maxsize
+        self._deleted: "OrderedDict[Hashable, int]" = OrderedDict()
+        # Loads stamped before this are refused for every key (clear(), or
+        # a delete that fell out of _deleted)
+        self._floor = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry (refreshing its LRU position) or default"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        version: Optional[int] = None,
+    ):
+        """Insert or replace an entry, evicting the least recently used one"""
+        if version is not None and (
+            version < self._floor or version < self._deleted.get(key, 0)
+        ):
+            return
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        """Drop an entry if present"""
+        self.version += 1
+        self._data.pop(key, None)
+        self._deleted[key] = self.version
+        self._deleted.move_to_end(key)
+        if len(self._deleted) > self.maxsize:
+            _, forgotten = self._deleted.popitem(last=False)
+            self._floor = max(self._floor, forgotten)
+
+    def clear(self):
+        """Drop all entries"""
+        self.version += 1
+        self._data.clear()
+        self._deleted.clear()
+        self._floor = self.version
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Authenticated principals keyed by user ID, shared by get_current_user
+principal_cache = TTLCache(
+    maxsize=settings.principal_cache_max_size,
+    ttl=settings.principal_cache_ttl_seconds,
+)
+
+# user_profiles rows keyed by user ID, written through by ProfileService
+profile_cache = TTLCache(
+    maxsize=settings.profile_cache_max_size,
+    ttl=settings.profile_cache_ttl_seconds,
+)
+
+# Columnar transaction frames keyed by user ID, built by AnalyticsService
+analytics_cache = TTLCache(
+    maxsize=settings.analytics_cache_max_size,
+    ttl=settings.analytics_cache_ttl_seconds,
+)
+
+# Accepted friend IDs keyed by user ID, loaded by FriendService
+friends_cache = TTLCache(
+    maxsize=settings.friends_cache_max_size,
+    ttl=settings.friends_cache_ttl_seconds,
+)
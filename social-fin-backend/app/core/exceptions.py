@@ -44,3 +44,62 @@ class InactiveUserError(AuthException):
     """Raised when user account is inactive"""
 
     pass
+
+
+class VerificationAttemptsExceededError(AuthException):
+    """Raised when a verification code has had too many wrong attempts"""
+
+    pass
+
+
+class VerificationResendThrottledError(AuthException):
+    """Raised when a new verification code is requested too soon"""
+
+    pass
+
+
+class PlaidError(Exception):
+    """Raised when a Plaid API call fails"""
+
+    def __init__(self, message: str, error_code: str = "", status_code: int = 0):
+        super().__init__(message)
+        self.error_code = error_code
+        self.status_code = status_code
+
+
+class LLMError(Exception):
+    """Raised when a completion request fails"""
+
+    def __init__(self, message: str, status_code: int = 0):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class WebhookVerificationError(Exception):
+    """Raised when an inbound webhook fails signature verification"""
+
+    pass
+
+
+class ChallengeNotFoundError(Exception):
+    """Raised when a challenge does not exist or the user is not in it"""
+
+    pass
+
+
+class ChallengeAccessError(Exception):
+    """Raised when a user may not join a challenge"""
+
+    pass
+
+
+class GroupNotFoundError(Exception):
+    """Raised when a group does not exist or the user is not a member"""
+
+    pass
+
+
+class GroupAccessError(Exception):
+    """Raised when a user may not be added to a group"""
+
+    pass
@@ -0,0 +1,159 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from app.core.serialization import dumps, loads
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+
+@dataclass
+class IdempotencyRecord:
+    """State stored for an Idempotency-Key"""
+
+    state: str
+    fingerprint: str
+    status_code: int = 0
+    headers: List[Tuple[str, str]] = field(default_factory=list)
+    body: bytes = b""
+    # The response carried credentials and was not stored
+    withheld: bool = False
+
+    def to_json(self) -> str:
+        return dumps(
+            {
+                "state": self.state,
+                "fingerprint": self.fingerprint,
+                "status_code": self.status_code,
+                "headers": self.headers,
+                # latin-1 maps every byte to one code point, so bodies round-trip
+                "body": self.body.decode("latin-1"),
+                "withheld": self.withheld,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "IdempotencyRecord":
+        data = loads(raw)
+        return cls(
+            state=data["state"],
+            fingerprint=data["fingerprint"],
+            status_code=data["status_code"],
+            headers=[tuple(header) for header in data["headers"]],
+            body=data["body"].encode("latin-1"),
+            withheld=data.get("withheld", False),
+        )
+
+
+class IdempotencyStore(ABC):
+    """Storage backend for idempotency records"""
+
+    @abstractmethod
+    async def acquire(self, key: str, fingerprint: str, lock_ttl: int) -> bool:
+        """Claim a key for processing; False if it is already claimed or done"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        """Get the current record for a key"""
+
+    @abstractmethod
+    async def complete(self, key: str, record: IdempotencyRecord, ttl: int):
+        """Store the completed response, replacing the in-progress claim"""
+
+    @abstractmethod
+    async def release(self, key: str):
+        """Drop an in-progress claim so the request can be retried"""
+
+    async def wait(
+        self, key: str, timeout: float, interval: float = 0.05
+    ) -> Optional[IdempotencyRecord]:
+        """Wait for an in-progress key to complete; None on timeout or release"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            record = await self.get(key)
+            if record is None or record.state == COMPLETED:
+                return record
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, 0.5)
+        return None
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    """Idempotency records in Redis, expired with TTLs"""
+
+    def __init__(self, redis_client, prefix: str = "idempotency:"):
+        self.redis = redis_client
+        self.prefix = prefix
+
+    async def acquire(self, key: str, fingerprint: str, lock_ttl: int) -> bool:
+        record = IdempotencyRecord(state=IN_PROGRESS, fingerprint=fingerprint)
+        return bool(
+            await self.redis.set(
+                self.prefix + key, record.to_json(), nx=True, ex=lock_ttl
+            )
+        )
+
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        raw = await self.redis.get(self.prefix + key)
+        return IdempotencyRecord.from_json(raw) if raw else None
+
+    async def complete(self, key: str, record: IdempotencyRecord, ttl: int):
+        await self.redis.set(self.prefix + key, record.to_json(), ex=ttl)
+
+    async def release(self, key: str):
+        await self.redis.delete(self.prefix + key)
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """Process-local store for tests and single-worker development"""
+
+    def __init__(self):
+        self._records: Dict[str, Tuple[float, IdempotencyRecord]] = {}
+        self._events: Dict[str, asyncio.Event] = {}
+
+    async def acquire(self, key: str, fingerprint: str, lock_ttl: int) -> bool:
+        if await self.get(key) is not None:
+            return False
+        self._records[key] = (
+            time.monotonic() + lock_ttl,
+            IdempotencyRecord(state=IN_PROGRESS, fingerprint=fingerprint),
+        )
+        self._events[key] = asyncio.Event()
+        return True
+
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        entry = self._records.get(key)
+        if entry is None:
+            return None
+        expires_at, record = entry
+        if expires_at < time.monotonic():
+            self._records.pop(key, None)
+            return None
+        return record
+
+    async def complete(self, key: str, record: IdempotencyRecord, ttl: int):
+        self._records[key] = (time.monotonic() + ttl, record)
+        self._notify(key)
+
+    async def release(self, key: str):
+        self._records.pop(key, None)
+        self._notify(key)
+
+    async def wait(
+        self, key: str, timeout: float, interval: float = 0.05
+    ) -> Optional[IdempotencyRecord]:
+        event = self._events.get(key)
+        if event is not None:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        record = await self.get(key)
+        return record if record and record.state == COMPLETED else None
+
+    def _notify(self, key: str):
+        event = self._events.pop(key, None)
+        if event is not None:
+            event.set()
@@ -0,0 +1,252 @@
+import asyncio
+import logging
+import time
+import uuid
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+import redis.asyncio as redis
+from app.config import settings
+from app.core.cache import (
+    TTLCache,
+    analytics_cache,
+    friends_cache,
+    principal_cache,
+    profile_cache,
+)
+from app.core.redis_client import redis_client
+from app.core.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "cache_invalidations"
+SEQUENCE_KEY = "cache_invalidations:seq"
+# Skipping more sequence numbers than this at once clears caches at once
+MAX_PENDING_GAP = 1000
+
+
+class InvalidationEvent(str, Enum):
+    USER_UPDATED = "user_updated"
+    PROFILE_CHANGED = "profile_changed"
+    SESSION_REVOKED = "session_revoked"
+    TRANSACTIONS_CHANGED = "transactions_changed"
+    FRIENDS_CHANGED = "friends_changed"
+    # Keyed "user_id:friend_id"
+    FRIENDSHIP_ADDED = "friendship_added"
+    FRIENDSHIP_REMOVED = "friendship_removed"
+
+
+Handler = Callable[[str], None]
+
+
+class InvalidationBus:
+    """
+    Broadcast cache invalidations to every worker over Redis pub/sub.
+
+    Events are applied locally at once and published in batches. Every
+    batch takes a number from a global Redis sequence. Concurrent
+    publishers can deliver numbers out of order, so a skipped number is
+    only given up as lost (a dropped message) after
+    `invalidation_gap_grace_seconds`; then, or when the connection is
+    lost, the subscriber clears all registered caches, so a missed event
+    costs a cold cache rather than stale data. Entry TTLs bound staleness
+    in the meantime. Authorization
+    decisions (token revocation, sessions) never depend on these caches.
+    """
+
+    def __init__(self, redis_client, channel: str = INVALIDATION_CHANNEL):
+        self.redis = redis_client
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._handlers: Dict[InvalidationEvent, List[Handler]] = {}
+        self._caches: List[TTLCache] = []
+        self._resets: List[Callable[[], None]] = []
+        self._pending: List[Tuple[str, str]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_seq: Optional[int] = None
+        # Skipped sequence numbers -> when to stop waiting, oldest first
+        self._missing: Dict[int, float] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def register_cache(self, cache: TTLCache, *events: InvalidationEvent):
+        """Evict a cache's entry (keyed by the event key) on these events"""
+        self._caches.append(cache)
+        for event in events:
+            self.on(event, cache.delete)
+
+    def on(self, event: InvalidationEvent, handler: Handler):
+        """Run a handler with the event key whenever the event arrives"""
+        self._handlers.setdefault(event, []).append(handler)
+
+    def on_reset(self, callback: Callable[[], None]):
+        """
+        Run a callback whenever registered caches are cleared, for state
+        kept current by events rather than held in a TTLCache
+        """
+        self._resets.append(callback)
+
+    def publish(self, event: InvalidationEvent, key: str, local: bool = True):
+        """
+        Queue an invalidation for every worker.
+
+        Pass local=False when this worker already holds the new value
+        (write-through) and only the others should evict.
+        """
+        if local:
+            self._apply(event.value, key)
+        if self._wakeup is None:
+            # Not started (e.g. a job worker); nothing would flush the queue
+            return
+        self._pending.append((event.value, key))
+        if len(self._pending) >= settings.invalidation_max_batch:
+            self._wakeup.set()
+
+    async def publish_now(self, event: InvalidationEvent, *keys: str):
+        """
+        Apply and publish events immediately.
+
+        For processes that do not run the bus (job workers), where
+        publish() would only apply them locally.
+        """
+        for key in keys:
+            self._apply(event.value, key)
+        self._pending.extend((event.value, key) for key in keys)
+        await self.flush()
+
+    async def flush(self):
+        """Publish queued events as one message"""
+        if not self._pending:
+            return
+        events, self._pending = self._pending, []
+        try:
+            seq = await self.redis.incr(SEQUENCE_KEY)
+            await self.redis.publish(
+                self.channel,
+                dumps({"origin": self.origin, "seq": seq, "events": events}),
+            )
+        except redis.RedisError as e:
+            logger.error("Failed to publish cache invalidations: %s", str(e))
+
+    def _apply(self, event: str, key: str):
+        for handler in self._handlers.get(InvalidationEvent(event), []):
+            handler(key)
+
+    def _clear_all(self):
+        self._missing.clear()
+        for cache in self._caches:
+            cache.clear()
+        for callback in self._resets:
+            callback()
+
+    def _receive(self, raw: str):
+        message = loads(raw)
+        seq = message["seq"]
+        if self._last_seq is None or seq > self._last_seq:
+            skipped = 0 if self._last_seq is None else seq - self._last_seq - 1
+            if skipped > MAX_PENDING_GAP:
+                logger.warning(
+                    "Missed %d cache invalidations; clearing local caches", skipped
+                )
+                self._clear_all()
+            elif skipped:
+                deadline = time.monotonic() + settings.invalidation_gap_grace_seconds
+                for missing in range(self._last_seq + 1, seq):
+                    self._missing[missing] = deadline
+            self._last_seq = seq
+        else:
+            # A late message from a concurrent publisher fills its gap
+            self._missing.pop(seq, None)
+
+        # Our own events were applied when they were published
+        if message["origin"] == self.origin:
+            return
+        for event, key in message["events"]:
+            self._apply(event, key)
+
+    def _check_gaps(self):
+        """Clear caches once a skipped sequence number is overdue"""
+        if not self._missing:
+            return
+        oldest = next(iter(self._missing))
+        if self._missing[oldest] <= time.monotonic():
+            logger.warning(
+                "Missed cache invalidation %d; clearing local caches", oldest
+            )
+            self._clear_all()
+
+    async def _publisher(self):
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), settings.invalidation_flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def _subscriber(self):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Anything could have been missed while disconnected
+                self._last_seq = None
+                self._clear_all()
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message and message["type"] == "message":
+                        self._receive(message["data"])
+                    self._check_gaps()
+            except asyncio.CancelledError:
+                raise
+            except redis.RedisError as e:
+                logger.error("Cache invalidation subscriber error: %s", str(e))
+                self._clear_all()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    def start(self):
+        """Start the publisher and subscriber tasks"""
+        if not self._tasks:
+            self._wakeup = asyncio.Event()
+            self._tasks = [
+                asyncio.create_task(self._publisher()),
+                asyncio.create_task(self._subscriber()),
+            ]
+
+    async def stop(self):
+        """Flush pending events and stop the background tasks"""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self._wakeup = None
+        await self.flush()
+
+
+# Singleton instance
+invalidation_bus = InvalidationBus(redis_client.client)
+invalidation_bus.register_cache(
+    principal_cache,
+    InvalidationEvent.USER_UPDATED,
+    InvalidationEvent.PROFILE_CHANGED,
+    InvalidationEvent.SESSION_REVOKED,
+)
+invalidation_bus.register_cache(
+    profile_cache,
+    InvalidationEvent.USER_UPDATED,
+    InvalidationEvent.PROFILE_CHANGED,
+)
+invalidation_bus.register_cache(
+    analytics_cache,
+    InvalidationEvent.USER_UPDATED,
+    InvalidationEvent.TRANSACTIONS_CHANGED,
+)
+invalidation_bus.register_cache(friends_cache, InvalidationEvent.FRIENDS_CHANGED)
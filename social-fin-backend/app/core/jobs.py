@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+import redis
+import redis.asyncio as aioredis
+from celery import Celery, Task
+from celery.schedules import crontab
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+celery_app = Celery(
+    "socialfin",
+    broker=settings.celery_broker_url,
+    backend=settings.celery_result_backend,
+    include=[
+        "app.tasks.email",
+        "app.tasks.plaid",
+        "app.tasks.budgets",
+        "app.tasks.recurring",
+        "app.tasks.leaderboards",
+        "app.tasks.groups",
+        "app.tasks.insights",
+    ],
+)
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    # Redeliver jobs whose worker died mid-run
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    # In-process mode for tests and local development without a broker
+    task_always_eager=settings.celery_task_always_eager,
+    task_eager_propagates=settings.celery_task_always_eager,
+    task_ignore_result=True,
+    # Periodic jobs, run by `celery beat`
+    beat_schedule={
+        "snapshot-leaderboards": {
+            "task": "leaderboards.snapshot_all",
+            "schedule": settings.leaderboard_snapshot_minutes * 60,
+        },
+        "generate-insights": {
+            "task": "insights.generate_all",
+            "schedule": crontab(hour=settings.insights_nightly_hour, minute=0),
+        },
+    },
+)
+
+# Default retry behaviour for jobs: exponential backoff with jitter
+RETRY_POLICY: Dict[str, Any] = {
+    "autoretry_for": (Exception,),
+    "retry_backoff": True,
+    "retry_backoff_max": settings.job_retry_backoff_max_seconds,
+    "retry_jitter": True,
+    "max_retries": settings.job_max_retries,
+}
+
+DEDUP_PREFIX = "job_dedup:"
+LOCK_PREFIX = "job_lock:"
+# Celery's Redis transport keeps the default queue in a list of this name
+DEFAULT_QUEUE = "celery"
+
+_redis: Optional[redis.Redis] = None
+_broker: Optional[aioredis.Redis] = None
+_local_dedup: Dict[str, float] = {}
+
+
+def _get_redis() -> redis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+    return _redis
+
+
+def claim_dedup_key(key: str, ttl: int) -> bool:
+    """Reserve a dedup key; False if a job with this key is already queued"""
+    if settings.celery_task_always_eager:
+        now = time.monotonic()
+        if _local_dedup.get(key, 0) > now:
+            return False
+        _local_dedup[key] = now + ttl
+        return True
+    return bool(_get_redis().set(DEDUP_PREFIX + key, "1", nx=True, ex=ttl))
+
+
+def release_dedup_key(key: str):
+    """Allow another job with this dedup key to be queued"""
+    if settings.celery_task_always_eager:
+        _local_dedup.pop(key, None)
+        return
+    _get_redis().delete(DEDUP_PREFIX + key)
+
+
+@contextmanager
+def exclusive(key: str, ttl: int) -> Iterator[bool]:
+    """
+    Hold a cross-worker lock for the duration of a job.
+
+    Yields False without blocking when another job holds the lock. The
+    lock expires after `ttl` seconds in case its holder dies.
+    """
+    if settings.celery_task_always_eager:
+        yield True
+        return
+
+    lock = _get_redis().lock(LOCK_PREFIX + key, timeout=ttl)
+    if not lock.acquire(blocking=False):
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        try:
+            lock.release()
+        except redis.exceptions.LockError:
+            logger.warning("Job lock %s expired before release", key)
+
+
+async def queue_depth(queue: str = DEFAULT_QUEUE) -> int:
+    """Number of jobs waiting on the broker"""
+    global _broker
+    if _broker is None:
+        _broker = aioredis.from_url(settings.celery_broker_url)
+    return await _broker.llen(queue)
+
+
+def enqueue(
+    task: Task,
+    *args: Any,
+    dedup_key: Optional[str] = None,
+    dedup_ttl: int = 3600,
+    countdown: Optional[float] = None,
+    **kwargs: Any,
+) -> bool:
+    """
+    Queue a job for the worker.
+
+    Returns False without queueing when `dedup_key` was already used within
+    `dedup_ttl` seconds.
+    """
+    if dedup_key and not claim_dedup_key(dedup_key, dedup_ttl):
+        logger.info("Skipping duplicate job %s (%s)", task.name, dedup_key)
+        return False
+
+    try:
+        task.apply_async(args=args, kwargs=kwargs, countdown=countdown)
+    except Exception:
+        if dedup_key:
+            release_dedup_key(dedup_key)
+        raise
+    return True
+
+
+async def enqueue_async(task: Task, *args: Any, **kwargs: Any) -> bool:
+    """Queue a job from async code without blocking the event loop"""
+    return await asyncio.to_thread(enqueue, task, *args, **kwargs)
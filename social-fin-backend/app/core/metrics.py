@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, List, Optional
+
+Gauge = Callable[[], Awaitable[Any]]
+
+
+class LatencyRecorder:
+    """Sliding window of recent latencies with percentile summaries"""
+
+    def __init__(self, window: int = 10000):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Record the duration of a block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            samples = sorted(self._samples)
+            count = self._count
+        if not samples:
+            return {"count": count, "p50_ms": None, "p99_ms": None, "max_ms": None}
+        return {
+            "count": count,
+            "p50_ms": _millis(_percentile(samples, 50)),
+            "p99_ms": _millis(_percentile(samples, 99)),
+            "max_ms": _millis(samples[-1]),
+        }
+
+
+class MetricsRegistry:
+    """Per-worker metrics exposed at /api/v1/metrics"""
+
+    def __init__(self):
+        self._latencies: Dict[str, LatencyRecorder] = {}
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, Gauge] = {}
+
+    def latency(self, name: str) -> LatencyRecorder:
+        """Get or create a latency recorder"""
+        if name not in self._latencies:
+            self._latencies[name] = LatencyRecorder()
+        return self._latencies[name]
+
+    def increment(self, name: str, amount: int = 1):
+        self._counters[name] = self._counters.get(name, 0) + amount
+
+    def gauge(self, name: str, read: Gauge):
+        """Register a gauge whose value is read on every snapshot"""
+        self._gauges[name] = read
+
+    async def snapshot(self) -> Dict[str, Any]:
+        gauges = {}
+        for name, read in self._gauges.items():
+            try:
+                gauges[name] = await read()
+            except Exception:
+                gauges[name] = None
+        return {
+            "latencies": {
+                name: recorder.summary() for name, recorder in self._latencies.items()
+            },
+            "counters": dict(self._counters),
+            "gauges": gauges,
+        }
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _millis(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+# Singleton instance
+metrics = MetricsRegistry()
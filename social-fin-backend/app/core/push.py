@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import redis.asyncio as redis
+from app.config import settings
+from app.core.metrics import metrics
+from app.core.redis_client import redis_client
+from app.core.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "push:"
+
+# WebSocket close codes
+CLOSE_POLICY = 1008
+CLOSE_TRY_AGAIN_LATER = 1013
+
+Send = Callable[[str], Awaitable[None]]
+
+
+class PushConnection:
+    """
+    One client's outbound queue.
+
+    Messages are coalesced by (type, key): a newer message replaces a
+    queued one with the same pair, so a burst of updates to one budget or
+    feed collapses to its latest state. A client that falls more than
+    `push_max_pending` distinct messages behind is marked overflowed and
+    disconnected rather than buffered without bound.
+    """
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.overflowed = False
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._ready = asyncio.Event()
+
+    def offer(self, message: Dict[str, Any]):
+        """Queue a message; never blocks the dispatcher"""
+        if self.overflowed:
+            return
+        key = f"{message['type']}:{message.get('key') or ''}"
+        if key in self._pending:
+            metrics.increment("push.coalesced")
+        elif len(self._pending) >= settings.push_max_pending:
+            # Wake the sender so it closes the connection
+            self.overflowed = True
+            self._pending.clear()
+            self._ready.set()
+            return
+        self._pending[key] = message
+        self._ready.set()
+
+    async def next_batch(self, timeout: float) -> List[Dict[str, Any]]:
+        """
+        Wait up to `timeout` for messages, then linger `push_coalesce_ms`
+        so a burst goes out as one frame. Empty on timeout.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        await asyncio.sleep(settings.push_coalesce_ms / 1000)
+        self._ready.clear()
+        batch, self._pending = list(self._pending.values()), {}
+        return batch
+
+
+class PushHub:
+    """
+    Per-worker fan-out of Redis pub/sub messages to connected clients.
+
+    Each user has a channel (`push:<user_id>`). A worker subscribes to a
+    user's channel on one shared pub/sub connection while that user has at
+    least one connection to it, so a worker only receives messages for
+    its own clients however many users there are. Publishers need not
+    know where (or whether) the user is connected.
+    """
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self.control_channel = f"{CHANNEL_PREFIX}control:{uuid.uuid4().hex}"
+        self._connections: Dict[str, Set[PushConnection]] = {}
+        self._pubsub = None
+        # Subscription changes go one at a time: concurrent first calls on
+        # a new pub/sub object would each open a connection
+        self._subscriptions = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        metrics.gauge("push.connections", self._connection_count)
+
+    @staticmethod
+    def channel(user_id: str) -> str:
+        return f"{CHANNEL_PREFIX}{user_id}"
+
+    async def _connection_count(self) -> int:
+        return self.connection_count
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(connections) for connections in self._connections.values())
+
+    async def publish(
+        self,
+        user_ids: Iterable[str],
+        message_type: str,
+        data: Dict[str, Any],
+        key: Optional[str] = None,
+    ):
+        """Send a message to every connection of these users, anywhere"""
+        raw = dumps({"type": message_type, "key": key, "data": data, "ts": time.time()})
+        user_ids = list(user_ids)
+        batch_size = settings.push_publish_batch_size
+        try:
+            for start in range(0, len(user_ids), batch_size):
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for user_id in user_ids[start : start + batch_size]:
+                        pipe.publish(self.channel(user_id), raw)
+                    await pipe.execute()
+        except redis.RedisError as e:
+            # Push is best effort; clients catch up on their next read
+            logger.error("Failed to publish push messages: %s", str(e))
+
+    async def connect(self, user_id: str) -> PushConnection:
+        """Register a client connection, subscribing to the user's channel"""
+        connection = PushConnection(user_id)
+        connections = self._connections.setdefault(user_id, set())
+        connections.add(connection)
+        if len(connections) == 1:
+            await self._change_subscription(user_id, subscribe=True)
+        return connection
+
+    async def disconnect(self, connection: PushConnection):
+        connections = self._connections.get(connection.user_id)
+        if connections is None:
+            return
+        connections.discard(connection)
+        if not connections:
+            del self._connections[connection.user_id]
+            await self._change_subscription(connection.user_id, subscribe=False)
+
+    async def _change_subscription(self, user_id: str, subscribe: bool):
+        async with self._subscriptions:
+            # Connections come and go while awaiting the lock
+            if self._pubsub is None or (user_id in self._connections) != subscribe:
+                return
+            try:
+                if subscribe:
+                    await self._pubsub.subscribe(self.channel(user_id))
+                else:
+                    await self._pubsub.unsubscribe(self.channel(user_id))
+            except redis.RedisError as e:
+                # The subscriber resubscribes everyone when it reconnects
+                logger.warning("Push subscription change failed: %s", str(e))
+
+    async def serve(
+        self, connection: PushConnection, send: Send, expires_at: float
+    ) -> Tuple[int, str]:
+        """
+        Deliver a connection's messages until it must be closed, and
+        return the close code and reason.
+
+        A client that cannot take a frame within `push_send_timeout_seconds`
+        or lets its queue overflow is disconnected; it reconnects and
+        catches up by reading. Idle connections get a heartbeat, and the
+        connection ends when the token it was opened with expires.
+        """
+        while True:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                return CLOSE_POLICY, "Token expired"
+            batch = await connection.next_batch(
+                min(settings.push_heartbeat_seconds, remaining)
+            )
+            if connection.overflowed:
+                metrics.increment("push.slow_consumer_disconnects")
+                return CLOSE_TRY_AGAIN_LATER, "Too far behind"
+            if not batch and time.time() >= expires_at:
+                continue
+            frame = {"type": "events", "events": batch} if batch else {"type": "ping"}
+            try:
+                await asyncio.wait_for(
+                    send(dumps(frame)), settings.push_send_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                metrics.increment("push.slow_consumer_disconnects")
+                return CLOSE_TRY_AGAIN_LATER, "Send timed out"
+            if batch:
+                now = time.time()
+                fanout = metrics.latency("push.fanout")
+                for message in batch:
+                    fanout.observe(now - message["ts"])
+                metrics.increment("push.messages_sent", len(batch))
+
+    def _dispatch(self, channel: str, raw: str):
+        connections = self._connections.get(channel[len(CHANNEL_PREFIX) :])
+        if not connections:
+            return
+        message = loads(raw)
+        for connection in connections:
+            connection.offer(message)
+
+    async def _listen(self):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                async with self._subscriptions:
+                    # The control channel keeps the connection subscribed
+                    # (and readable) while no clients are connected
+                    await pubsub.subscribe(
+                        self.control_channel,
+                        *(self.channel(user_id) for user_id in self._connections),
+                    )
+                    self._pubsub = pubsub
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message and message["type"] == "message":
+                        self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except redis.RedisError as e:
+                logger.error("Push subscriber error: %s", str(e))
+                await asyncio.sleep(1)
+            finally:
+                self._pubsub = None
+                await pubsub.aclose()
+
+    def start(self):
+        """Start the subscriber task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        """Stop the subscriber task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Singleton instance
+push_hub = PushHub(redis_client.client)
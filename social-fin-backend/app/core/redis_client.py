@@ -0,0 +1,30 @@
+from typing import Optional
+import redis.asyncio as redis
+from app.config import settings
+
+
+class RedisClient:
+    """Singleton class to manage the shared async Redis connection pool"""
+
+    def __init__(self, url: Optional[str] = None):
+        self._url = url or settings.redis_url
+        self._client: Optional[redis.Redis] = None
+
+    @property
+    def client(self) -> redis.Redis:
+        """Get the Redis client (created lazily on first use)"""
+        if not self._client:
+            self._client = redis.from_url(
+                self._url, encoding="utf-8", decode_responses=True
+            )
+        return self._client
+
+    async def close(self):
+        """Close the connection pool"""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+
+# Singleton instance
+redis_client = RedisClient()
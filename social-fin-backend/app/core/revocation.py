@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+from typing import Iterable, Optional, Tuple
+import redis.asyncio as redis
+from app.config import settings
+from app.core.redis_client import redis_client
+from app.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY_PREFIX = "revoked_token:"
+REVOKED_INDEX_KEY = "revoked_tokens"
+REVOCATION_CHANNEL = "token_revocations"
+
+
+class TokenRevocationList:
+    """
+    Deny-list of access-token JTIs.
+
+    Redis is the source of truth: one key per revoked JTI that expires with
+    the token, plus a sorted index by expiry for bootstrapping. Each worker
+    mirrors it in a Bloom filter fed by pub/sub, so tokens that were never
+    revoked are accepted without a round trip; Redis is only asked about
+    possible hits.
+    """
+
+    def __init__(self, redis_client, channel: str = REVOCATION_CHANNEL):
+        self.redis = redis_client
+        self.channel = channel
+        self._filter = self._new_filter(0)
+        # Whether the filter mirrors Redis; until then every check asks Redis
+        self._loaded = False
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _new_filter(expected: int) -> BloomFilter:
+        return BloomFilter(
+            max(settings.revocation_bloom_capacity, expected * 2),
+            settings.revocation_bloom_error_rate,
+        )
+
+    async def revoke(self, jti: str, expires_at: int):
+        """Revoke a token until its own expiry (epoch seconds)"""
+        await self.revoke_many([(jti, expires_at)])
+
+    async def revoke_many(self, tokens: Iterable[Tuple[str, int]]):
+        """Revoke (JTI, expiry) pairs in one round trip"""
+        now = int(time.time())
+        live = {jti: expires_at for jti, expires_at in tokens if expires_at > now}
+        if not live:
+            return
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for jti, expires_at in live.items():
+                pipe.set(REVOKED_KEY_PREFIX + jti, "1", ex=expires_at - now)
+                pipe.publish(self.channel, jti)
+            pipe.zadd(REVOKED_INDEX_KEY, live)
+            pipe.zremrangebyscore(REVOKED_INDEX_KEY, "-inf", now)
+            await pipe.execute()
+        for jti in live:
+            self._filter.add(jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        """Check a JTI; once loaded, only possible Bloom hits reach Redis"""
+        if self._loaded and jti not in self._filter:
+            return False
+        try:
+            return bool(await self.redis.exists(REVOKED_KEY_PREFIX + jti))
+        except redis.RedisError:
+            # Fail closed: the token may be revoked and nothing says otherwise
+            logger.error("Redis unavailable for token revocation check")
+            return True
+
+    async def load(self):
+        """Rebuild the filter from the index, dropping expired entries"""
+        now = int(time.time())
+        jtis = await self.redis.zrangebyscore(REVOKED_INDEX_KEY, now, "+inf")
+        rebuilt = self._new_filter(len(jtis))
+        for jti in jtis:
+            rebuilt.add(jti)
+        self._filter = rebuilt
+        self._loaded = True
+
+    async def run(self):
+        """Follow revocations published by other workers"""
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                # Subscribe before loading so nothing falls in between
+                await pubsub.subscribe(self.channel)
+                await self.load()
+                next_rebuild = time.monotonic() + settings.revocation_rebuild_seconds
+
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message and message["type"] == "message":
+                        self._filter.add(message["data"])
+                    if time.monotonic() >= next_rebuild:
+                        await self.load()
+                        next_rebuild = (
+                            time.monotonic() + settings.revocation_rebuild_seconds
+                        )
+            except asyncio.CancelledError:
+                raise
+            except redis.RedisError as e:
+                # Revocations published while disconnected would be missed
+                self._loaded = False
+                logger.error("Token revocation subscriber error: %s", str(e))
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    def start(self):
+        """Start the subscriber task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop the subscriber task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Singleton instance
+revocation_list = TokenRevocationList(redis_client.client)
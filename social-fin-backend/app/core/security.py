@@ -38,6 +38,8 @@ class SecurityUtils:
             )
 
         to_encode.update({"exp": expire, "type": "access"})
+        # Unique ID so a single token can be revoked before it expires
+        to_encode.setdefault("jti", secrets.token_urlsafe(16))
         encoded_jwt = jwt.encode(
             to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm
         )
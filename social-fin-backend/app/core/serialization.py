@@ -0,0 +1,68 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Encode types the JSON backends don't handle natively"""
+    if hasattr(obj, "model_dump"):
+        # Pydantic models serialize the same way FastAPI would render them
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, datetime):
+        # Only reached by the stdlib fallback; mirror orjson's OPT_UTC_Z
+        text = obj.isoformat()
+        if obj.utcoffset() == timezone.utc.utcoffset(None):
+            text = text.replace("+00:00", "Z")
+        return text
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    # UTC datetimes render with a "Z" suffix, matching Pydantic's output for
+    # UserResponse.created_at/updated_at
+    _ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes"""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    def loads(data: str | bytes) -> Any:
+        """Parse JSON text or bytes"""
+        return orjson.loads(data)
+
+else:  # pragma: no cover - stdlib fallback
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes"""
+        return json.dumps(
+            obj, default=_default, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    def loads(data: str | bytes) -> Any:
+        """Parse JSON text or bytes"""
+        return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize to a compact JSON string"""
+    return dumps_bytes(obj).decode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class rendering through the fast JSON backend"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
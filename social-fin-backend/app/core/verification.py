@@ -0,0 +1,105 @@
+import hashlib
+import hmac
+from typing import Optional
+from app.config import settings
+from app.core.exceptions import VerificationAttemptsExceededError
+from app.core.security import security_utils
+
+# Counts the attempt and returns the stored hash and user ID in one round
+# trip; the key is dropped once the attempt budget is spent
+_ATTEMPT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+if attempts > tonumber(ARGV[1]) then
+    redis.call('DEL', KEYS[1])
+    return {'locked'}
+end
+return redis.call('HMGET', KEYS[1], 'code_hash', 'user_id')
+"""
+
+
+class VerificationCodeStore:
+    """
+    Email verification codes in Redis, keyed by a keyed hash of the email.
+
+    Codes are stored hashed, expire after a TTL, allow a bounded number of
+    attempts and can be consumed exactly once.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        ttl_seconds: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        prefix: str = "verify_email:",
+    ):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds or settings.verification_code_ttl_seconds
+        self.max_attempts = max_attempts or settings.verification_max_attempts
+        self.prefix = prefix
+        self._attempt = self.redis.register_script(_ATTEMPT_SCRIPT)
+
+    @staticmethod
+    def _digest(value: str) -> str:
+        return hmac.new(
+            settings.jwt_secret_key.encode("utf-8"),
+            value.encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+
+    def _key(self, email: str) -> str:
+        return self.prefix + self._digest(email.strip().lower())
+
+    async def issue(self, email: str, user_id: str) -> str:
+        """Create (or replace) the code for an email and return it"""
+        code = security_utils.generate_verification_code()
+        key = self._key(email)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(
+                key,
+                mapping={
+                    "code_hash": self._digest(code),
+                    "user_id": user_id,
+                    "attempts": 0,
+                },
+            )
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+        return code
+
+    async def reserve_resend(self, email: str) -> bool:
+        """Claim the email's resend slot; False while the cooldown runs"""
+        key = f"{self.prefix}resend:{self._digest(email.strip().lower())}"
+        return bool(
+            await self.redis.set(
+                key, 1, nx=True, ex=settings.verification_resend_cooldown_seconds
+            )
+        )
+
+    async def consume(self, email: str, code: str) -> Optional[str]:
+        """
+        Check a code and consume it on success.
+
+        Returns the user ID when the code matches, None otherwise. Raises
+        VerificationAttemptsExceededError once the attempt budget is spent.
+        """
+        key = self._key(email)
+        result = await self._attempt(keys=[key], args=[self.max_attempts])
+        if not result:
+            return None
+        if result[0] == "locked":
+            raise VerificationAttemptsExceededError(
+                "Too many verification attempts. Request a new code."
+            )
+
+        code_hash, user_id = result
+        if not code_hash or not hmac.compare_digest(code_hash, self._digest(code)):
+            return None
+
+        # Only one of several concurrent correct submissions wins the delete
+        if await self.redis.delete(key) != 1:
+            return None
+        return user_id
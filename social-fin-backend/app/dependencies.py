@@ -1,17 +1,29 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
+from app.config import settings
+from app.core.cache import principal_cache
 from app.core.database import supabase
+from app.core.revocation import revocation_list
 from app.core.security import security_utils
 from app.models.user import User
+from app.services.profile import PRINCIPAL_COLUMNS, profile_service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+async def get_current_user(
+    request: Request, token: str = Depends(oauth2_scheme)
+) -> User:
     """
     Get current authenticated user from JWT token
     """
+    # Batch sub-requests carry the principal already resolved for the batch
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -35,25 +47,29 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     except JWTError as exc:
         raise credentials_exception from exc
 
+    # Reject revoked tokens (logout)
+    jti = payload.get("jti")
+    if jti and await revocation_list.is_revoked(jti):
+        raise credentials_exception
+
+    # Serve the principal from the in-process cache when possible
+    cached_user = principal_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+
     # Get user from database
+    cache_version = principal_cache.version
     try:
         user_data = supabase.service_client.auth.admin.get_user_by_id(user_id)
         if not user_data:
             raise credentials_exception
 
-        # Get user profile
-        profile_response = (
-            supabase.service_client.table("user_profiles")
-            .select("*")
-            .eq("id", user_id)
-            .single()
-            .execute()
-        )
-
-        if not profile_response.data:
-            raise credentials_exception
+        # Get user profile (only the columns the principal needs)
+        profile = await profile_service.get_profile(user_id, PRINCIPAL_COLUMNS)
 
-        return User.from_supabase_user(user_data.model_dump(), profile_response.data)
+        user = User.from_supabase_user(user_data.user.model_dump(mode="json"), profile)
+        principal_cache.set(user_id, user, version=cache_version)
+        return user
 
     except Exception as e:
         raise credentials_exception from e
@@ -84,3 +100,23 @@ async def get_verified_user(
             detail="Please verify your email address",
         )
     return current_user
+
+
+async def require_metrics_token(request: Request):
+    """
+    Guard internal endpoints with the shared metrics token
+
+    Responds 404 while no token is configured, so the endpoint stays hidden.
+    """
+    if not settings.metrics_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode("utf-8"), settings.metrics_token.encode("utf-8")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
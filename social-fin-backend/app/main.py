@@ -5,6 +5,12 @@ import logging
 
 from app.api.v1.router import api_router
 from app.config import settings
+from app.core.invalidation import invalidation_bus
+from app.core.push import push_hub
+from app.core.redis_client import redis_client
+from app.core.revocation import revocation_list
+from app.core.serialization import FastJSONResponse
+from app.middleware.idempotency import IdempotencyMiddleware
 from app.middleware.logging import LoggingMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
 
@@ -18,15 +24,23 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up SocialFin API...")
     # Initialize connections, load ML models, etc.
+    revocation_list.start()
+    invalidation_bus.start()
+    push_hub.start()
     yield
     # Shutdown
     logger.info("Shutting down SocialFin API...")
+    await push_hub.stop()
+    await invalidation_bus.stop()
+    await revocation_list.stop()
+    await redis_client.close()
 
 
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
 )
@@ -39,6 +53,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(IdempotencyMiddleware)
 app.add_middleware(LoggingMiddleware)
 app.add_middleware(RateLimitMiddleware)
 
@@ -1,4 +1,5 @@
 from .logging import LoggingMiddleware
 from .auth import AuthMiddleware
+from .idempotency import IdempotencyMiddleware
 
-__all__ = ["LoggingMiddleware", "AuthMiddleware"]
+__all__ = ["LoggingMiddleware", "AuthMiddleware", "IdempotencyMiddleware"]
@@ -0,0 +1,218 @@
+import hashlib
+import logging
+from typing import Callable, Optional
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_409_CONFLICT
+from starlette.types import Message
+import redis.asyncio as redis
+from app.config import settings
+from app.core.idempotency import (
+    COMPLETED,
+    IdempotencyRecord,
+    IdempotencyStore,
+    RedisIdempotencyStore,
+)
+from app.core.redis_client import redis_client
+from app.core.serialization import dumps_bytes
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+# Headers recomputed by the response on replay
+_SKIP_HEADERS = {"content-length"}
+
+# Unprocessable Content; the starlette constant was renamed across releases
+HTTP_422 = 422
+
+
+class IdempotencyMiddleware(BaseHTTPMiddleware):
+    """
+    Replay the first completed response for a repeated Idempotency-Key.
+
+    Concurrent duplicates wait for the in-flight request to finish instead
+    of running the handler again. Server errors are not stored, so the
+    client can retry them.
+    """
+
+    def __init__(
+        self,
+        app,
+        store: Optional[IdempotencyStore] = None,
+        include_paths: Optional[list] = None,
+        credential_paths: Optional[list] = None,
+        ttl_seconds: Optional[int] = None,
+        credential_ttl_seconds: Optional[int] = None,
+        lock_ttl_seconds: int = 60,
+        wait_timeout: float = 15.0,
+    ):
+        super().__init__(app)
+        self.store = store or RedisIdempotencyStore(redis_client.client)
+        self.include_paths = include_paths or [
+            "/api/v1/auth/register",
+            "/api/v1/auth/refresh",
+            "/api/v1/auth/password/",
+        ]
+        # Responses that carry tokens; only their outcome is kept, briefly,
+        # so replays can't hand out credentials that have since rotated
+        self.credential_paths = credential_paths or [
+            "/api/v1/auth/register",
+            "/api/v1/auth/refresh",
+        ]
+        self.ttl_seconds = ttl_seconds or settings.idempotency_ttl_seconds
+        self.credential_ttl_seconds = (
+            credential_ttl_seconds or settings.idempotency_credential_ttl_seconds
+        )
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.wait_timeout = wait_timeout
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if (
+            not key
+            or request.method not in ["POST", "PUT", "PATCH", "DELETE"]
+            or not any(request.url.path.startswith(p) for p in self.include_paths)
+        ):
+            return await call_next(request)
+
+        if len(key) > MAX_KEY_LENGTH:
+            return self._error(
+                HTTP_400_BAD_REQUEST,
+                f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters",
+            )
+
+        body_bytes = await request.body()
+
+        # Make the body readable again for the endpoint
+        async def receive() -> Message:
+            return {"type": "http.request", "body": body_bytes}
+
+        request._receive = receive
+
+        # Keys are scoped to the endpoint and caller; the fingerprint catches
+        # a key being reused for a different payload
+        authorization = request.headers.get("Authorization", "")
+        storage_key = self._hash(request.url.path, authorization, key)
+        fingerprint = self._hash(request.method, request.url.path, body_bytes)
+
+        try:
+            acquired = await self.store.acquire(
+                storage_key, fingerprint, self.lock_ttl_seconds
+            )
+        except redis.RedisError:
+            # Fail open, like rate limiting
+            logger.error("Redis unavailable for idempotency keys")
+            return await call_next(request)
+
+        if acquired:
+            return await self._process(request, call_next, storage_key, fingerprint)
+
+        try:
+            record = await self.store.get(storage_key)
+            if record and record.fingerprint != fingerprint:
+                return self._error(
+                    HTTP_422,
+                    f"{IDEMPOTENCY_HEADER} was already used for a different request",
+                )
+
+            if not record or record.state != COMPLETED:
+                record = await self.store.wait(storage_key, self.wait_timeout)
+        except redis.RedisError:
+            logger.error("Redis unavailable for idempotency keys")
+            return await call_next(request)
+
+        if not record:
+            return self._error(
+                HTTP_409_CONFLICT,
+                "A request with this Idempotency-Key is still being processed",
+            )
+
+        return self._replay(record)
+
+    async def _process(
+        self, request: Request, call_next: Callable, storage_key: str, fingerprint: str
+    ) -> Response:
+        """Run the request and store its response for later replays"""
+        try:
+            response = await call_next(request)
+        except Exception:
+            await self.store.release(storage_key)
+            raise
+
+        if response.status_code >= 500:
+            await self.store.release(storage_key)
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = [
+            (name, value)
+            for name, value in response.headers.items()
+            if name not in _SKIP_HEADERS
+        ]
+        if any(request.url.path.startswith(p) for p in self.credential_paths):
+            record = IdempotencyRecord(
+                state=COMPLETED,
+                fingerprint=fingerprint,
+                status_code=response.status_code,
+                withheld=True,
+            )
+            ttl = self.credential_ttl_seconds
+        else:
+            record = IdempotencyRecord(
+                state=COMPLETED,
+                fingerprint=fingerprint,
+                status_code=response.status_code,
+                headers=headers,
+                body=body,
+            )
+            ttl = self.ttl_seconds
+
+        try:
+            await self.store.complete(storage_key, record, ttl)
+        except redis.RedisError:
+            # The handler's side effects already happened; don't hide them
+            # behind a 500. Free the key so a retry isn't refused.
+            logger.error("Redis unavailable to store idempotent response")
+            try:
+                await self.store.release(storage_key)
+            except redis.RedisError:
+                pass
+
+        return self._response(response.status_code, headers, body)
+
+    def _replay(self, record: IdempotencyRecord) -> Response:
+        """Rebuild the stored response"""
+        if record.withheld:
+            return self._error(
+                HTTP_409_CONFLICT,
+                "A request with this Idempotency-Key already completed; "
+                "its credentials are not replayed",
+            )
+        response = self._response(record.status_code, record.headers, record.body)
+        response.headers["Idempotent-Replayed"] = "true"
+        return response
+
+    @staticmethod
+    def _response(status_code: int, headers: list, body: bytes) -> Response:
+        response = Response(content=body, status_code=status_code)
+        # Appended one by one so repeated headers (Set-Cookie) all survive
+        for name, value in headers:
+            response.headers.append(name, value)
+        return response
+
+    def _error(self, status_code: int, detail: str) -> Response:
+        return Response(
+            content=dumps_bytes({"detail": detail}),
+            status_code=status_code,
+            media_type="application/json",
+        )
+
+    @staticmethod
+    def _hash(*parts) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
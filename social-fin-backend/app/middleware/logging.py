@@ -1,5 +1,4 @@
 import time
-import json
 import logging
 from typing import Callable, Optional
 from fastapi import Request, Response
@@ -7,6 +6,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import Message
 from datetime import datetime
 import uuid
+from app.core.serialization import dumps, loads
 
 # Configure logger
 logger = logging.getLogger("socialfin.api")
@@ -68,11 +68,11 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 
                     # Try to parse as JSON for logging
                     try:
-                        body = json.loads(body_bytes)
+                        body = loads(body_bytes)
                         # Mask sensitive fields
                         if isinstance(body, dict):
                             body = self._mask_sensitive_data(body.copy())
-                    except json.JSONDecodeError:
+                    except ValueError:
                         body = f"<Binary data: {len(body_bytes)} bytes>"
             except Exception as e:
                 logger.error(f"Error reading request body: {e}")
@@ -98,7 +98,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             if header in log_data["headers"]:
                 log_data["headers"][header] = "***MASKED***"
 
-        logger.info(f"Incoming request: {json.dumps(log_data)}")
+        logger.info(f"Incoming request: {dumps(log_data)}")
 
     async def _log_response(
         self, request: Request, response: Response, process_time: float, request_id: str
@@ -119,11 +119,11 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 
         # Log level based on status code
         if response.status_code >= 500:
-            logger.error(f"Request failed: {json.dumps(log_data)}")
+            logger.error(f"Request failed: {dumps(log_data)}")
         elif response.status_code >= 400:
-            logger.warning(f"Request rejected: {json.dumps(log_data)}")
+            logger.warning(f"Request rejected: {dumps(log_data)}")
         else:
-            logger.info(f"Request completed: {json.dumps(log_data)}")
+            logger.info(f"Request completed: {dumps(log_data)}")
 
     def _mask_sensitive_data(self, data: dict) -> dict:
         """Mask sensitive fields in request/response data"""
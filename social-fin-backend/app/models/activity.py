@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+from typing import Any, Dict
+from datetime import datetime
+
+
+@dataclass
+class Activity:
+    """Data class representing an entry in friends' feeds"""
+
+    id: str
+    actor_id: str
+    type: str
+    payload: Dict[str, Any]
+    created_at: datetime
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "actor_id": self.actor_id,
+            "type": self.type,
+            "payload": self.payload,
+            "created_at": self.created_at.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Activity":
+        """Create Activity instance from its stored JSON form"""
+        return cls(
+            id=data["id"],
+            actor_id=data["actor_id"],
+            type=data["type"],
+            payload=data.get("payload") or {},
+            created_at=datetime.fromisoformat(
+                data["created_at"].replace("Z", "+00:00")
+            ),
+        )
@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class Challenge:
+    """Data class representing a savings challenge among friends"""
+
+    id: str
+    name: str
+    metric: str
+    category: Optional[str]
+    start_period: str  # YYYY-MM, inclusive
+    end_period: str  # YYYY-MM, inclusive
+    created_by: str
+
+    def covers(self, period: str) -> bool:
+        """Whether a budget period counts toward the challenge"""
+        return self.start_period <= period <= self.end_period
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "metric": self.metric,
+            "category": self.category,
+            "start_period": self.start_period,
+            "end_period": self.end_period,
+            "created_by": self.created_by,
+        }
+
+    @classmethod
+    def from_row(cls, row: dict) -> "Challenge":
+        """Create Challenge instance from a `challenges` table row"""
+        return cls(
+            id=row["id"],
+            name=row["name"],
+            metric=row["metric"],
+            category=row.get("category"),
+            start_period=row["start_period"],
+            end_period=row["end_period"],
+            created_by=row["created_by"],
+        )
@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+from datetime import datetime
+
+
+@dataclass
+class ExpenseGroup:
+    """Data class representing a group that splits expenses"""
+
+    id: str
+    name: str
+    created_by: str
+    created_at: datetime
+
+    @classmethod
+    def from_row(cls, row: dict) -> "ExpenseGroup":
+        """Create ExpenseGroup instance from an `expense_groups` table row"""
+        return cls(
+            id=row["id"],
+            name=row["name"],
+            created_by=row["created_by"],
+            created_at=datetime.fromisoformat(row["created_at"].replace("Z", "+00:00")),
+        )
+
+
+@dataclass
+class GroupExpense:
+    """Data class representing an expense (or a settle-up payment) in a group"""
+
+    id: str
+    group_id: str
+    paid_by: str
+    amount_cents: int
+    # What each member owes for it, in cents; sums to amount_cents
+    shares: Dict[str, int]
+    description: Optional[str]
+    kind: str  # "expense" or "settlement"
+    created_at: datetime
+
+    @classmethod
+    def from_row(cls, row: dict) -> "GroupExpense":
+        """Create GroupExpense instance from a `group_expenses` table row"""
+        return cls(
+            id=row["id"],
+            group_id=row["group_id"],
+            paid_by=row["paid_by"],
+            amount_cents=int(row["amount_cents"]),
+            shares={user_id: int(cents) for user_id, cents in row["shares"].items()},
+            description=row.get("description"),
+            kind=row.get("kind", "expense"),
+            created_at=datetime.fromisoformat(row["created_at"].replace("Z", "+00:00")),
+        )
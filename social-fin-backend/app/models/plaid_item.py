@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class PlaidItem:
+    """Data class representing a linked institution login (a Plaid Item)"""
+
+    id: str
+    user_id: str
+    access_token: str
+    institution_id: Optional[str]
+    cursor: Optional[str]
+
+    @classmethod
+    def from_row(cls, row: dict) -> "PlaidItem":
+        """Create PlaidItem instance from a `plaid_items` table row"""
+        return cls(
+            id=row["id"],
+            user_id=row["user_id"],
+            access_token=row["access_token"],
+            institution_id=row.get("institution_id"),
+            cursor=row.get("cursor"),
+        )
@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+from typing import Optional
+from datetime import datetime
+
+
+@dataclass
+class Session:
+    """Data class representing one signed-in device"""
+
+    id: str
+    user_id: str
+    device: Optional[str]
+    ip_address: Optional[str]
+    refresh_jti: str
+    access_jti: Optional[str]
+    access_expires_at: Optional[int]
+    created_at: datetime
+    last_used_at: datetime
+
+    def to_redis(self) -> dict:
+        """Flatten into a Redis hash"""
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "device": self.device or "",
+            "ip_address": self.ip_address or "",
+            "refresh_jti": self.refresh_jti,
+            "access_jti": self.access_jti or "",
+            "access_expires_at": self.access_expires_at or 0,
+            "created_at": self.created_at.isoformat(),
+            "last_used_at": self.last_used_at.isoformat(),
+        }
+
+    @classmethod
+    def from_redis(cls, data: dict) -> "Session":
+        """Create Session instance from a Redis hash"""
+        return cls(
+            id=data["id"],
+            user_id=data["user_id"],
+            device=data.get("device") or None,
+            ip_address=data.get("ip_address") or None,
+            refresh_jti=data["refresh_jti"],
+            access_jti=data.get("access_jti") or None,
+            access_expires_at=int(data.get("access_expires_at") or 0) or None,
+            created_at=datetime.fromisoformat(data["created_at"]),
+            last_used_at=datetime.fromisoformat(data["last_used_at"]),
+        )
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from typing import Optional
+from datetime import date, datetime
+
+
+@dataclass
+class Transaction:
+    """Data class representing a posted or pending card/bank transaction"""
+
+    id: str
+    user_id: str
+    item_id: str
+    account_id: str
+    amount: float
+    iso_currency_code: Optional[str]
+    date: date
+    authorized_date: Optional[date]
+    name: str
+    merchant_name: Optional[str]
+    category: Optional[str]
+    category_detailed: Optional[str]
+    pending: bool
+
+    @classmethod
+    def from_plaid(cls, plaid_txn: dict, user_id: str, item_id: str) -> "Transaction":
+        """Create Transaction instance from a Plaid /transactions/sync entry"""
+        category = plaid_txn.get("personal_finance_category") or {}
+        authorized_date = plaid_txn.get("authorized_date")
+        return cls(
+            id=plaid_txn["transaction_id"],
+            user_id=user_id,
+            item_id=item_id,
+            account_id=plaid_txn["account_id"],
+            amount=float(plaid_txn["amount"]),
+            iso_currency_code=plaid_txn.get("iso_currency_code"),
+            date=date.fromisoformat(plaid_txn["date"]),
+            authorized_date=(
+                date.fromisoformat(authorized_date) if authorized_date else None
+            ),
+            name=plaid_txn.get("name") or "",
+            merchant_name=plaid_txn.get("merchant_name"),
+            category=category.get("primary"),
+            category_detailed=category.get("detailed"),
+            pending=bool(plaid_txn.get("pending", False)),
+        )
+
+    @classmethod
+    def from_row(cls, row: dict) -> "Transaction":
+        """Create Transaction instance from a `transactions` table row"""
+        authorized_date = row.get("authorized_date")
+        return cls(
+            id=row["id"],
+            user_id=row["user_id"],
+            item_id=row["item_id"],
+            account_id=row["account_id"],
+            amount=float(row["amount"]),
+            iso_currency_code=row.get("iso_currency_code"),
+            date=date.fromisoformat(row["date"]),
+            authorized_date=(
+                date.fromisoformat(authorized_date) if authorized_date else None
+            ),
+            name=row.get("name") or "",
+            merchant_name=row.get("merchant_name"),
+            category=row.get("category"),
+            category_detailed=row.get("category_detailed"),
+            pending=bool(row.get("pending", False)),
+        )
+
+    def to_row(self) -> dict:
+        """Serialize for an upsert into the `transactions` table"""
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "item_id": self.item_id,
+            "account_id": self.account_id,
+            "amount": self.amount,
+            "iso_currency_code": self.iso_currency_code,
+            "date": self.date.isoformat(),
+            "authorized_date": (
+                self.authorized_date.isoformat() if self.authorized_date else None
+            ),
+            "name": self.name,
+            "merchant_name": self.merchant_name,
+            "category": self.category,
+            "category_detailed": self.category_detailed,
+            "pending": self.pending,
+            "updated_at": datetime.utcnow().isoformat(),
+        }
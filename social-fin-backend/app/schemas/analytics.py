@@ -0,0 +1,38 @@
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+
+class CategoryMonthTotal(BaseModel):
+    month: str
+    category: str
+    total: float
+    count: int
+
+
+class MonthlySummary(BaseModel):
+    month: str
+    income: float
+    spending: float
+    net: float
+    spending_change: Optional[float] = None
+    spending_change_pct: Optional[float] = None
+
+
+class DailyPoint(BaseModel):
+    date: str
+    spending: float
+    balance: float
+    rolling_spending: float
+
+
+class CategoryDistribution(BaseModel):
+    category: str
+    count: int
+    mean: float
+    percentiles: Dict[str, float]
+
+
+class MerchantTotal(BaseModel):
+    merchant: str
+    total: float
+    count: int
@@ -53,6 +53,10 @@ class EmailVerification(BaseModel):
     code: str
 
 
+class EmailResend(BaseModel):
+    email: EmailStr
+
+
 class UserResponse(BaseModel):
     id: str
     email: str
@@ -62,3 +66,12 @@ class UserResponse(BaseModel):
     is_verified: bool
     created_at: datetime
     updated_at: datetime
+
+
+class SessionResponse(BaseModel):
+    id: str
+    device: Optional[str]
+    ip_address: Optional[str]
+    created_at: datetime
+    last_used_at: datetime
+    current: bool = False
@@ -0,0 +1,8 @@
+from typing import Dict
+from pydantic import BaseModel
+
+
+class BudgetTotalsResponse(BaseModel):
+    period: str
+    total: float
+    categories: Dict[str, float]
@@ -0,0 +1,48 @@
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+
+PERIOD_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+class ChallengeMetric(str, Enum):
+    SAVINGS = "savings"
+    CATEGORY_SPENDING = "category_spending"
+
+
+class ChallengeCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    metric: ChallengeMetric
+    category: Optional[str] = None
+    start_period: str = Field(..., pattern=PERIOD_PATTERN)
+    end_period: str = Field(..., pattern=PERIOD_PATTERN)
+
+    @model_validator(mode="after")
+    def validate_challenge(self) -> "ChallengeCreate":
+        if self.start_period > self.end_period:
+            raise ValueError("start_period must not be after end_period")
+        if self.metric == ChallengeMetric.CATEGORY_SPENDING and not self.category:
+            raise ValueError("category is required for category_spending")
+        return self
+
+
+class ChallengeResponse(BaseModel):
+    id: str
+    name: str
+    metric: str
+    category: Optional[str]
+    start_period: str
+    end_period: str
+    created_by: str
+
+
+class LeaderboardEntryResponse(BaseModel):
+    rank: int
+    user_id: str
+    value: float
+
+
+class StandingResponse(BaseModel):
+    rank: Optional[int]
+    participants: int
+    neighbors: List[LeaderboardEntryResponse]
@@ -0,0 +1,43 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ActivityType(str, Enum):
+    SAVINGS_MILESTONE = "savings_milestone"
+    EXPENSE_SPLIT = "expense_split"
+    CHALLENGE_JOINED = "challenge_joined"
+    CHALLENGE_COMPLETED = "challenge_completed"
+
+
+class UserActivityType(str, Enum):
+    """Types users may post; the rest are published by the server"""
+
+    SAVINGS_MILESTONE = "savings_milestone"
+
+
+class SavingsMilestonePayload(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    amount: float = Field(..., gt=0, le=1_000_000_000)
+    goal: Optional[str] = Field(None, max_length=100)
+    message: Optional[str] = Field(None, max_length=280)
+
+
+class ActivityCreate(BaseModel):
+    type: UserActivityType
+    payload: SavingsMilestonePayload
+
+
+class ActivityResponse(BaseModel):
+    id: str
+    actor_id: str
+    type: str
+    payload: Dict[str, Any]
+    created_at: datetime
+
+
+class FeedPageResponse(BaseModel):
+    items: List[ActivityResponse]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,19 @@
+from typing import Dict, List
+from pydantic import BaseModel
+
+
+class FriendListResponse(BaseModel):
+    friends: List[str]
+
+
+class FriendRequestResponse(BaseModel):
+    status: str
+
+
+class FriendSuggestionResponse(BaseModel):
+    user_id: str
+    mutual_friends: int
+
+
+class MutualCountsResponse(BaseModel):
+    counts: Dict[str, int]
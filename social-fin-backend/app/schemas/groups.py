@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, model_validator
+
+
+class GroupCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    member_ids: List[str] = Field(default_factory=list, max_length=100)
+
+
+class GroupMemberAdd(BaseModel):
+    user_id: str
+
+
+class GroupResponse(BaseModel):
+    id: str
+    name: str
+    created_by: str
+    created_at: datetime
+
+
+class ExpenseCreate(BaseModel):
+    amount: float = Field(..., gt=0)
+    description: Optional[str] = Field(None, max_length=200)
+    paid_by: Optional[str] = None
+    # Split evenly among these members (default: everyone in the group) ...
+    participant_ids: Optional[List[str]] = None
+    # ... or exactly these amounts, which must add up to `amount`
+    shares: Optional[Dict[str, float]] = None
+
+    @model_validator(mode="after")
+    def validate_split(self) -> "ExpenseCreate":
+        if self.participant_ids is not None and self.shares is not None:
+            raise ValueError("Give either participant_ids or shares, not both")
+        if self.participant_ids is not None and not self.participant_ids:
+            raise ValueError("participant_ids must not be empty")
+        if self.shares is not None and any(v < 0 for v in self.shares.values()):
+            raise ValueError("Shares must not be negative")
+        return self
+
+
+class ExpenseResponse(BaseModel):
+    id: str
+    paid_by: str
+    amount: float
+    shares: Dict[str, float]
+    description: Optional[str]
+    kind: str
+    created_at: datetime
+
+
+class SettlementCreate(BaseModel):
+    to_user_id: str
+    amount: float = Field(..., gt=0)
+
+
+class BalancesResponse(BaseModel):
+    # Positive: the member is owed money; negative: they owe
+    balances: Dict[str, float]
+
+
+class TransferResponse(BaseModel):
+    from_user_id: str
+    to_user_id: str
+    amount: float
+
+
+class SettleUpResponse(BaseModel):
+    transfers: List[TransferResponse]
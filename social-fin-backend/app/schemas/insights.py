@@ -0,0 +1,8 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class InsightResponse(BaseModel):
+    text: str
+    generated_at: datetime
+    cached: bool
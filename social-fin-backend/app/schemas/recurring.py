@@ -0,0 +1,14 @@
+from datetime import date
+from pydantic import BaseModel
+
+
+class RecurringChargeResponse(BaseModel):
+    merchant: str
+    cadence: str
+    interval_days: float
+    occurrences: int
+    average_amount: float
+    last_amount: float
+    last_date: date
+    next_date: date
+    active: bool
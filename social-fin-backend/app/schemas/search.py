@@ -0,0 +1,20 @@
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    id: str
+    date: date
+    amount: float
+    name: str
+    merchant_name: Optional[str] = None
+    category: Optional[str] = None
+    pending: bool = False
+    account_id: str
+
+
+class SearchResponse(BaseModel):
+    results: List[SearchResult]
+    total: int
+    has_more: bool
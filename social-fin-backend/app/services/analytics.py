@@ -0,0 +1,341 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from app.config import settings
+from app.core.cache import analytics_cache
+from app.core.invalidation import InvalidationEvent, invalidation_bus
+from app.models.plaid_item import PlaidItem
+from app.models.transaction import Transaction
+from app.services.plaid_sync import SyncPage, sync_engine
+
+logger = logging.getLogger(__name__)
+
+UNCATEGORIZED = "UNCATEGORIZED"
+UNKNOWN_MERCHANT = "Unknown"
+FRAME_COLUMNS = "id,amount,date,category,merchant_name,name"
+DEFAULT_PERCENTILES = (50, 75, 90, 99)
+
+# datetime64[D] counts days from 1970-01-01; ordinals count from 0001-01-01
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _encode(values: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """Dictionary-encode strings as int32 codes in first-seen order"""
+    index: Dict[str, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(value, len(index)) for value in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return codes, list(index)
+
+
+def _dollars(cents: np.ndarray) -> List[float]:
+    return np.round(cents / 100, 2).tolist()
+
+
+@dataclass(frozen=True)
+class TransactionFrame:
+    """
+    A user's transactions as parallel NumPy columns.
+
+    Amounts are integer cents using Plaid's sign convention (positive is
+    money out), days are proleptic Gregorian ordinals, months count from
+    1970-01, and categories and merchants are codes into the `categories`
+    and `merchants` labels.
+    """
+
+    amount: np.ndarray  # int64 cents
+    day: np.ndarray  # int32 date ordinal
+    month: np.ndarray  # int32 months since 1970-01
+    category: np.ndarray  # int32 code
+    merchant: np.ndarray  # int32 code
+    categories: List[str]
+    merchants: List[str]
+
+    @classmethod
+    def from_columns(
+        cls,
+        amounts: Sequence[Any],
+        dates: Sequence[Any],
+        categories: Sequence[Optional[str]],
+        merchants: Sequence[Optional[str]],
+    ) -> "TransactionFrame":
+        """Build a frame from raw column values (ISO date strings or dates)"""
+        amount = np.rint(np.asarray(amounts, dtype=np.float64) * 100).astype(np.int64)
+        days = np.asarray(dates, dtype="datetime64[D]")
+        day = (days.astype(np.int64) + _EPOCH_ORDINAL).astype(np.int32)
+        month = days.astype("datetime64[M]").astype(np.int32)
+        category, category_labels = _encode(
+            [value or UNCATEGORIZED for value in categories]
+        )
+        merchant, merchant_labels = _encode(
+            [value or UNKNOWN_MERCHANT for value in merchants]
+        )
+        return cls(
+            amount, day, month, category, merchant, category_labels, merchant_labels
+        )
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "TransactionFrame":
+        transactions = list(transactions)
+        return cls.from_columns(
+            [txn.amount for txn in transactions],
+            [txn.date for txn in transactions],
+            [txn.category for txn in transactions],
+            [txn.merchant_name or txn.name for txn in transactions],
+        )
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    def select(self, mask: np.ndarray) -> "TransactionFrame":
+        """Rows where `mask` is true, sharing this frame's labels"""
+        return TransactionFrame(
+            self.amount[mask],
+            self.day[mask],
+            self.month[mask],
+            self.category[mask],
+            self.merchant[mask],
+            self.categories,
+            self.merchants,
+        )
+
+    def between(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> "TransactionFrame":
+        """Rows dated within [start, end]"""
+        if start is None and end is None:
+            return self
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.day >= start.toordinal()
+        if end is not None:
+            mask &= self.day <= end.toordinal()
+        return self.select(mask)
+
+    def spending(self) -> "TransactionFrame":
+        """Outflows only"""
+        return self.select(self.amount > 0)
+
+
+def _month_label(months: np.ndarray) -> List[str]:
+    return np.datetime_as_string(months.astype("datetime64[M]")).tolist()
+
+
+def _date_label(days: np.ndarray) -> List[str]:
+    return np.datetime_as_string(
+        (days - _EPOCH_ORDINAL).astype("datetime64[D]")
+    ).tolist()
+
+
+def spending_by_category_month(frame: TransactionFrame) -> List[Dict[str, Any]]:
+    """Spend and transaction count per (month, category)"""
+    spend = frame.spending()
+    if not len(spend):
+        return []
+
+    # Dense (month, category) keys: the key space is small, so counting
+    # into it beats sorting the rows
+    first_month = int(spend.month.min())
+    width = len(spend.categories)
+    keys = (spend.month - first_month) * width + spend.category
+    counts = np.bincount(keys)
+    groups = np.flatnonzero(counts)
+    # float64 weights are exact for any realistic sum of cents (< 2**53)
+    totals = np.bincount(keys, weights=spend.amount)[groups].astype(np.int64)
+    counts = counts[groups]
+
+    months = _month_label(groups // width + first_month)
+    labels = [spend.categories[code] for code in (groups % width).tolist()]
+    return [
+        {"month": m, "category": c, "total": t, "count": n}
+        for m, c, t, n in zip(months, labels, _dollars(totals), counts.tolist())
+    ]
+
+
+def monthly_summary(frame: TransactionFrame) -> List[Dict[str, Any]]:
+    """Income, spending and net per month, with month-over-month change"""
+    if not len(frame):
+        return []
+
+    month = frame.month
+    first_month = int(month.min())
+    offset = month - first_month
+    length = int(offset.max()) + 1
+    spending = np.bincount(
+        offset, weights=np.maximum(frame.amount, 0), minlength=length
+    ).astype(np.int64)
+    income = np.bincount(
+        offset, weights=np.maximum(-frame.amount, 0), minlength=length
+    ).astype(np.int64)
+    change = np.diff(spending, prepend=spending[:1])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        previous = np.concatenate(([0], spending[:-1]))
+        change_pct = np.where(previous > 0, change / previous * 100, np.nan)
+
+    months = _month_label(np.arange(first_month, first_month + length))
+    rows = []
+    for i, (m, inc, out, net, delta, pct) in enumerate(
+        zip(
+            months,
+            _dollars(income),
+            _dollars(spending),
+            _dollars(income - spending),
+            _dollars(change),
+            np.round(change_pct, 1).tolist(),
+        )
+    ):
+        rows.append(
+            {
+                "month": m,
+                "income": inc,
+                "spending": out,
+                "net": net,
+                "spending_change": delta if i else None,
+                "spending_change_pct": None if np.isnan(pct) else pct,
+            }
+        )
+    return rows
+
+
+def daily_series(
+    frame: TransactionFrame, window: int = 30, opening_balance: float = 0.0
+) -> List[Dict[str, Any]]:
+    """
+    Per-day spending, running balance and trailing `window`-day spending.
+
+    The balance is the opening balance plus cumulative net cash flow, so it
+    tracks linked accounts only as far back as their transaction history.
+    """
+    if not len(frame):
+        return []
+
+    first_day = int(frame.day.min())
+    offset = frame.day - first_day
+    length = int(offset.max()) + 1
+    net_flow = np.bincount(offset, weights=-frame.amount, minlength=length)
+    spending = np.bincount(
+        offset, weights=np.maximum(frame.amount, 0), minlength=length
+    ).astype(np.int64)
+
+    balance = np.rint(opening_balance * 100) + np.cumsum(net_flow).astype(np.int64)
+    cumulative = np.cumsum(spending)
+    rolling = cumulative.copy()
+    rolling[window:] -= cumulative[:-window]
+
+    return [
+        {"date": d, "spending": s, "balance": b, "rolling_spending": r}
+        for d, s, b, r in zip(
+            _date_label(np.arange(first_day, first_day + length)),
+            _dollars(spending),
+            _dollars(balance),
+            _dollars(rolling),
+        )
+    ]
+
+
+def category_percentiles(
+    frame: TransactionFrame, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+) -> List[Dict[str, Any]]:
+    """Distribution of purchase sizes per category (linear interpolation)"""
+    spend = frame.spending()
+    if not len(spend):
+        return []
+
+    # Sort by category, then amount, and read every group's quantiles at once
+    order = np.lexsort((spend.amount, spend.category))
+    amounts = spend.amount[order]
+    counts = np.bincount(spend.category, minlength=len(spend.categories))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = np.flatnonzero(counts)
+
+    q = np.asarray(percentiles, dtype=np.float64) / 100
+    position = starts[present, None] + (counts[present, None] - 1) * q[None, :]
+    low = np.floor(position).astype(np.int64)
+    high = np.ceil(position).astype(np.int64)
+    values = amounts[low] + (amounts[high] - amounts[low]) * (position - low)
+
+    totals = np.bincount(spend.category, weights=spend.amount)[present]
+    rows = []
+    for code, count, total, row in zip(
+        present.tolist(), counts[present].tolist(), totals, values
+    ):
+        rows.append(
+            {
+                "category": spend.categories[code],
+                "count": count,
+                "mean": round(float(total) / count / 100, 2),
+                "percentiles": {
+                    f"p{p:g}": v for p, v in zip(percentiles, _dollars(row))
+                },
+            }
+        )
+    return rows
+
+
+def top_merchants(frame: TransactionFrame, limit: int = 10) -> List[Dict[str, Any]]:
+    """Merchants with the highest total spend"""
+    spend = frame.spending()
+    if not len(spend):
+        return []
+
+    totals = np.bincount(
+        spend.merchant, weights=spend.amount, minlength=len(spend.merchants)
+    ).astype(np.int64)
+    counts = np.bincount(spend.merchant, minlength=len(spend.merchants))
+    limit = min(limit, int(np.count_nonzero(counts)))
+    top = np.argpartition(-totals, limit - 1)[:limit]
+    top = top[np.argsort(-totals[top], kind="stable")]
+    return [
+        {"merchant": spend.merchants[code], "total": total, "count": count}
+        for code, total, count in zip(
+            top.tolist(), _dollars(totals[top]), counts[top].tolist()
+        )
+    ]
+
+
+class AnalyticsService:
+    """Loads transactions into columnar frames, cached per user"""
+
+    async def get_frame(self, user_id: str) -> TransactionFrame:
+        """Get a user's frame, loading it on a cache miss"""
+        frame = analytics_cache.get(user_id)
+        if frame is None:
+            cache_version = analytics_cache.version
+            frame = await asyncio.to_thread(self._load_frame, user_id)
+            analytics_cache.set(user_id, frame, version=cache_version)
+        return frame
+
+    def _load_frame(self, user_id: str) -> TransactionFrame:
+        """Read every transaction, selected columns only"""
+        amounts: List[Any] = []
+        dates: List[str] = []
+        categories: List[Optional[str]] = []
+        merchants: List[Optional[str]] = []
+        for row in sync_engine.iter_user_rows(
+            user_id, FRAME_COLUMNS, settings.transactions_read_page_size
+        ):
+            amounts.append(row["amount"])
+            dates.append(row["date"])
+            categories.append(row.get("category"))
+            merchants.append(row.get("merchant_name") or row.get("name"))
+
+        return TransactionFrame.from_columns(amounts, dates, categories, merchants)
+
+
+async def _evict_synced_user(item: PlaidItem, page: SyncPage):
+    """Drop cached frames everywhere once new transactions are stored"""
+    if page.added or page.modified or page.removed:
+        await invalidation_bus.publish_now(
+            InvalidationEvent.TRANSACTIONS_CHANGED, item.user_id
+        )
+
+
+# Singleton instance
+analytics_service = AnalyticsService()
+sync_engine.page_hooks.append(_evict_synced_user)
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 import logging
@@ -5,12 +6,24 @@ from app.core.database import supabase
 from app.core.security import security_utils
 from app.schemas.auth import UserCreate, Token
 from app.config import settings
+from app.core.jobs import enqueue_async
+from app.core.redis_client import redis_client
+from app.core.revocation import revocation_list
+from app.core.verification import VerificationCodeStore
+from app.services.profile import PROFILE_TABLE, profile_service
+from app.services.session import session_service
+from app.tasks.email import (
+    send_welcome_email,
+    send_password_reset_email,
+    send_verification_email,
+)
 from app.core.exceptions import (
     UserAlreadyExistsError,
     InvalidCredentialsError,
     UserNotFoundError,
     TokenExpiredError,
     InvalidTokenError,
+    VerificationResendThrottledError,
 )
 
 logger = logging.getLogger(__name__)
@@ -20,8 +33,14 @@ class AuthService:
     def __init__(self):
         self.supabase_client = supabase.client
         self.service_client = supabase.service_client
-
-    async def register(self, user_data: UserCreate) -> Token:
+        self.verification_codes = VerificationCodeStore(redis_client.client)
+
+    async def register(
+        self,
+        user_data: UserCreate,
+        device: Optional[str] = None,
+        ip_address: Optional[str] = None,
+    ) -> Token:
         """Register a new user"""
         try:
             # Check if user already exists
@@ -61,16 +80,21 @@ class AuthService:
                     profile_data
                 ).execute()
 
-                # Generate tokens
-                access_token = security_utils.create_access_token(
-                    data={"sub": auth_response.user.id, "email": user_data.email}
-                )
-                refresh_token = security_utils.create_refresh_token(
-                    data={"sub": auth_response.user.id}
+                # Start a session for this device
+                access_token, refresh_token = await session_service.create(
+                    auth_response.user.id, user_data.email, device, ip_address
                 )
 
-                # Store refresh token
-                await self._store_refresh_token(auth_response.user.id, refresh_token)
+                # Send welcome email in the background
+                await self._enqueue_email(
+                    send_welcome_email,
+                    user_data.email,
+                    user_data.first_name,
+                    dedup_key=f"welcome:{auth_response.user.id}",
+                )
+                await self._send_verification_code(
+                    user_data.email, auth_response.user.id
+                )
 
                 return Token(
                     access_token=access_token,
@@ -84,7 +108,13 @@ class AuthService:
             logger.error("Registration error: %s", str(e))
             raise
 
-    async def login(self, email: str, password: str) -> Token:
+    async def login(
+        self,
+        email: str,
+        password: str,
+        device: Optional[str] = None,
+        ip_address: Optional[str] = None,
+    ) -> Token:
         """Login user with email and password"""
         try:
             # Authenticate with Supabase
@@ -95,17 +125,11 @@ class AuthService:
             if not auth_response.user:
                 raise InvalidCredentialsError("Invalid email or password")
 
-            # Generate tokens
-            access_token = security_utils.create_access_token(
-                data={"sub": auth_response.user.id, "email": email}
-            )
-            refresh_token = security_utils.create_refresh_token(
-                data={"sub": auth_response.user.id}
+            # Start a session for this device
+            access_token, refresh_token = await session_service.create(
+                auth_response.user.id, email, device, ip_address
             )
 
-            # Store refresh token
-            await self._store_refresh_token(auth_response.user.id, refresh_token)
-
             return Token(
                 access_token=access_token,
                 refresh_token=refresh_token,
@@ -131,11 +155,6 @@ class AuthService:
             if not user_id:
                 raise InvalidTokenError("User ID not found in token")
 
-            # Verify refresh token is still valid in database
-            stored_token = await self._get_stored_refresh_token(user_id)
-            if not stored_token or stored_token != refresh_token:
-                raise InvalidTokenError("Refresh token not found or invalid")
-
             # Get user data
             user_response = self.service_client.auth.admin.get_user_by_id(user_id)
             if not user_response:
@@ -143,17 +162,11 @@ class AuthService:
 
             user = user_response.user
 
-            # Generate new tokens
-            access_token = security_utils.create_access_token(
-                data={"sub": user_id, "email": user.email}
-            )
-            new_refresh_token = security_utils.create_refresh_token(
-                data={"sub": user_id}
+            # Rotate the session's refresh token and issue new tokens
+            access_token, new_refresh_token = await session_service.rotate(
+                payload, user.email
             )
 
-            # Update stored refresh token
-            await self._store_refresh_token(user_id, new_refresh_token)
-
             return Token(
                 access_token=access_token,
                 refresh_token=new_refresh_token,
@@ -164,11 +177,19 @@ class AuthService:
             logger.error("Token refresh error %s", str(e))
             raise
 
-    async def logout(self, user_id: str):
-        """Logout user by invalidating refresh token"""
+    async def logout(self, user_id: str, access_token: Optional[str] = None):
+        """Logout user by ending the current session and its access token"""
         try:
-            await self._delete_refresh_token(user_id)
-            # Optionally, add the access token to a blacklist in Redis
+            payload = security_utils.decode_token(access_token) if access_token else None
+            if not payload:
+                return
+
+            if payload.get("sid"):
+                await session_service.revoke(user_id, payload["sid"])
+
+            # Revoke the access token for the rest of its lifetime
+            if payload.get("jti") and payload.get("exp"):
+                await revocation_list.revoke(payload["jti"], int(payload["exp"]))
         except Exception as e:
             logger.error("Logout error: %s", str(e))
             raise
@@ -190,8 +211,8 @@ class AuthService:
             # Store reset token with expiration (1 hour)
             await self._store_password_reset_token(user[0].id, reset_token)
 
-            # TODO: Send email with reset link
-            # await send_password_reset_email(email, reset_token)
+            # Send email with reset link
+            await self._enqueue_email(send_password_reset_email, email, reset_token)
 
             return "If an account exists with this email, you will receive a password reset link."
 
@@ -207,23 +228,28 @@ class AuthService:
             if not user_id:
                 raise InvalidTokenError("Invalid or expired reset token")
 
-            # Update password
+            # Update password and clear the reset token in one write
             self.service_client.auth.admin.update_user_by_id(
-                user_id, {"password": new_password}
+                user_id,
+                {
+                    "password": new_password,
+                    "user_metadata": {"reset_token": None, "reset_token_expiry": None},
+                },
             )
 
-            # Delete reset token
-            await self._delete_password_reset_token(user_id)
-
-            # Invalidate all refresh tokens for security
-            await self._delete_refresh_token(user_id)
+            # Sign out every device for security
+            await session_service.revoke_all(user_id)
 
         except Exception as e:
             logger.error("Password reset error: %s", str(e))
             raise
 
     async def change_password(
-        self, user_id: str, current_password: str, new_password: str
+        self,
+        user_id: str,
+        current_password: str,
+        new_password: str,
+        current_session_id: Optional[str] = None,
     ):
         """Change user password"""
         try:
@@ -250,55 +276,84 @@ class AuthService:
                 user_id, {"password": new_password}
             )
 
+            # Sign out every other device
+            await session_service.revoke_all(
+                user_id, except_session_id=current_session_id
+            )
+
         except Exception as e:
             logger.error("Password change error: %s", str(e))
             raise
 
+    async def resend_verification_code(self, email: str) -> str:
+        """Issue a fresh verification code to an unverified account"""
+        message = "If this email needs verifying, a new code is on its way."
+        # Throttled per address whether or not the account exists, so the
+        # response doesn't reveal which emails are registered
+        if not await self.verification_codes.reserve_resend(email):
+            raise VerificationResendThrottledError(
+                "A code was sent recently. Please wait before requesting another."
+            )
+
+        try:
+            user_id = await asyncio.to_thread(self._unverified_user_id, email)
+            if user_id:
+                await self._send_verification_code(email, user_id)
+            return message
+        except Exception as e:
+            logger.error("Verification resend error: %s", str(e))
+            raise
+
+    def _unverified_user_id(self, email: str) -> Optional[str]:
+        """ID of the account with this email, if it still needs verifying"""
+        response = (
+            self.service_client.table(PROFILE_TABLE)
+            .select("id")
+            .eq("email", email)
+            .limit(1)
+            .execute()
+        )
+        if not response.data:
+            return None
+        user_id = response.data[0]["id"]
+        user = self.service_client.auth.admin.get_user_by_id(user_id).user
+        return None if user.email_confirmed_at else user_id
+
     async def verify_email(self, email: str, code: str) -> bool:
         """Verify user email with code"""
-        # This would typically be handled by Supabase's built-in email verification
-        # but here's a custom implementation if needed
         try:
-            stored_code = await self._get_verification_code(email)
-            if stored_code and stored_code == code:
-                # Mark user as verified
-                response = self.service_client.auth.admin.list_users()
-                user = [user for user in response if user.email == email]
-                if user and len(user) > 0:
-                    self.service_client.auth.admin.update_user_by_id(
-                        user[0].id,
-                        {"email_confirm": True},
-                    )
-                    await self._delete_verification_code(email)
-                    return True
-            return False
+            # Atomically counts the attempt and consumes a matching code
+            user_id = await self.verification_codes.consume(email, code)
+            if not user_id:
+                return False
+
+            # Mark user as verified
+            self.service_client.auth.admin.update_user_by_id(
+                user_id, {"email_confirm": True}
+            )
+            profile_service.invalidate(user_id)
+            return True
         except Exception as e:
             logger.error("Email verification error: %s", str(e))
             raise
 
-    # Helper methods for token storage (using Supabase tables or Redis)
-    async def _store_refresh_token(self, user_id: str, token: str):
-        """Store refresh token in database"""
-        # You could create a separate table for this or use Redis
-        # For now, storing in user metadata
-        self.service_client.auth.admin.update_user_by_id(
-            user_id, {"user_metadata": {"refresh_token": token}}
-        )
-
-    async def _get_stored_refresh_token(self, user_id: str) -> Optional[str]:
-        """Get stored refresh token"""
-        user_response = self.service_client.auth.admin.get_user_by_id(user_id)
-        user = user_response.user if user_response else None
-        if user and user.user_metadata:
-            return user.user_metadata.get("refresh_token")
-        return None
+    async def _enqueue_email(self, task, *args, **kwargs):
+        """Queue an email job; a broker outage must not fail the request"""
+        try:
+            await enqueue_async(task, *args, **kwargs)
+        except Exception as e:
+            logger.error("Failed to enqueue %s: %s", task.name, str(e))
 
-    async def _delete_refresh_token(self, user_id: str):
-        """Delete stored refresh token"""
-        self.service_client.auth.admin.update_user_by_id(
-            user_id, {"user_metadata": {"refresh_token": None}}
-        )
+    async def _send_verification_code(self, email: str, user_id: str):
+        """Issue a verification code and queue the email carrying it"""
+        try:
+            code = await self.verification_codes.issue(email, user_id)
+        except Exception as e:
+            logger.error("Failed to issue verification code: %s", str(e))
+            return
+        await self._enqueue_email(send_verification_email, email, code)
 
+    # Helper methods for token storage (using Supabase tables or Redis)
     async def _store_password_reset_token(self, user_id: str, token: str):
         """Store password reset token with expiration"""
         # In production, use Redis or a dedicated table
@@ -324,31 +379,3 @@ class AuthService:
                 if expiry and datetime.fromisoformat(expiry) > datetime.utcnow():
                     return user.id
         return None
-
-    async def _delete_password_reset_token(self, user_id: str):
-        """Delete password reset token"""
-        self.service_client.auth.admin.update_user_by_id(
-            user_id,
-            {"user_metadata": {"reset_token": None, "reset_token_expiry": None}},
-        )
-
-    async def _get_verification_code(self, email: str) -> Optional[str]:
-        """Get verification code for email"""
-        # This is a placeholder implementation - in production, use Redis or a dedicated table
-        users = self.service_client.auth.admin.list_users()
-        for user in users:
-            if user.email == email:
-                metadata = user.user_metadata or {}
-                return metadata.get("verification_code")
-        return None
-
-    async def _delete_verification_code(self, email: str):
-        """Delete verification code for email"""
-        users = self.service_client.auth.admin.list_users()
-        for user in users:
-            if user.email == email:
-                self.service_client.auth.admin.update_user_by_id(
-                    user.id,
-                    {"user_metadata": {"verification_code": None}},
-                )
-                break
@@ -0,0 +1,296 @@
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+from app.core.redis_client import redis_client
+from app.models.plaid_item import PlaidItem
+from app.models.transaction import Transaction
+from app.services.analytics import UNCATEGORIZED
+from app.services.plaid_sync import SyncPage, sync_engine
+
+logger = logging.getLogger(__name__)
+
+# Money moving between the user's own accounts or coming in is reported
+# per category but not counted as spending
+NON_SPENDING_CATEGORIES = {"INCOME", "TRANSFER_IN", "TRANSFER_OUT"}
+
+LEDGER_COLUMNS = "id,amount,date,category"
+
+# (period, category, cents) change to one totals cell
+CellDelta = Tuple[str, str, int]
+ChangeHook = Callable[[str, List[CellDelta]], Awaitable[None]]
+
+# Applies upserts and removals for one user atomically. The ledger maps a
+# transaction ID to the "period|category|cents" it contributed, so a
+# modification moves exactly its old contribution to its new cell and
+# replaying a page is a no-op. Returns the net change per cell as flat
+# (period, category, cents) triples.
+#
+# KEYS: ledger hash, periods set
+# ARGV: totals key prefix, upsert count, (id, entry) pairs..., removed IDs...
+_APPLY_SCRIPT = """
+local ledger, periods, prefix = KEYS[1], KEYS[2], ARGV[1]
+local deltas, cells = {}, {}
+
+local function add(entry, sign)
+    local period, category, cents = string.match(entry, '^([^|]*)|(.*)|(-?%d+)$')
+    local key = prefix .. period
+    local delta = sign * tonumber(cents)
+    if redis.call('HINCRBY', key, category, delta) == 0 then
+        redis.call('HDEL', key, category)
+    end
+    local cell = period .. '|' .. category
+    if not deltas[cell] then
+        cells[#cells + 1] = {period, category}
+        deltas[cell] = 0
+    end
+    deltas[cell] = deltas[cell] + delta
+    return period
+end
+
+local upserts = tonumber(ARGV[2])
+for i = 3, 2 + 2 * upserts, 2 do
+    local old = redis.call('HGET', ledger, ARGV[i])
+    if old ~= ARGV[i + 1] then
+        if old then
+            add(old, -1)
+        end
+        redis.call('SADD', periods, add(ARGV[i + 1], 1))
+        redis.call('HSET', ledger, ARGV[i], ARGV[i + 1])
+    end
+end
+for i = 3 + 2 * upserts, #ARGV do
+    local old = redis.call('HGET', ledger, ARGV[i])
+    if old then
+        add(old, -1)
+        redis.call('HDEL', ledger, ARGV[i])
+    end
+end
+
+local changes = {}
+for _, cell in ipairs(cells) do
+    local delta = deltas[cell[1] .. '|' .. cell[2]]
+    if delta ~= 0 then
+        changes[#changes + 1] = cell[1]
+        changes[#changes + 1] = cell[2]
+        changes[#changes + 1] = delta
+    end
+end
+return changes
+"""
+
+
+def period_of(day: date) -> str:
+    """Budget period (calendar month) containing a date"""
+    return day.strftime("%Y-%m")
+
+
+def ledger_entry(period: str, category: Optional[str], cents: int) -> str:
+    return f"{period}|{category or UNCATEGORIZED}|{cents}"
+
+
+def _parse_entry(entry: str) -> Tuple[str, str, int]:
+    period, rest = entry.split("|", 1)
+    category, cents = rest.rsplit("|", 1)
+    return period, category, int(cents)
+
+
+@dataclass
+class BudgetTotals:
+    """A user's spending per category for one period, in cents"""
+
+    period: str
+    categories: Dict[str, int]
+
+    @property
+    def total(self) -> int:
+        return sum(
+            cents
+            for category, cents in self.categories.items()
+            if category not in NON_SPENDING_CATEGORIES
+        )
+
+
+@dataclass
+class DriftReport:
+    """Differences between stored totals and a from-scratch recomputation"""
+
+    user_id: str
+    transactions: int = 0
+    periods: int = 0
+    # (period, category, expected cents, stored cents)
+    cells: List[Tuple[str, str, int, int]] = field(default_factory=list)
+    ledger_mismatches: int = 0
+    repaired: bool = False
+
+    @property
+    def has_drift(self) -> bool:
+        return bool(self.cells or self.ledger_mismatches)
+
+
+class BudgetService:
+    """
+    Running per-user, per-category, per-month totals in Redis.
+
+    Ingest applies each sync page incrementally (inserts, Plaid
+    modifications and removals), so reads are a single hash lookup and
+    never re-aggregate transactions. reconcile() recomputes from the
+    database to detect and repair drift.
+
+    `change_hooks` receive each apply's net per-cell changes, so derived
+    state (e.g. leaderboards) can follow the totals incrementally. Hooks
+    run after the totals are committed and a retried page reports no
+    changes, so a hook that fails must recover on its own.
+    """
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self._apply = self.redis.register_script(_APPLY_SCRIPT)
+        self.change_hooks: List[ChangeHook] = []
+
+    # User ID as a hash tag keeps a user's keys in one cluster slot
+    @staticmethod
+    def _ledger_key(user_id: str) -> str:
+        return f"budget_ledger:{{{user_id}}}"
+
+    @staticmethod
+    def _periods_key(user_id: str) -> str:
+        return f"budget_periods:{{{user_id}}}"
+
+    @staticmethod
+    def _totals_prefix(user_id: str) -> str:
+        return f"budget_totals:{{{user_id}}}:"
+
+    async def apply(
+        self,
+        user_id: str,
+        upserts: Iterable[Transaction] = (),
+        removed: Iterable[str] = (),
+    ) -> List[CellDelta]:
+        """Fold changed and removed transactions into the totals"""
+        pairs: List[str] = []
+        for txn in upserts:
+            cents = round(txn.amount * 100)
+            pairs += [txn.id, ledger_entry(period_of(txn.date), txn.category, cents)]
+        removed = list(removed)
+        if not pairs and not removed:
+            return []
+
+        flat = await self._apply(
+            keys=[self._ledger_key(user_id), self._periods_key(user_id)],
+            args=[self._totals_prefix(user_id), len(pairs) // 2, *pairs, *removed],
+        )
+        changes = [
+            (flat[i], flat[i + 1], int(flat[i + 2])) for i in range(0, len(flat), 3)
+        ]
+        for hook in self.change_hooks if changes else ():
+            try:
+                await hook(user_id, changes)
+            except Exception:
+                # Failing the page would not rerun the hook
+                logger.exception("Budget change hook failed for user %s", user_id)
+        return changes
+
+    async def get_totals(self, user_id: str, period: str) -> BudgetTotals:
+        """Totals for one period"""
+        raw = await self.redis.hgetall(self._totals_prefix(user_id) + period)
+        return BudgetTotals(period, {k: int(v) for k, v in raw.items()})
+
+    async def reconcile(self, user_id: str, repair: bool = True) -> DriftReport:
+        """
+        Recompute a user's totals from stored transactions and compare.
+
+        With `repair`, drifted state is replaced by the recomputation in
+        one transaction. A sync landing mid-run can show up as drift; the
+        database already has it, so the next run converges.
+        """
+        ledger = await asyncio.to_thread(self._load_ledger, user_id)
+        expected: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for entry in ledger.values():
+            period, category, cents = _parse_entry(entry)
+            expected[period][category] += cents
+
+        stored_periods = await self.redis.smembers(self._periods_key(user_id))
+        periods = sorted(set(stored_periods) | set(expected))
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for period in periods:
+                pipe.hgetall(self._totals_prefix(user_id) + period)
+            pipe.hgetall(self._ledger_key(user_id))
+            *stored_totals, stored_ledger = await pipe.execute()
+
+        report = DriftReport(user_id, transactions=len(ledger), periods=len(periods))
+        for period, stored in zip(periods, stored_totals):
+            wanted = {k: v for k, v in expected.get(period, {}).items() if v}
+            for category in sorted(set(wanted) | set(stored)):
+                actual = int(stored.get(category, 0))
+                if actual != wanted.get(category, 0):
+                    report.cells.append(
+                        (period, category, wanted.get(category, 0), actual)
+                    )
+        report.ledger_mismatches = sum(
+            1 for txn_id in set(ledger) | set(stored_ledger)
+            if ledger.get(txn_id) != stored_ledger.get(txn_id)
+        )
+
+        if report.has_drift:
+            logger.warning(
+                "Budget drift for user %s: %d cells, %d ledger entries",
+                user_id,
+                len(report.cells),
+                report.ledger_mismatches,
+            )
+            if repair:
+                await self._replace(user_id, periods, ledger, expected)
+                report.repaired = True
+        return report
+
+    async def _replace(
+        self,
+        user_id: str,
+        old_periods: List[str],
+        ledger: Dict[str, str],
+        totals: Dict[str, Dict[str, int]],
+    ):
+        prefix = self._totals_prefix(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(
+                self._ledger_key(user_id),
+                self._periods_key(user_id),
+                *[prefix + period for period in old_periods],
+            )
+            if ledger:
+                pipe.hset(self._ledger_key(user_id), mapping=ledger)
+            for period, categories in totals.items():
+                nonzero = {k: v for k, v in categories.items() if v}
+                if nonzero:
+                    pipe.hset(prefix + period, mapping=nonzero)
+                pipe.sadd(self._periods_key(user_id), period)
+            await pipe.execute()
+
+    @staticmethod
+    def _load_ledger(user_id: str) -> Dict[str, str]:
+        return {
+            row["id"]: ledger_entry(
+                period_of(date.fromisoformat(row["date"])),
+                row.get("category"),
+                round(float(row["amount"]) * 100),
+            )
+            for row in sync_engine.iter_user_rows(
+                user_id, LEDGER_COLUMNS, settings.transactions_read_page_size
+            )
+        }
+
+
+async def _apply_sync_page(item: PlaidItem, page: SyncPage):
+    """Keep budget totals current as sync pages are stored"""
+    await budget_service.apply(
+        item.user_id, [*page.added, *page.modified], page.removed
+    )
+
+
+# Singleton instance
+budget_service = BudgetService(redis_client.client)
+sync_engine.page_hooks.append(_apply_sync_page)
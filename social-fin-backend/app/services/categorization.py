@@ -0,0 +1,305 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from app.config import settings
+from app.models.plaid_item import PlaidItem
+from app.models.transaction import Transaction
+from app.services.plaid_sync import SyncPage, sync_engine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Maps a merchant keyword to a category and a canonical merchant name"""
+
+    pattern: str
+    category: str
+    merchant: Optional[str] = None
+    category_detailed: Optional[str] = None
+    # Among overlapping matches the highest priority wins, then the longest
+    priority: int = 0
+
+
+DEFAULT_RULES: List[Rule] = [
+    Rule("STARBUCKS", "FOOD_AND_DRINK", "Starbucks", "FOOD_AND_DRINK_COFFEE"),
+    Rule("DUNKIN", "FOOD_AND_DRINK", "Dunkin'", "FOOD_AND_DRINK_COFFEE"),
+    Rule("MCDONALD S", "FOOD_AND_DRINK", "McDonald's", "FOOD_AND_DRINK_FAST_FOOD"),
+    Rule("CHIPOTLE", "FOOD_AND_DRINK", "Chipotle", "FOOD_AND_DRINK_FAST_FOOD"),
+    Rule("DOORDASH", "FOOD_AND_DRINK", "DoorDash", "FOOD_AND_DRINK_RESTAURANT"),
+    Rule("GRUBHUB", "FOOD_AND_DRINK", "Grubhub", "FOOD_AND_DRINK_RESTAURANT"),
+    Rule("UBER EATS", "FOOD_AND_DRINK", "Uber Eats", "FOOD_AND_DRINK_RESTAURANT"),
+    Rule("WHOLE FOODS", "FOOD_AND_DRINK", "Whole Foods", "FOOD_AND_DRINK_GROCERIES"),
+    Rule("WHOLEFDS", "FOOD_AND_DRINK", "Whole Foods", "FOOD_AND_DRINK_GROCERIES"),
+    Rule("TRADER JOE S", "FOOD_AND_DRINK", "Trader Joe's", "FOOD_AND_DRINK_GROCERIES"),
+    Rule("SAFEWAY", "FOOD_AND_DRINK", "Safeway", "FOOD_AND_DRINK_GROCERIES"),
+    Rule("KROGER", "FOOD_AND_DRINK", "Kroger", "FOOD_AND_DRINK_GROCERIES"),
+    Rule("INSTACART", "FOOD_AND_DRINK", "Instacart", "FOOD_AND_DRINK_GROCERIES"),
+    Rule(
+        "AMAZON",
+        "GENERAL_MERCHANDISE",
+        "Amazon",
+        "GENERAL_MERCHANDISE_ONLINE_MARKETPLACES",
+    ),
+    Rule(
+        "AMZN",
+        "GENERAL_MERCHANDISE",
+        "Amazon",
+        "GENERAL_MERCHANDISE_ONLINE_MARKETPLACES",
+    ),
+    Rule(
+        "AMAZON PRIME",
+        "ENTERTAINMENT",
+        "Amazon Prime",
+        "ENTERTAINMENT_TV_AND_MOVIES",
+    ),
+    Rule("TARGET", "GENERAL_MERCHANDISE", "Target", "GENERAL_MERCHANDISE_SUPERSTORES"),
+    Rule(
+        "WALMART",
+        "GENERAL_MERCHANDISE",
+        "Walmart",
+        "GENERAL_MERCHANDISE_SUPERSTORES",
+    ),
+    Rule(
+        "WM SUPERCENTER",
+        "GENERAL_MERCHANDISE",
+        "Walmart",
+        "GENERAL_MERCHANDISE_SUPERSTORES",
+    ),
+    Rule("COSTCO", "GENERAL_MERCHANDISE", "Costco", "GENERAL_MERCHANDISE_SUPERSTORES"),
+    Rule(
+        "APPLE COM BILL",
+        "ENTERTAINMENT",
+        "Apple",
+        "ENTERTAINMENT_OTHER_ENTERTAINMENT",
+    ),
+    Rule("NETFLIX", "ENTERTAINMENT", "Netflix", "ENTERTAINMENT_TV_AND_MOVIES"),
+    Rule("HULU", "ENTERTAINMENT", "Hulu", "ENTERTAINMENT_TV_AND_MOVIES"),
+    Rule("SPOTIFY", "ENTERTAINMENT", "Spotify", "ENTERTAINMENT_MUSIC_AND_AUDIO"),
+    Rule("UBER", "TRANSPORTATION", "Uber", "TRANSPORTATION_TAXIS_AND_RIDE_SHARES"),
+    Rule("LYFT", "TRANSPORTATION", "Lyft", "TRANSPORTATION_TAXIS_AND_RIDE_SHARES"),
+    Rule("SHELL", "TRANSPORTATION", "Shell", "TRANSPORTATION_GAS"),
+    Rule("CHEVRON", "TRANSPORTATION", "Chevron", "TRANSPORTATION_GAS"),
+    Rule("EXXONMOBIL", "TRANSPORTATION", "ExxonMobil", "TRANSPORTATION_GAS"),
+    Rule("DELTA AIR", "TRAVEL", "Delta", "TRAVEL_FLIGHTS"),
+    Rule("UNITED AIRLINES", "TRAVEL", "United Airlines", "TRAVEL_FLIGHTS"),
+    Rule("SOUTHWEST", "TRAVEL", "Southwest", "TRAVEL_FLIGHTS"),
+    Rule("AIRBNB", "TRAVEL", "Airbnb", "TRAVEL_LODGING"),
+    Rule("MARRIOTT", "TRAVEL", "Marriott", "TRAVEL_LODGING"),
+    Rule(
+        "COMCAST",
+        "RENT_AND_UTILITIES",
+        "Comcast",
+        "RENT_AND_UTILITIES_INTERNET_AND_CABLE",
+    ),
+    Rule("VERIZON", "RENT_AND_UTILITIES", "Verizon", "RENT_AND_UTILITIES_TELEPHONE"),
+    Rule("AT T", "RENT_AND_UTILITIES", "AT&T", "RENT_AND_UTILITIES_TELEPHONE"),
+    Rule("T MOBILE", "RENT_AND_UTILITIES", "T-Mobile", "RENT_AND_UTILITIES_TELEPHONE"),
+    Rule("CVS", "MEDICAL", "CVS", "MEDICAL_PHARMACIES_AND_SUPPLEMENTS"),
+    Rule("WALGREENS", "MEDICAL", "Walgreens", "MEDICAL_PHARMACIES_AND_SUPPLEMENTS"),
+    Rule(
+        "PLANET FITNESS",
+        "PERSONAL_CARE",
+        "Planet Fitness",
+        "PERSONAL_CARE_GYMS_AND_FITNESS_CENTERS",
+    ),
+    Rule("VENMO", "TRANSFER_OUT", "Venmo", "TRANSFER_OUT_ACCOUNT_TRANSFER"),
+    Rule("ZELLE", "TRANSFER_OUT", "Zelle", "TRANSFER_OUT_ACCOUNT_TRANSFER"),
+    Rule("PAYROLL", "INCOME", None, "INCOME_WAGES", priority=10),
+    Rule("DIRECT DEP", "INCOME", None, "INCOME_WAGES", priority=10),
+]
+
+# Processor tags, card-network noise and similar tokens that precede the
+# merchant in raw descriptors ("SQ *BLUE BOTTLE", "POS DEBIT TARGET")
+_NOISE_PREFIXES = frozenset(
+    "SQ TST SP PY PP POS DEBIT PURCHASE CHECKCARD RECURRING ACH PAYPAL CARD "
+    "VISA".split()
+)
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+_STORE_NUMBER = re.compile(r"^[A-Z]*\d{3,}[A-Z]*$")
+
+
+def normalize_merchant(raw: str) -> str:
+    """
+    Canonical form of a merchant descriptor: upper case, punctuation to
+    single spaces, leading processor tags and store/reference numbers
+    dropped. "SQ *STARBUCKS #1234 SEATTLE" becomes "STARBUCKS SEATTLE".
+    """
+    tokens = _NON_ALNUM.sub(" ", raw.upper()).split()
+    start = 0
+    while start < len(tokens) - 1 and tokens[start] in _NOISE_PREFIXES:
+        start += 1
+    return " ".join(
+        token for token in tokens[start:] if not _STORE_NUMBER.match(token)
+    )
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over strings: one pass over the text finds
+    every occurrence of every pattern, however many patterns there are.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[int, ...]] = [()]
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                following = goto[state].get(char)
+                if following is None:
+                    following = len(goto)
+                    goto[state][char] = following
+                    goto.append({})
+                    outputs.append(())
+                state = following
+            outputs[state] += (index,)
+
+        # Breadth-first, so a state's failure target (always shallower) is
+        # complete, outputs included, before the state itself is linked
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in goto[state].items():
+                target = fail[state]
+                while target and char not in goto[target]:
+                    target = fail[target]
+                fail[following] = goto[target].get(char, 0)
+                outputs[following] += outputs[fail[following]]
+                queue.append(following)
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        self.lengths = [len(pattern) for pattern in patterns]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end index, pattern index) for every occurrence"""
+        goto, fail, outputs, state = self._goto, self._fail, self._outputs, 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in outputs[state]:
+                yield end, index
+
+
+class RuleSet:
+    """
+    Rules compiled into one automaton. Keywords only match whole words of
+    the normalized descriptor. Lookups are cached per normalized string,
+    which repeat heavily across a backfill; a new rule set starts with a
+    fresh cache.
+    """
+
+    def __init__(self, rules: Sequence[Rule], cache_size: int = 65536):
+        self.rules = list(rules)
+        self._automaton = AhoCorasick([normalize_merchant(r.pattern) for r in rules])
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def match(self, raw: str) -> Optional[Rule]:
+        """Best rule for a raw merchant descriptor"""
+        return self.lookup(normalize_merchant(raw))
+
+    def _lookup(self, text: str) -> Optional[Rule]:
+        best: Optional[Rule] = None
+        best_rank = (0, 0)
+        lengths = self._automaton.lengths
+        for end, index in self._automaton.iter_matches(text):
+            start = end - lengths[index] + 1
+            if start > 0 and text[start - 1] != " ":
+                continue
+            if end + 1 < len(text) and text[end + 1] != " ":
+                continue
+            rule = self.rules[index]
+            rank = (rule.priority, lengths[index])
+            if best is None or rank > best_rank:
+                best, best_rank = rule, rank
+        return best
+
+
+def load_rules(path: str) -> List[Rule]:
+    """Read rules from a JSON list of Rule fields"""
+    with open(path, encoding="utf-8") as f:
+        return [Rule(**entry) for entry in json.load(f)]
+
+
+class CategorizationEngine:
+    """
+    Categorizes transactions and normalizes merchant names.
+
+    Rules come from `rules_path` (JSON) or the built-ins. Reloading
+    compiles a new rule set on the side and swaps it in with a single
+    assignment; batches already running keep the rule set they started
+    with.
+    """
+
+    def __init__(self, rules_path: Optional[str] = None):
+        self.rules_path = rules_path
+        self.ruleset = RuleSet(DEFAULT_RULES, settings.categorization_cache_size)
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        if rules_path:
+            self.reload_if_changed(force=True)
+
+    def load(self, rules: Sequence[Rule]):
+        """Compile and swap in a new rule set"""
+        self.ruleset = RuleSet(rules, settings.categorization_cache_size)
+        logger.info("Loaded %d categorization rules", len(rules))
+
+    def reload_if_changed(self, force: bool = False) -> bool:
+        """Reload the rules file if it changed; a bad file keeps the old rules"""
+        self._checked_at = time.monotonic()
+        if not self.rules_path:
+            return False
+        try:
+            mtime = os.stat(self.rules_path).st_mtime
+            if not force and mtime == self._mtime:
+                return False
+            self.load(load_rules(self.rules_path))
+        except (OSError, ValueError, TypeError) as e:
+            logger.error("Failed to load categorization rules: %s", str(e))
+            return False
+        self._mtime = mtime
+        return True
+
+    async def refresh(self):
+        """Check the rules file at most every reload interval, off the loop"""
+        due = self._checked_at + settings.categorization_reload_seconds
+        if self.rules_path and time.monotonic() >= due:
+            await asyncio.to_thread(self.reload_if_changed)
+
+    def categorize(self, transactions: Iterable[Transaction]) -> int:
+        """Apply the rules to a batch in place; returns how many matched"""
+        ruleset = self.ruleset
+        matched = 0
+        for txn in transactions:
+            rule = ruleset.match(txn.merchant_name or txn.name)
+            if rule is None:
+                continue
+            if rule.category != txn.category:
+                txn.category = rule.category
+                txn.category_detailed = rule.category_detailed
+            if rule.merchant:
+                txn.merchant_name = rule.merchant
+            matched += 1
+        return matched
+
+
+async def _categorize_page(item: PlaidItem, page: SyncPage):
+    """Categorize a sync page before it is stored"""
+    await categorization_engine.refresh()
+    categorization_engine.categorize([*page.added, *page.modified])
+
+
+# Singleton instance
+categorization_engine = CategorizationEngine(settings.categorization_rules_path)
+sync_engine.page_processors.append(_categorize_page)
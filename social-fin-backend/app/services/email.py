@@ -0,0 +1,342 @@
+import logging
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from string import Template
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES: Dict[str, Dict[str, str]] = {
+    "welcome": {
+        "subject": "Welcome to SocialFin, $first_name!",
+        "body": (
+            "Hi $first_name,\n\n"
+            "Thanks for joining SocialFin. Your account is ready to go.\n\n"
+            "The SocialFin Team"
+        ),
+    },
+    "password_reset": {
+        "subject": "Reset your SocialFin password",
+        "body": (
+            "We received a request to reset your password.\n\n"
+            "Use this link within the next hour:\n$reset_url\n\n"
+            "If you didn't ask for this, you can ignore this email."
+        ),
+    },
+    "email_verification": {
+        "subject": "Your SocialFin verification code",
+        "body": (
+            "Your verification code is $code\n\n"
+            "It expires in $expires_minutes minutes."
+        ),
+    },
+}
+
+# (template, recipient, context)
+OutgoingEmail = Tuple[str, str, Dict[str, str]]
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template parsed once and rendered many times"""
+
+    subject: Template
+    body: Template
+
+    def render(self, context: Dict[str, str]) -> Tuple[str, str]:
+        return self.subject.substitute(context), self.body.substitute(context)
+
+
+def compile_templates(templates: Dict[str, Dict[str, str]]) -> Dict[str, CompiledTemplate]:
+    """Compile every template, failing fast on malformed placeholders"""
+    compiled = {}
+    for name, spec in templates.items():
+        template = CompiledTemplate(Template(spec["subject"]), Template(spec["body"]))
+        for part in (template.subject, template.body):
+            if not part.is_valid():
+                raise ValueError(f"Invalid placeholder in email template {name!r}")
+        compiled[name] = template
+    return compiled
+
+
+@dataclass
+class DispatchStats:
+    """Counters for a dispatcher or a single batch"""
+
+    sent: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    # Positions in the batch not sent because of a transient error
+    unsent: List[int] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, ok: bool):
+        with self._lock:
+            if ok:
+                self.sent += 1
+            else:
+                self.failed += 1
+
+    def record_unsent(self, positions: Iterable[int]):
+        with self._lock:
+            self.unsent.extend(positions)
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+
+class DomainRateLimiter:
+    """Token bucket per recipient domain, shared by all sending threads"""
+
+    def __init__(self, default_rate: float, overrides: Optional[Dict[str, float]] = None):
+        self.default_rate = default_rate
+        self.overrides = overrides or {}
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, domain: str):
+        """Block until the domain has capacity for one more message"""
+        rate = self.overrides.get(domain, self.default_rate)
+        if rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                # Room for at least one message, or rates below 1/s never send
+                capacity = max(1.0, rate)
+                tokens, updated = self._buckets.get(domain, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated) * rate)
+                if tokens >= 1:
+                    self._buckets[domain] = (tokens - 1, now)
+                    return
+                self._buckets[domain] = (tokens, now)
+                wait = (1 - tokens) / rate
+            time.sleep(wait)
+
+
+class SMTPConnectionPool:
+    """Pool of persistent, authenticated SMTP connections"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        size: int = 4,
+        max_messages_per_connection: int = 100,
+        timeout: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[Tuple[smtplib.SMTP, int]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        smtp.ehlo()
+        if self.use_tls:
+            smtp.starttls()
+            smtp.ehlo()
+        if self.user and self.password:
+            smtp.login(self.user, self.password)
+        return smtp
+
+    @staticmethod
+    def _close(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except smtplib.SMTPException:
+            smtp.close()
+        except OSError:
+            pass
+
+    @contextmanager
+    def connection(self) -> Iterator["PooledConnection"]:
+        """Borrow a connection, opening one if the pool has spare capacity"""
+        self._slots.acquire()
+        try:
+            try:
+                smtp, sent = self._idle.get_nowait()
+            except queue.Empty:
+                smtp, sent = self._connect(), 0
+
+            pooled = PooledConnection(self, smtp, sent)
+            try:
+                yield pooled
+            except Exception:
+                pooled.broken = True
+                raise
+            finally:
+                if pooled.broken or pooled.sent >= self.max_messages_per_connection:
+                    self._close(pooled.smtp)
+                else:
+                    self._idle.put((pooled.smtp, pooled.sent))
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Close all idle connections"""
+        while True:
+            try:
+                smtp, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(smtp)
+
+
+class PooledConnection:
+    """A borrowed connection that reconnects once if the server hung up"""
+
+    def __init__(self, pool: SMTPConnectionPool, smtp: smtplib.SMTP, sent: int):
+        self.pool = pool
+        self.smtp = smtp
+        self.sent = sent
+        self.broken = False
+
+    def send(self, message: EmailMessage):
+        try:
+            self.smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            self.smtp = self.pool._connect()
+            self.sent = 0
+            self.smtp.send_message(message)
+        self.sent += 1
+
+
+class EmailDispatcher:
+    """
+    Render and send transactional emails over pooled SMTP connections.
+
+    Batches are split across the pool; each thread keeps one connection
+    open and sends its share back to back, shaped per recipient domain.
+    """
+
+    def __init__(
+        self,
+        pool: Optional[SMTPConnectionPool] = None,
+        rate_limiter: Optional[DomainRateLimiter] = None,
+        templates: Optional[Dict[str, Dict[str, str]]] = None,
+    ):
+        self.templates = compile_templates(templates or TEMPLATES)
+        self.pool = pool or (
+            SMTPConnectionPool(
+                settings.smtp_host,
+                settings.smtp_port,
+                settings.smtp_user,
+                settings.smtp_password,
+                use_tls=settings.smtp_use_tls,
+                size=settings.smtp_pool_size,
+                max_messages_per_connection=settings.smtp_max_messages_per_connection,
+            )
+            if settings.smtp_host
+            else None
+        )
+        self.rate_limiter = rate_limiter or DomainRateLimiter(
+            settings.smtp_domain_rate_per_second, settings.smtp_domain_rates
+        )
+        self.stats = DispatchStats()
+
+    def render(self, template: str, to: str, context: Dict[str, str]) -> EmailMessage:
+        """Build a message from a named template"""
+        subject, body = self.templates[template].render(context)
+        message = EmailMessage()
+        message["From"] = settings.email_from
+        message["To"] = to
+        message["Subject"] = subject
+        message.set_content(body)
+        return message
+
+    def send(self, template: str, to: str, context: Dict[str, str]):
+        """Send a single templated email"""
+        if self.pool is None:
+            logger.warning("SMTP not configured; dropping %s email", template)
+            return
+
+        message = self.render(template, to, context)
+        self.rate_limiter.acquire(_domain(to))
+        with self.pool.connection() as connection:
+            connection.send(message)
+        self.stats.record(True)
+
+    def send_batch(self, emails: Iterable[OutgoingEmail]) -> DispatchStats:
+        """Send many emails over the pool and report throughput"""
+        batch = DispatchStats()
+        if self.pool is None:
+            logger.warning("SMTP not configured; dropping email batch")
+            return batch
+
+        messages = [
+            (position, _domain(to), self.render(template, to, context))
+            for position, (template, to, context) in enumerate(emails)
+        ]
+        if not messages:
+            return batch
+
+        workers = min(self.pool.size, len(messages))
+        shares: List[List[Tuple[int, str, EmailMessage]]] = [
+            messages[i::workers] for i in range(workers)
+        ]
+
+        def run(share: List[Tuple[int, str, EmailMessage]]):
+            # A transient failure stops this share; what is left is reported
+            # as unsent so a retry doesn't repeat delivered mail
+            done = 0
+            try:
+                with self.pool.connection() as connection:
+                    for _, domain, message in share:
+                        self.rate_limiter.acquire(domain)
+                        try:
+                            connection.send(message)
+                            ok = True
+                        except smtplib.SMTPRecipientsRefused:
+                            logger.warning("Recipient refused: %s", message["To"])
+                            ok = False
+                        done += 1
+                        batch.record(ok)
+                        self.stats.record(ok)
+            except (smtplib.SMTPException, OSError) as e:
+                logger.warning(
+                    "SMTP error with %d emails unsent: %s", len(share) - done, e
+                )
+                batch.record_unsent(position for position, _, _ in share[done:])
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(run, share) for share in shares]:
+                future.result()
+        batch.elapsed = time.perf_counter() - started
+
+        batch.unsent.sort()
+        logger.info(
+            "Sent %d emails (%d failed, %d unsent) at %.1f msg/s",
+            batch.sent,
+            batch.failed,
+            len(batch.unsent),
+            batch.messages_per_second,
+        )
+        return batch
+
+
+def _domain(address: str) -> str:
+    return address.rpartition("@")[2].lower()
+
+
+# Templates are compiled when the module is imported (worker startup)
+email_dispatcher = EmailDispatcher()
@@ -0,0 +1,218 @@
+import base64
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+from app.core.redis_client import redis_client
+from app.core.serialization import dumps, loads
+from app.models.activity import Activity
+from app.services.friends import friend_service
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_PREFIX = "feed_activity:"
+LARGE_AUTHORS_KEY = "feed_large_authors"
+
+# (score, activity ID); feeds run newest first in this order
+FeedPosition = Tuple[int, str]
+# Runs after an activity is published, with the friends it was pushed to
+# (none for large authors, whose friends pick it up on their next read)
+DeliveryHook = Callable[[Activity, List[str]], Awaitable[None]]
+
+
+def _score(moment: datetime) -> int:
+    """Microseconds since the epoch; exact as a Redis double until 2255"""
+    return round(moment.timestamp() * 1_000_000)
+
+
+def encode_cursor(position: FeedPosition) -> str:
+    score, activity_id = position
+    raw = f"{score}:{activity_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> FeedPosition:
+    """Parse a cursor from encode_cursor, raising ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, activity_id = raw.decode("ascii").split(":", 1)
+        return int(score), activity_id
+    except (UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError("Invalid feed cursor") from e
+
+
+@dataclass
+class FeedPage:
+    items: List[Activity]
+    next_cursor: Optional[str]
+
+
+class FeedService:
+    """
+    Friends' activity timelines in Redis sorted sets.
+
+    Publishing writes the activity once and pushes its ID into every
+    friend's timeline (fan-out on write), so reading is a range over one
+    sorted set. Authors with more than `feed_fanout_threshold` friends
+    skip the fan-out; readers merge those authors' outboxes into their
+    timeline instead (fan-out on read). Timelines are trimmed by rank on
+    every write and expire with the activities after the retention period.
+    `delivery_hooks` run for every published activity and the friends it
+    was fanned out to, so large authors never cost a message per friend.
+    """
+
+    def __init__(self, redis_client, friends):
+        self.redis = redis_client
+        self.friends = friends
+        self.delivery_hooks: List[DeliveryHook] = []
+
+    # User ID as a hash tag keeps a user's keys in one cluster slot
+    @staticmethod
+    def _timeline_key(user_id: str) -> str:
+        return f"feed_timeline:{{{user_id}}}"
+
+    @staticmethod
+    def _outbox_key(user_id: str) -> str:
+        return f"feed_outbox:{{{user_id}}}"
+
+    @staticmethod
+    def _retention_seconds() -> int:
+        return settings.feed_retention_days * 86400
+
+    def _push(self, pipe, key: str, activity_id: str, score: int):
+        pipe.zadd(key, {activity_id: score})
+        pipe.zremrangebyrank(key, 0, -settings.feed_timeline_max_entries - 1)
+        pipe.expire(key, self._retention_seconds())
+
+    async def publish(
+        self, actor_id: str, activity_type: str, payload: Dict[str, Any]
+    ) -> Activity:
+        """Store an activity and deliver it to the author's friends"""
+        activity = Activity(
+            id=uuid.uuid4().hex,
+            actor_id=actor_id,
+            type=activity_type,
+            payload=payload,
+            created_at=datetime.now(timezone.utc),
+        )
+        score = _score(activity.created_at)
+        audience = await self.friends.friends_of(actor_id)
+        large = len(audience) > settings.feed_fanout_threshold
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(
+                ACTIVITY_PREFIX + activity.id,
+                dumps(activity.to_dict()),
+                ex=self._retention_seconds(),
+            )
+            # The outbox is always kept, so readers have it the moment an
+            # author crosses the threshold
+            self._push(pipe, self._outbox_key(actor_id), activity.id, score)
+            self._push(pipe, self._timeline_key(actor_id), activity.id, score)
+            if large:
+                pipe.sadd(LARGE_AUTHORS_KEY, actor_id)
+            else:
+                pipe.srem(LARGE_AUTHORS_KEY, actor_id)
+            await pipe.execute()
+
+        recipients = [] if large else list(audience)
+        await self._fan_out(recipients, activity.id, score)
+        for hook in self.delivery_hooks:
+            try:
+                await hook(activity, recipients)
+            except Exception:
+                # The activity is already stored; failing the request would
+                # not rerun the hook
+                logger.exception("Feed delivery hook failed for %s", activity.id)
+        return activity
+
+    async def _fan_out(self, audience: Iterable[str], activity_id: str, score: int):
+        """Push an activity into each recipient's timeline, batched"""
+        recipients = list(audience)
+        batch_size = settings.feed_fanout_batch_size
+        for start in range(0, len(recipients), batch_size):
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for user_id in recipients[start : start + batch_size]:
+                    self._push(pipe, self._timeline_key(user_id), activity_id, score)
+                await pipe.execute()
+
+    @staticmethod
+    def _range(pipe, key: str, below: Optional[FeedPosition], floor: int, count: int):
+        """Queue reads for up to `count` entries after `below`, newest first"""
+        if below is None:
+            pipe.zrevrangebyscore(
+                key, "+inf", floor, start=0, num=count, withscores=True
+            )
+            return
+        # Entries tied with the cursor's score are read in full, so any
+        # number of same-microsecond activities pages correctly
+        pipe.zrevrangebyscore(key, below[0], below[0], withscores=True)
+        pipe.zrevrangebyscore(
+            key, f"({below[0]}", floor, start=0, num=count, withscores=True
+        )
+
+    async def read(
+        self, user_id: str, cursor: Optional[str] = None, limit: Optional[int] = None
+    ) -> FeedPage:
+        """
+        A page of the user's feed, newest first.
+
+        `cursor` is the `next_cursor` of the previous page; positions are
+        (score, ID) pairs, so activities published in the same microsecond
+        are neither skipped nor repeated.
+        """
+        limit = limit or settings.feed_page_size
+        below = decode_cursor(cursor) if cursor else None
+        friends = await self.friends.friends_of(user_id)
+        floor = _score(
+            datetime.now(timezone.utc) - timedelta(seconds=self._retention_seconds())
+        )
+        count = limit + 1
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.smembers(LARGE_AUTHORS_KEY)
+            self._range(pipe, self._timeline_key(user_id), below, floor, count)
+            large_authors, *sources = await pipe.execute()
+
+        followed = sorted(friends.intersection(large_authors))
+        if followed:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for author_id in followed:
+                    self._range(pipe, self._outbox_key(author_id), below, floor, count)
+                sources += await pipe.execute()
+
+        # An author that crossed the threshold can appear in both places
+        scores: Dict[str, int] = {}
+        for rows in sources:
+            for activity_id, score in rows:
+                scores[activity_id] = int(score)
+        positions = sorted(
+            (
+                (score, activity_id)
+                for activity_id, score in scores.items()
+                if below is None or (score, activity_id) < below
+            ),
+            reverse=True,
+        )
+        page = positions[:limit]
+        if not page:
+            return FeedPage(items=[], next_cursor=None)
+
+        raw = await self.redis.mget([ACTIVITY_PREFIX + aid for _, aid in page])
+        items = []
+        for value in raw:
+            if value is None:
+                continue
+            activity = Activity.from_dict(loads(value))
+            # Entries from former friends stay in the timeline until trimmed
+            if activity.actor_id == user_id or activity.actor_id in friends:
+                items.append(activity)
+
+        next_cursor = encode_cursor(page[-1]) if len(positions) > limit else None
+        return FeedPage(items=items, next_cursor=next_cursor)
+
+
+# Singleton instance
+feed_service = FeedService(redis_client.client, friend_service)
@@ -0,0 +1,443 @@
+import asyncio
+import logging
+import uuid
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from app.config import settings
+from app.core.database import supabase
+from app.core.invalidation import InvalidationEvent, invalidation_bus
+from app.services.friends import FRIENDSHIPS_TABLE
+
+logger = logging.getLogger(__name__)
+
+_LOW_MASK = (1 << 64) - 1
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+def _uuid_halves(values: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """128-bit UUID integers as (high, low) uint64 columns"""
+    high = np.fromiter((v >> 64 for v in values), dtype=np.uint64, count=len(values))
+    low = np.fromiter(
+        (v & _LOW_MASK for v in values), dtype=np.uint64, count=len(values)
+    )
+    return high, low
+
+
+def _intersect(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Sorted intersection of two sorted, duplicate-free arrays"""
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return _EMPTY
+    # Binary-search the shorter row into the longer one
+    position = np.searchsorted(b, a)
+    position[position == len(b)] = 0
+    return a[b[position] == a]
+
+
+class FriendGraph:
+    """
+    Undirected friend graph over dense integer user IDs.
+
+    Users present at build time are numbered in UUID order, so mapping a
+    UUID is a binary search over two uint64 columns rather than a
+    million-entry dict. Their adjacency is CSR: friends of user i are
+    `indices[indptr[i]:indptr[i + 1]]`, sorted. Users and edges added
+    later live in small per-user sorted arrays that shadow the CSR rows
+    until compaction folds them back in.
+    """
+
+    def __init__(
+        self,
+        high: np.ndarray,
+        low: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+    ):
+        self._high = high  # uint64, sorted by (high, low)
+        self._low = low
+        self._indptr = indptr  # int64, one entry per CSR row plus one
+        self._indices = indices  # int32
+        self._extra_ids: Dict[int, int] = {}  # UUID int -> ID, users added later
+        self._extra_uuids: List[int] = []
+        self._rows: Dict[int, np.ndarray] = {}  # rows changed since compaction
+
+    @classmethod
+    def from_codes(
+        cls, uuids: Sequence[int], sources: np.ndarray, targets: np.ndarray
+    ) -> "FriendGraph":
+        """
+        Build from directed edges between positions in `uuids`.
+
+        Friendships are stored in both directions, so each one is expected
+        twice; duplicates are dropped.
+        """
+        high, low = _uuid_halves(uuids)
+        order = np.lexsort((low, high))
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+
+        n = len(uuids)
+        keys = np.sort(rank[sources] * n + rank[targets])
+        # Sort and drop repeats; np.unique is far slower on tens of millions
+        unique = np.ones(len(keys), dtype=bool)
+        unique[1:] = keys[1:] != keys[:-1]
+        keys = keys[unique]
+        rows = keys // n
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        indices = (keys - rows * n).astype(np.int32)
+        return cls(high[order], low[order], indptr, indices)
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str]]) -> "FriendGraph":
+        """Build from (user_id, friend_id) UUID string pairs"""
+        codes: Dict[str, int] = {}
+        sources: List[int] = []
+        targets: List[int] = []
+        for user_id, friend_id in edges:
+            sources.append(codes.setdefault(user_id, len(codes)))
+            targets.append(codes.setdefault(friend_id, len(codes)))
+        uuids = [uuid.UUID(user_id).int for user_id in codes]
+        return cls.from_codes(
+            uuids,
+            np.asarray(sources, dtype=np.int64),
+            np.asarray(targets, dtype=np.int64),
+        )
+
+    @property
+    def user_count(self) -> int:
+        return len(self._high) + len(self._extra_uuids)
+
+    @property
+    def edge_count(self) -> int:
+        """Directed edges, i.e. twice the number of friendships"""
+        count = int(self._indptr[-1])
+        csr_rows = len(self._indptr) - 1
+        for i, row in self._rows.items():
+            old = self._indptr[i + 1] - self._indptr[i] if i < csr_rows else 0
+            count += len(row) - int(old)
+        return count
+
+    @property
+    def pending_rows(self) -> int:
+        """Rows changed since the last compaction"""
+        return len(self._rows)
+
+    def changed_rows(self) -> Dict[int, np.ndarray]:
+        """Snapshot of the rows changed since the last compaction"""
+        return dict(self._rows)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the index"""
+        shadow = sum(row.nbytes for row in self._rows.values())
+        return (
+            self._high.nbytes
+            + self._low.nbytes
+            + self._indptr.nbytes
+            + self._indices.nbytes
+            + shadow
+            # dict entry, int key and value, list slot
+            + len(self._extra_uuids) * 160
+        )
+
+    def id_of(self, user_id: str) -> Optional[int]:
+        """Dense ID of a user, or None if they have never had a friend"""
+        value = uuid.UUID(user_id).int
+        high, low = np.uint64(value >> 64), np.uint64(value & _LOW_MASK)
+        i = int(np.searchsorted(self._high, high))
+        # High halves are random 64-bit values; a tie is vanishingly rare
+        while i < len(self._high) and self._high[i] == high:
+            if self._low[i] == low:
+                return i
+            i += 1
+        return self._extra_ids.get(value)
+
+    def _ensure_id(self, user_id: str) -> int:
+        i = self.id_of(user_id)
+        if i is None:
+            i = self.user_count
+            value = uuid.UUID(user_id).int
+            self._extra_ids[value] = i
+            self._extra_uuids.append(value)
+        return i
+
+    def uuid_of(self, i: int) -> str:
+        if i < len(self._high):
+            value = (int(self._high[i]) << 64) | int(self._low[i])
+        else:
+            value = self._extra_uuids[i - len(self._high)]
+        return str(uuid.UUID(int=value))
+
+    def neighbors(self, i: int) -> np.ndarray:
+        """Sorted friend IDs of user i"""
+        row = self._rows.get(i)
+        if row is not None:
+            return row
+        if i < len(self._indptr) - 1:
+            return self._indices[self._indptr[i] : self._indptr[i + 1]]
+        return _EMPTY
+
+    def degree(self, i: int) -> int:
+        return len(self.neighbors(i))
+
+    def add(self, user_id: str, friend_id: str):
+        a, b = self._ensure_id(user_id), self._ensure_id(friend_id)
+        self._insert(a, b)
+        self._insert(b, a)
+
+    def remove(self, user_id: str, friend_id: str):
+        a, b = self.id_of(user_id), self.id_of(friend_id)
+        if a is not None and b is not None:
+            self._delete(a, b)
+            self._delete(b, a)
+
+    def _insert(self, i: int, j: int):
+        row = self.neighbors(i)
+        position = int(np.searchsorted(row, j))
+        if position == len(row) or row[position] != j:
+            self._rows[i] = np.insert(row, position, np.int32(j))
+
+    def _delete(self, i: int, j: int):
+        row = self.neighbors(i)
+        position = int(np.searchsorted(row, j))
+        if position < len(row) and row[position] == j:
+            self._rows[i] = np.delete(row, position)
+
+    def mutual(self, a: int, b: int) -> np.ndarray:
+        """Sorted IDs of friends a and b share"""
+        return _intersect(self.neighbors(a), self.neighbors(b))
+
+    def suggestions(
+        self, i: int, limit: int = 20, max_expansion: int = 200000
+    ) -> List[Tuple[int, int]]:
+        """
+        Friends of friends ranked by mutual-friend count, as (ID, count).
+
+        Friends are expanded smallest audience first until `max_expansion`
+        two-hop entries are gathered, which bounds the cost for users
+        connected to very popular accounts (whose friends say little about
+        who this user knows anyway).
+        """
+        friends = self.neighbors(i)
+        if not len(friends):
+            return []
+
+        degrees = np.fromiter(
+            (self.degree(f) for f in friends.tolist()),
+            dtype=np.int64,
+            count=len(friends),
+        )
+        order = np.argsort(degrees, kind="stable")
+        within = np.cumsum(degrees[order]) <= max_expansion
+        within[0] = True
+        two_hop = np.concatenate(
+            [self.neighbors(f) for f in friends[order[within]].tolist()]
+        )
+
+        two_hop.sort()
+        starts = np.flatnonzero(np.concatenate(([True], two_hop[1:] != two_hop[:-1])))
+        candidates = two_hop[starts]
+        counts = np.diff(np.append(starts, len(two_hop)))
+        keep = candidates != i
+        keep &= np.isin(candidates, friends, assume_unique=True, invert=True)
+        candidates, counts = candidates[keep], counts[keep]
+        if not len(candidates):
+            return []
+
+        # Highest count first; lower ID breaks ties so results are stable.
+        # Candidates are sorted, so ties at the cut keep the lowest IDs.
+        limit = min(limit, len(candidates))
+        cut = np.partition(counts, len(counts) - limit)[len(counts) - limit]
+        above = np.flatnonzero(counts > cut)
+        ties = np.flatnonzero(counts == cut)[: limit - len(above)]
+        top = np.concatenate((above, ties))
+        top = top[np.lexsort((candidates[top], -counts[top]))]
+        return list(zip(candidates[top].tolist(), counts[top].tolist()))
+
+    def compacted(self, rows: Dict[int, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR arrays with `rows` (a snapshot of the shadow rows) folded in"""
+        old_rows = len(self._indptr) - 1
+        n = max(old_rows, max(rows) + 1 if rows else 0)
+        degrees = np.zeros(n, dtype=np.int64)
+        degrees[:old_rows] = np.diff(self._indptr)
+        changed = np.fromiter(rows, dtype=np.int64, count=len(rows))
+        degrees[changed] = [len(row) for row in rows.values()]
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        indices = np.empty(int(indptr[-1]), dtype=np.int32)
+
+        # Unchanged rows move as one block; only their offsets shift
+        owner = np.repeat(np.arange(old_rows), np.diff(self._indptr))
+        kept = np.ones(old_rows, dtype=bool)
+        kept[changed[changed < old_rows]] = False
+        kept = kept[owner]
+        offset = np.arange(len(owner)) - self._indptr[owner]
+        indices[indptr[owner[kept]] + offset[kept]] = self._indices[kept]
+        for i, row in rows.items():
+            indices[indptr[i] : indptr[i + 1]] = row
+        return indptr, indices
+
+    def install(
+        self, rows: Dict[int, np.ndarray], indptr: np.ndarray, indices: np.ndarray
+    ):
+        """Swap in compacted arrays, keeping rows changed since the snapshot"""
+        self._indptr, self._indices = indptr, indices
+        self._rows = {i: row for i, row in self._rows.items() if rows.get(i) is not row}
+
+
+class FriendGraphService:
+    """
+    The friend graph of every user, held in memory by each worker.
+
+    Loaded from the friendships table on first use. Friend adds and
+    removes arrive as invalidation events and patch the graph in place;
+    when the bus may have dropped events the graph is discarded and
+    reloaded on next use.
+    """
+
+    def __init__(self):
+        self.graph: Optional[FriendGraph] = None
+        self._lock = asyncio.Lock()
+        self._loading = False
+        # Changes that arrive while a load is reading the table
+        self._replay: List[Tuple[bool, str, str]] = []
+        self._compacting = False
+
+    async def get_graph(self) -> FriendGraph:
+        if self.graph is None:
+            async with self._lock:
+                if self.graph is None:
+                    self._loading, self._replay = True, []
+                    try:
+                        graph = await asyncio.to_thread(self._load)
+                    finally:
+                        self._loading = False
+                    # Adds and removes are idempotent, so replaying ones the
+                    # load already saw is harmless
+                    for added, user_id, friend_id in self._replay:
+                        self._patch(graph, added, user_id, friend_id)
+                    self._replay = []
+                    self.graph = graph
+                    logger.info(
+                        "Loaded friend graph: %d users, %.1f MB",
+                        graph.user_count,
+                        graph.nbytes / 1e6,
+                    )
+        return self.graph
+
+    @staticmethod
+    def _load() -> FriendGraph:
+        """Keyset-paginate over accepted friendships"""
+
+        def edges():
+            last_id: Optional[str] = None
+            page_size = settings.friend_graph_load_page_size
+            while True:
+                query = (
+                    supabase.service_client.table(FRIENDSHIPS_TABLE)
+                    .select("id,user_id,friend_id")
+                    .eq("status", "accepted")
+                )
+                if last_id is not None:
+                    query = query.gt("id", last_id)
+                rows = query.order("id").limit(page_size).execute().data or []
+                for row in rows:
+                    yield row["user_id"], row["friend_id"]
+                if len(rows) < page_size:
+                    return
+                last_id = rows[-1]["id"]
+
+        return FriendGraph.from_edges(edges())
+
+    @staticmethod
+    def _patch(graph: FriendGraph, added: bool, user_id: str, friend_id: str):
+        if added:
+            graph.add(user_id, friend_id)
+        else:
+            graph.remove(user_id, friend_id)
+
+    def _on_change(self, added: bool, key: str):
+        user_id, friend_id = key.split(":", 1)
+        if self._loading:
+            self._replay.append((added, user_id, friend_id))
+        if self.graph is not None:
+            self._patch(self.graph, added, user_id, friend_id)
+            if (
+                self.graph.pending_rows >= settings.friend_graph_compact_rows
+                and not self._compacting
+            ):
+                self._schedule_compaction()
+
+    def _schedule_compaction(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop to run it on; the next change retries
+        self._compacting = True
+        loop.create_task(self._compact(self.graph))
+
+    async def _compact(self, graph: FriendGraph):
+        try:
+            rows = graph.changed_rows()
+            indptr, indices = await asyncio.to_thread(graph.compacted, rows)
+            graph.install(rows, indptr, indices)
+        except Exception:
+            logger.exception("Friend graph compaction failed")
+        finally:
+            self._compacting = False
+
+    def reset(self):
+        """Drop the graph; it reloads on next use"""
+        self.graph = None
+
+    async def mutual_counts(
+        self, user_id: str, other_ids: Sequence[str]
+    ) -> Dict[str, int]:
+        """Number of friends the user shares with each of `other_ids`"""
+        graph = await self.get_graph()
+        me = graph.id_of(user_id)
+        counts = {}
+        for other_id in other_ids:
+            other = graph.id_of(other_id)
+            counts[other_id] = (
+                0 if me is None or other is None else len(graph.mutual(me, other))
+            )
+        return counts
+
+    async def mutual_friends(self, user_id: str, other_id: str) -> List[str]:
+        graph = await self.get_graph()
+        me, other = graph.id_of(user_id), graph.id_of(other_id)
+        if me is None or other is None:
+            return []
+        return [graph.uuid_of(i) for i in graph.mutual(me, other).tolist()]
+
+    async def suggestions(
+        self, user_id: str, limit: int = 20
+    ) -> List[Tuple[str, int]]:
+        """People the user may know, as (user ID, mutual friends)"""
+        graph = await self.get_graph()
+        me = graph.id_of(user_id)
+        if me is None:
+            return []
+        return [
+            (graph.uuid_of(i), count)
+            for i, count in graph.suggestions(
+                me, limit, settings.friend_suggestions_max_expansion
+            )
+        ]
+
+
+# Singleton instance
+friend_graph_service = FriendGraphService()
+invalidation_bus.on(
+    InvalidationEvent.FRIENDSHIP_ADDED,
+    lambda key: friend_graph_service._on_change(True, key),
+)
+invalidation_bus.on(
+    InvalidationEvent.FRIENDSHIP_REMOVED,
+    lambda key: friend_graph_service._on_change(False, key),
+)
+invalidation_bus.on_reset(friend_graph_service.reset)
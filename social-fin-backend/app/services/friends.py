@@ -0,0 +1,129 @@
+import asyncio
+import logging
+from typing import FrozenSet, List, Optional
+from app.core.cache import friends_cache
+from app.core.database import supabase
+from app.core.invalidation import InvalidationEvent, invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+FRIENDSHIPS_TABLE = "friendships"
+FRIENDS_PAGE_SIZE = 1000
+
+
+class FriendService:
+    """
+    Friend requests and accepted friendships.
+
+    A request is one pending row from the requester. Once accepted, a
+    friendship is stored as one row per direction (user_id -> friend_id),
+    so a user's friends are a single indexed lookup. Friend sets are cached
+    per user and evicted on FRIENDS_CHANGED; the friend graph follows the
+    FRIENDSHIP_ADDED and FRIENDSHIP_REMOVED events.
+    """
+
+    def __init__(self):
+        self.service_client = supabase.service_client
+
+    async def friends_of(self, user_id: str) -> FrozenSet[str]:
+        """A user's accepted friends, loading them on a cache miss"""
+        friends = friends_cache.get(user_id)
+        if friends is None:
+            cache_version = friends_cache.version
+            friends = await asyncio.to_thread(self._load_friends, user_id)
+            friends_cache.set(user_id, friends, version=cache_version)
+        return friends
+
+    async def request_friend(self, user_id: str, friend_id: str) -> str:
+        """
+        Ask to be friends, or accept the other user's pending request.
+
+        Returns "accepted" if the two are now friends, "pending" otherwise.
+        """
+        rows = await asyncio.to_thread(self._load_pair, user_id, friend_id)
+        statuses = {(row["user_id"], row["friend_id"]): row["status"] for row in rows}
+        if statuses.get((user_id, friend_id)) == "accepted":
+            return "accepted"
+
+        if (friend_id, user_id) in statuses:
+            await asyncio.to_thread(
+                self._upsert,
+                [
+                    {"user_id": user_id, "friend_id": friend_id, "status": "accepted"},
+                    {"user_id": friend_id, "friend_id": user_id, "status": "accepted"},
+                ],
+            )
+            self._publish(InvalidationEvent.FRIENDSHIP_ADDED, user_id, friend_id)
+            return "accepted"
+
+        await asyncio.to_thread(
+            self._upsert,
+            [{"user_id": user_id, "friend_id": friend_id, "status": "pending"}],
+        )
+        return "pending"
+
+    async def remove_friend(self, user_id: str, friend_id: str) -> bool:
+        """
+        Unfriend, or cancel or decline a pending request.
+
+        Returns whether anything was removed.
+        """
+        removed = await asyncio.to_thread(self._delete_pair, user_id, friend_id)
+        if any(row["status"] == "accepted" for row in removed):
+            self._publish(InvalidationEvent.FRIENDSHIP_REMOVED, user_id, friend_id)
+        return bool(removed)
+
+    @staticmethod
+    def _publish(event: InvalidationEvent, user_id: str, friend_id: str):
+        invalidation_bus.publish(event, f"{user_id}:{friend_id}")
+        invalidation_bus.publish(InvalidationEvent.FRIENDS_CHANGED, user_id)
+        invalidation_bus.publish(InvalidationEvent.FRIENDS_CHANGED, friend_id)
+
+    def _load_pair(self, user_id: str, friend_id: str) -> List[dict]:
+        response = (
+            self.service_client.table(FRIENDSHIPS_TABLE)
+            .select("user_id,friend_id,status")
+            .in_("user_id", [user_id, friend_id])
+            .in_("friend_id", [user_id, friend_id])
+            .execute()
+        )
+        return response.data or []
+
+    def _upsert(self, rows: List[dict]):
+        self.service_client.table(FRIENDSHIPS_TABLE).upsert(
+            rows, on_conflict="user_id,friend_id"
+        ).execute()
+
+    def _delete_pair(self, user_id: str, friend_id: str) -> List[dict]:
+        response = (
+            self.service_client.table(FRIENDSHIPS_TABLE)
+            .delete()
+            .in_("user_id", [user_id, friend_id])
+            .in_("friend_id", [user_id, friend_id])
+            .execute()
+        )
+        return response.data or []
+
+    def _load_friends(self, user_id: str) -> FrozenSet[str]:
+        """Keyset-paginate over friend IDs"""
+        friends = set()
+        last_id: Optional[str] = None
+        while True:
+            query = (
+                self.service_client.table(FRIENDSHIPS_TABLE)
+                .select("friend_id")
+                .eq("user_id", user_id)
+                .eq("status", "accepted")
+            )
+            if last_id is not None:
+                query = query.gt("friend_id", last_id)
+            rows = query.order("friend_id").limit(FRIENDS_PAGE_SIZE).execute().data
+            rows = rows or []
+            friends.update(row["friend_id"] for row in rows)
+            if len(rows) < FRIENDS_PAGE_SIZE:
+                return frozenset(friends)
+            last_id = rows[-1]["friend_id"]
+
+
+# Singleton instance
+friend_service = FriendService()
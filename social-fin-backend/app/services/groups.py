@@ -0,0 +1,437 @@
+import asyncio
+import heapq
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+import redis.asyncio as redis
+from app.config import settings
+from app.core.database import supabase
+from app.core.exceptions import GroupAccessError, GroupNotFoundError
+from app.core.push import push_hub
+from app.core.redis_client import redis_client
+from app.models.group import ExpenseGroup, GroupExpense
+from app.services.feed import feed_service
+from app.services.friends import friend_service
+
+logger = logging.getLogger(__name__)
+
+GROUPS_TABLE = "expense_groups"
+MEMBERS_TABLE = "expense_group_members"
+EXPENSES_TABLE = "group_expenses"
+EXPENSE_COLUMNS = "id,group_id,paid_by,amount_cents,shares,description,kind,created_at"
+
+EXPENSE = "expense"
+SETTLEMENT = "settlement"
+
+# (from user, to user, cents)
+Transfer = Tuple[str, str, int]
+
+# Applies or reverses one expense's balance changes atomically. The ledger
+# maps an expense ID to the "user=cents;..." changes it made, so applying
+# twice is a no-op and reversing undoes exactly what was applied.
+#
+# KEYS: balances hash, ledger hash
+# ARGV: expense ID, 1 to apply or -1 to reverse, changes (when applying)
+_APPLY_SCRIPT = """
+local balances, ledger = KEYS[1], KEYS[2]
+local entry
+if ARGV[2] == '1' then
+    if redis.call('HSETNX', ledger, ARGV[1], ARGV[3]) == 0 then
+        return 0
+    end
+    entry = ARGV[3]
+else
+    entry = redis.call('HGET', ledger, ARGV[1])
+    if not entry then
+        return 0
+    end
+    redis.call('HDEL', ledger, ARGV[1])
+end
+
+local sign = tonumber(ARGV[2])
+for user, cents in string.gmatch(entry, '([^=;]+)=(-?%d+)') do
+    redis.call('HINCRBY', balances, user, sign * tonumber(cents))
+end
+return 1
+"""
+
+
+def split_equally(amount_cents: int, member_ids: Iterable[str]) -> Dict[str, int]:
+    """Even shares; leftover cents go one each to the first members by ID"""
+    members = sorted(set(member_ids))
+    base, leftover = divmod(amount_cents, len(members))
+    return {
+        user_id: base + (1 if i < leftover else 0) for i, user_id in enumerate(members)
+    }
+
+
+def balance_changes(expense: GroupExpense) -> Dict[str, int]:
+    """Net effect on balances: the payer is owed, each share is owed"""
+    changes: Dict[str, int] = defaultdict(int)
+    changes[expense.paid_by] += expense.amount_cents
+    for user_id, cents in expense.shares.items():
+        changes[user_id] -= cents
+    return {user_id: cents for user_id, cents in changes.items() if cents}
+
+
+def _entry(changes: Dict[str, int]) -> str:
+    return ";".join(f"{user_id}={cents}" for user_id, cents in sorted(changes.items()))
+
+
+def settle_up(balances: Dict[str, int]) -> List[Transfer]:
+    """
+    Transfers that zero every balance (positive = owed money).
+
+    Debts equal to a credit are paired off first; the rest are settled
+    greedily, largest debtor paying largest creditor via two heaps. Each
+    step zeroes at least one balance, so n members need at most n - 1
+    transfers, in O(n log n).
+    """
+    transfers: List[Transfer] = []
+    creditors_by_amount: Dict[int, List[str]] = defaultdict(list)
+    for user_id, cents in sorted(balances.items()):
+        if cents > 0:
+            creditors_by_amount[cents].append(user_id)
+
+    debtors: List[Tuple[int, str]] = []
+    for user_id, cents in sorted(balances.items()):
+        if cents < 0:
+            match = creditors_by_amount.get(-cents)
+            if match:
+                transfers.append((user_id, match.pop(), -cents))
+            else:
+                debtors.append((cents, user_id))  # most negative pops first
+
+    creditors = [
+        (-cents, user_id)
+        for cents, user_ids in creditors_by_amount.items()
+        for user_id in user_ids
+    ]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+    while creditors and debtors:
+        credit, creditor = heapq.heappop(creditors)
+        debt, debtor = heapq.heappop(debtors)
+        amount = min(-credit, -debt)
+        transfers.append((debtor, creditor, amount))
+        if -credit > amount:
+            heapq.heappush(creditors, (credit + amount, creditor))
+        if -debt > amount:
+            heapq.heappush(debtors, (debt + amount, debtor))
+    return transfers
+
+
+class GroupService:
+    """
+    Expense groups with net balances maintained in Redis.
+
+    Each expense is stored in the database and folded into a per-group
+    balances hash (cents; positive = owed money) when it is added, and
+    reversed when it is deleted, so reading balances and settling up
+    never replays the expense history. rebuild() recomputes from the
+    database if the two ever disagree; group IDs with no members are
+    remembered for `group_missing_ttl_seconds` so probing them doesn't
+    reload from the database on every request.
+    """
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self.service_client = supabase.service_client
+        self._apply = self.redis.register_script(_APPLY_SCRIPT)
+
+    # Group ID as a hash tag keeps a group's keys in one cluster slot
+    @staticmethod
+    def _balances_key(group_id: str) -> str:
+        return f"group_balances:{{{group_id}}}"
+
+    @staticmethod
+    def _ledger_key(group_id: str) -> str:
+        return f"group_ledger:{{{group_id}}}"
+
+    @staticmethod
+    def _missing_key(group_id: str) -> str:
+        return f"group_missing:{{{group_id}}}"
+
+    async def create_group(
+        self, user_id: str, name: str, member_ids: Iterable[str]
+    ) -> ExpenseGroup:
+        """Create a group of the user and some of their friends"""
+        members = set(member_ids) - {user_id}
+        await self._check_friends(user_id, members)
+        row = await asyncio.to_thread(
+            self._insert_group, {"name": name, "created_by": user_id}
+        )
+        group = ExpenseGroup.from_row(row)
+        await self._add_members(group.id, [user_id, *sorted(members)])
+        return group
+
+    async def add_member(self, group_id: str, user_id: str, member_id: str):
+        """Add one of the user's friends to a group the user is in"""
+        await self.require_member(group_id, user_id)
+        await self._check_friends(user_id, [member_id])
+        await self._add_members(group_id, [member_id])
+
+    async def _check_friends(self, user_id: str, member_ids: Iterable[str]):
+        friends = await friend_service.friends_of(user_id)
+        strangers = set(member_ids) - friends
+        if strangers:
+            raise GroupAccessError("Only friends can be added to a group")
+
+    async def _add_members(self, group_id: str, member_ids: List[str]):
+        await asyncio.to_thread(
+            self._upsert_members,
+            [{"group_id": group_id, "user_id": user_id} for user_id in member_ids],
+        )
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for user_id in member_ids:
+                pipe.hsetnx(self._balances_key(group_id), user_id, 0)
+            pipe.delete(self._missing_key(group_id))
+            await pipe.execute()
+
+    async def get_group(self, group_id: str, user_id: str) -> ExpenseGroup:
+        await self.require_member(group_id, user_id)
+        row = await asyncio.to_thread(self._load_group, group_id)
+        if row is None:
+            raise GroupNotFoundError("Group not found")
+        return ExpenseGroup.from_row(row)
+
+    async def user_groups(self, user_id: str) -> List[ExpenseGroup]:
+        rows = await asyncio.to_thread(self._load_user_groups, user_id)
+        return [ExpenseGroup.from_row(row) for row in rows]
+
+    async def get_balances(self, group_id: str) -> Dict[str, int]:
+        """Every member's net balance in cents; positive means they are owed"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._balances_key(group_id))
+            pipe.exists(self._missing_key(group_id))
+            raw, missing = await pipe.execute()
+        if not raw and not missing:
+            # Lost from Redis (or never built); the database is the record
+            await self.rebuild(group_id)
+            raw = await self.redis.hgetall(self._balances_key(group_id))
+        return {user_id: int(cents) for user_id, cents in raw.items()}
+
+    async def require_member(self, group_id: str, user_id: str):
+        """Raise GroupNotFoundError unless the user belongs to the group"""
+        balances = await self.get_balances(group_id)
+        if user_id not in balances:
+            raise GroupNotFoundError("Group not found")
+
+    async def add_expense(
+        self,
+        group_id: str,
+        user_id: str,
+        amount_cents: int,
+        shares: Dict[str, int],
+        description: Optional[str] = None,
+        paid_by: Optional[str] = None,
+        kind: str = EXPENSE,
+    ) -> GroupExpense:
+        """
+        Record an expense paid by `paid_by` (default: the user) and owed
+        per `shares`, which must be members and sum to the amount
+        """
+        paid_by = paid_by or user_id
+        balances = await self.get_balances(group_id)
+        if user_id not in balances:
+            raise GroupNotFoundError("Group not found")
+        outsiders = ({paid_by} | set(shares)) - set(balances)
+        if outsiders:
+            raise ValueError("Everyone in an expense must be a group member")
+        if sum(shares.values()) != amount_cents:
+            raise ValueError("Shares must add up to the amount")
+
+        row = await asyncio.to_thread(
+            self._insert_expense,
+            {
+                "group_id": group_id,
+                "paid_by": paid_by,
+                "amount_cents": amount_cents,
+                "shares": shares,
+                "description": description,
+                "kind": kind,
+            },
+        )
+        expense = GroupExpense.from_row(row)
+        await self._apply_expense(expense)
+        await self._push_balances(group_id, balances)
+
+        if kind == EXPENSE:
+            group = await asyncio.to_thread(self._load_group, group_id)
+            await feed_service.publish(
+                paid_by,
+                "expense_split",
+                {"group_id": group_id, "group_name": (group or {}).get("name")},
+            )
+        return expense
+
+    async def settle(
+        self, group_id: str, user_id: str, to_user_id: str, amount_cents: int
+    ) -> GroupExpense:
+        """Record a payment from the user to another member"""
+        if to_user_id == user_id:
+            raise ValueError("A settlement must be paid to another member")
+        return await self.add_expense(
+            group_id,
+            user_id,
+            amount_cents,
+            {to_user_id: amount_cents},
+            description="Settle up",
+            kind=SETTLEMENT,
+        )
+
+    async def delete_expense(self, group_id: str, user_id: str, expense_id: str):
+        await self.require_member(group_id, user_id)
+        deleted = await asyncio.to_thread(self._delete_expense, group_id, expense_id)
+        if not deleted:
+            raise GroupNotFoundError("Expense not found")
+        await self._apply(
+            keys=[self._balances_key(group_id), self._ledger_key(group_id)],
+            args=[expense_id, -1],
+        )
+        await self._push_balances(group_id, await self.get_balances(group_id))
+
+    @staticmethod
+    async def _push_balances(group_id: str, members: Iterable[str]):
+        """Tell members' open clients to refetch the group's balances"""
+        await push_hub.publish(
+            members, "group_balances", {"group_id": group_id}, key=group_id
+        )
+
+    async def _apply_expense(self, expense: GroupExpense):
+        await self._apply(
+            keys=[
+                self._balances_key(expense.group_id),
+                self._ledger_key(expense.group_id),
+            ],
+            args=[expense.id, 1, _entry(balance_changes(expense))],
+        )
+
+    async def settle_up_plan(self, group_id: str) -> List[Transfer]:
+        return settle_up(await self.get_balances(group_id))
+
+    async def rebuild(self, group_id: str) -> int:
+        """
+        Recompute a group's balances and ledger from the database.
+
+        An expense added or deleted while the history loads changes the
+        watched keys, and the rebuild starts over rather than overwrite it.
+        """
+        balances_key = self._balances_key(group_id)
+        ledger_key = self._ledger_key(group_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for attempt in range(settings.group_rebuild_attempts):
+                try:
+                    await pipe.watch(balances_key, ledger_key)
+                    member_ids, expenses = await asyncio.to_thread(
+                        self._load_history, group_id
+                    )
+                    balances: Dict[str, int] = {user_id: 0 for user_id in member_ids}
+                    ledger: Dict[str, str] = {}
+                    for expense in expenses:
+                        changes = balance_changes(expense)
+                        ledger[expense.id] = _entry(changes)
+                        for user_id, cents in changes.items():
+                            balances[user_id] = balances.get(user_id, 0) + cents
+
+                    pipe.multi()
+                    pipe.delete(balances_key, ledger_key)
+                    if balances:
+                        pipe.hset(balances_key, mapping=balances)
+                        pipe.delete(self._missing_key(group_id))
+                    else:
+                        pipe.set(
+                            self._missing_key(group_id),
+                            1,
+                            ex=settings.group_missing_ttl_seconds,
+                        )
+                    if ledger:
+                        pipe.hset(ledger_key, mapping=ledger)
+                    await pipe.execute()
+                    return len(expenses)
+                except redis.WatchError:
+                    logger.info(
+                        "Group %s changed during rebuild (attempt %d)",
+                        group_id,
+                        attempt + 1,
+                    )
+        raise redis.WatchError(f"Group {group_id} kept changing during rebuild")
+
+    def _load_history(self, group_id: str) -> Tuple[List[str], List[GroupExpense]]:
+        members = (
+            self.service_client.table(MEMBERS_TABLE)
+            .select("user_id")
+            .eq("group_id", group_id)
+            .execute()
+        )
+        expenses: List[GroupExpense] = []
+        last_id: Optional[str] = None
+        page_size = settings.group_expenses_page_size
+        while True:
+            query = (
+                self.service_client.table(EXPENSES_TABLE)
+                .select(EXPENSE_COLUMNS)
+                .eq("group_id", group_id)
+            )
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            rows = query.order("id").limit(page_size).execute().data or []
+            expenses.extend(GroupExpense.from_row(row) for row in rows)
+            if len(rows) < page_size:
+                break
+            last_id = rows[-1]["id"]
+        return [row["user_id"] for row in members.data or []], expenses
+
+    def _insert_group(self, row: dict) -> dict:
+        return self.service_client.table(GROUPS_TABLE).insert(row).execute().data[0]
+
+    def _upsert_members(self, rows: List[dict]):
+        self.service_client.table(MEMBERS_TABLE).upsert(
+            rows, on_conflict="group_id,user_id"
+        ).execute()
+
+    def _load_group(self, group_id: str) -> Optional[dict]:
+        response = (
+            self.service_client.table(GROUPS_TABLE)
+            .select("id,name,created_by,created_at")
+            .eq("id", group_id)
+            .limit(1)
+            .execute()
+        )
+        return response.data[0] if response.data else None
+
+    def _load_user_groups(self, user_id: str) -> List[dict]:
+        memberships = (
+            self.service_client.table(MEMBERS_TABLE)
+            .select("group_id")
+            .eq("user_id", user_id)
+            .execute()
+        )
+        group_ids = [row["group_id"] for row in memberships.data or []]
+        if not group_ids:
+            return []
+        response = (
+            self.service_client.table(GROUPS_TABLE)
+            .select("id,name,created_by,created_at")
+            .in_("id", group_ids)
+            .order("created_at")
+            .execute()
+        )
+        return response.data or []
+
+    def _insert_expense(self, row: dict) -> dict:
+        return self.service_client.table(EXPENSES_TABLE).insert(row).execute().data[0]
+
+    def _delete_expense(self, group_id: str, expense_id: str) -> bool:
+        response = (
+            self.service_client.table(EXPENSES_TABLE)
+            .delete()
+            .eq("group_id", group_id)
+            .eq("id", expense_id)
+            .execute()
+        )
+        return bool(response.data)
+
+
+# Singleton instance
+group_service = GroupService(redis_client.client)
@@ -0,0 +1,241 @@
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+from app.config import settings
+from app.core.redis_client import redis_client
+from app.services.analytics import (
+    TransactionFrame,
+    analytics_service,
+    monthly_summary,
+    spending_by_category_month,
+    top_merchants,
+)
+from app.services.llm_client import llm_client
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompt changes so cached insights are regenerated
+PROMPT_VERSION = 1
+SYSTEM_PROMPT = (
+    "You are a personal finance assistant. Given a JSON summary of a user's "
+    "recent income and spending (whole dollars), write three short, specific "
+    "observations with one practical suggestion each. Do not invent numbers."
+)
+NO_DATA_INSIGHT = "Link an account to get insights about your spending."
+
+
+@dataclass
+class Insight:
+    text: str
+    generated_at: datetime
+    cached: bool
+
+
+def _month_index(day: date) -> int:
+    """Months since 1970-01, as in TransactionFrame.month"""
+    return (day.year - 1970) * 12 + day.month - 1
+
+
+def _whole(value: float) -> int:
+    return int(round(value))
+
+
+def insight_features(
+    frame: TransactionFrame, today: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Compact prompt input: the last `insights_lookback_months` full months
+    plus the month to date, in whole dollars.
+
+    Totals are rounded so that a few cents of change keep the same cache
+    key; the hash changes only when the picture a reader would get does.
+    """
+    today = today or date.today()
+    current = _month_index(today)
+    lookback = settings.insights_lookback_months
+    recent = frame.select(frame.month >= current - lookback)
+    if not len(recent):
+        return {}
+
+    as_of = f"{today.year:04d}-{today.month:02d}"
+    months = [
+        {
+            "month": row["month"],
+            "income": _whole(row["income"]),
+            "spending": _whole(row["spending"]),
+            "net": _whole(row["net"]),
+        }
+        for row in monthly_summary(recent)
+    ]
+
+    past_totals: Dict[str, float] = {}
+    month_to_date: Dict[str, float] = {}
+    for row in spending_by_category_month(recent):
+        totals = month_to_date if row["month"] == as_of else past_totals
+        totals[row["category"]] = totals.get(row["category"], 0) + row["total"]
+    categories = sorted(
+        set(past_totals) | set(month_to_date),
+        key=lambda c: (-(past_totals.get(c, 0) / lookback), c),
+    )[: settings.insights_max_categories]
+
+    return {
+        "as_of": as_of,
+        "months": months,
+        "categories": [
+            {
+                "category": category,
+                "monthly_average": _whole(past_totals.get(category, 0) / lookback),
+                "month_to_date": _whole(month_to_date.get(category, 0)),
+            }
+            for category in categories
+        ],
+        "top_merchants": [
+            {"merchant": row["merchant"], "total": _whole(row["total"])}
+            for row in top_merchants(recent, settings.insights_max_merchants)
+        ],
+    }
+
+
+def features_hash(features: Dict[str, Any]) -> str:
+    """Content hash of the prompt input, model and prompt version"""
+    canonical = json.dumps(
+        {
+            "version": PROMPT_VERSION,
+            "model": settings.openai_model,
+            "features": features,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def prompt_messages(features: Dict[str, Any]) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": json.dumps(features, separators=(",", ":"))},
+    ]
+
+
+class InsightService:
+    """
+    Spending insights written by a language model.
+
+    Prompts are built from aggregated analytics features rather than raw
+    transactions, and completions are cached in Redis under a hash of
+    those features, so users whose finances have not changed since the
+    last run (or who share a summary) cost nothing. The nightly batch
+    fills the cache ahead of time with bounded concurrency; on-demand
+    requests stream tokens as they are generated.
+    """
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+
+    @staticmethod
+    def _key(digest: str) -> str:
+        return f"insight:{digest}"
+
+    async def features(self, user_id: str) -> Dict[str, Any]:
+        frame = await analytics_service.get_frame(user_id)
+        return insight_features(frame)
+
+    async def _cached(self, digest: str) -> Optional[Insight]:
+        raw = await self.redis.get(self._key(digest))
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return Insight(
+            text=data["text"],
+            generated_at=datetime.fromisoformat(data["generated_at"]),
+            cached=True,
+        )
+
+    async def _store(self, digest: str, text: str) -> Insight:
+        insight = Insight(
+            text=text, generated_at=datetime.now(timezone.utc), cached=False
+        )
+        await self.redis.set(
+            self._key(digest),
+            json.dumps(
+                {"text": text, "generated_at": insight.generated_at.isoformat()}
+            ),
+            ex=settings.insights_cache_ttl_seconds,
+        )
+        return insight
+
+    async def get_insight(self, user_id: str) -> Insight:
+        """A user's current insight, generating it on a cache miss"""
+        features = await self.features(user_id)
+        if not features:
+            return Insight(
+                NO_DATA_INSIGHT, generated_at=datetime.now(timezone.utc), cached=True
+            )
+        digest = features_hash(features)
+        insight = await self._cached(digest)
+        if insight is None:
+            text = await llm_client.complete(
+                prompt_messages(features), settings.insights_max_tokens
+            )
+            insight = await self._store(digest, text)
+        return insight
+
+    async def stream_insight(self, user_id: str) -> AsyncIterator[str]:
+        """
+        Yield a user's insight as it is generated.
+
+        A cached insight is yielded whole. A generated one is cached once
+        the stream completes, so an abandoned stream caches nothing.
+        """
+        features = await self.features(user_id)
+        if not features:
+            yield NO_DATA_INSIGHT
+            return
+        digest = features_hash(features)
+        insight = await self._cached(digest)
+        if insight is not None:
+            yield insight.text
+            return
+
+        parts: List[str] = []
+        async for text in llm_client.stream(
+            prompt_messages(features), settings.insights_max_tokens
+        ):
+            parts.append(text)
+            yield text
+        await self._store(digest, "".join(parts))
+
+    async def generate_all(self, user_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        Fill the cache for many users with `insights_batch_concurrency`
+        workers pulling from one queue, so memory stays flat however many
+        users there are. Returns how many were generated, already cached,
+        or failed; one user's failure does not stop the rest.
+        """
+        # Workers take turns advancing the iterator between awaits, so the
+        # IDs are consumed lazily and each exactly once
+        queue = iter(user_ids)
+        counts = {"generated": 0, "cached": 0, "failed": 0}
+
+        async def worker():
+            for user_id in queue:
+                try:
+                    insight = await self.get_insight(user_id)
+                except Exception:
+                    logger.exception("Generating insights for %s failed", user_id)
+                    counts["failed"] += 1
+                    continue
+                counts["cached" if insight.cached else "generated"] += 1
+
+        await asyncio.gather(
+            *(worker() for _ in range(settings.insights_batch_concurrency))
+        )
+        return counts
+
+
+# Singleton instance
+insight_service = InsightService(redis_client.client)
@@ -0,0 +1,421 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Optional
+from app.config import settings
+from app.core.database import supabase
+from app.core.exceptions import ChallengeAccessError, ChallengeNotFoundError
+from app.core.jobs import enqueue_async
+from app.core.redis_client import redis_client
+from app.core.serialization import dumps, loads
+from app.models.challenge import Challenge
+from app.services.budgets import CellDelta, budget_service, period_of
+from app.services.feed import feed_service
+from app.services.friends import friend_service
+
+logger = logging.getLogger(__name__)
+
+CHALLENGES_TABLE = "challenges"
+PARTICIPANTS_TABLE = "challenge_participants"
+SNAPSHOTS_TABLE = "challenge_snapshots"
+
+ACTIVE_CHALLENGES_KEY = "challenges_active"
+
+# Net income minus spending over the challenge months; transfers between
+# the user's own accounts don't count
+SAVINGS = "savings"
+# Spending in one category; less is better
+CATEGORY_SPENDING = "category_spending"
+TRANSFER_CATEGORIES = {"TRANSFER_IN", "TRANSFER_OUT"}
+
+# A member's rank, the board size, the first neighbour's rank and the
+# neighbours with scores, read atomically.
+#
+# KEYS: leaderboard
+# ARGV: member, neighbours on each side
+_STANDING_SCRIPT = """
+local total = redis.call('ZCARD', KEYS[1])
+local rank = redis.call('ZREVRANK', KEYS[1], ARGV[1])
+if not rank then
+    return {-1, total, 0, {}}
+end
+local first = math.max(0, rank - tonumber(ARGV[2]))
+local last = rank + tonumber(ARGV[2])
+local neighbors = redis.call('ZREVRANGE', KEYS[1], first, last, 'WITHSCORES')
+return {rank, total, first, neighbors}
+"""
+
+
+def contribution(challenge: Challenge, period: str, category: str, cents: int) -> int:
+    """Score change (cents, higher ranks first) for a budget cell change"""
+    if not challenge.covers(period):
+        return 0
+    if challenge.metric == SAVINGS:
+        # Plaid amounts are positive for money out
+        return 0 if category in TRANSFER_CATEGORIES else -cents
+    if challenge.metric == CATEGORY_SPENDING:
+        return -cents if category == challenge.category else 0
+    return 0
+
+
+def display_value(challenge: Challenge, score: int) -> float:
+    """A score as the dollar amount users see (saved, or spent)"""
+    return (-score if challenge.metric == CATEGORY_SPENDING else score) / 100
+
+
+def months(start: str, end: str) -> List[str]:
+    """YYYY-MM periods from start to end, inclusive"""
+    year, month = map(int, start.split("-"))
+    periods = []
+    while f"{year:04d}-{month:02d}" <= end:
+        periods.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return periods
+
+
+@dataclass
+class LeaderboardEntry:
+    rank: int  # 1-based
+    user_id: str
+    score: int
+
+
+@dataclass
+class Standing:
+    rank: Optional[int]  # 1-based; None if not on the board
+    participants: int
+    neighbors: List[LeaderboardEntry]
+
+
+def _entries(first_rank: int, flat: List[str]) -> List[LeaderboardEntry]:
+    return [
+        LeaderboardEntry(first_rank + i + 1, flat[2 * i], round(float(flat[2 * i + 1])))
+        for i in range(len(flat) // 2)
+    ]
+
+
+class LeaderboardService:
+    """
+    Challenge leaderboards in Redis sorted sets.
+
+    Scores are integer cents, kept current by budget change hooks: every
+    change to a participant's budget totals becomes one ZINCRBY per
+    affected challenge (ZADD XX INCR, so members who left are not
+    re-added). Increments commute, so concurrent syncs cannot apply out
+    of order. Rank and neighbourhood reads are O(log n). Challenges and
+    participants live in the database; periodic snapshots record history.
+    """
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self.service_client = supabase.service_client
+        self._standing = self.redis.register_script(_STANDING_SCRIPT)
+
+    @staticmethod
+    def _board_key(challenge_id: str) -> str:
+        return f"leaderboard:{challenge_id}"
+
+    @staticmethod
+    def _challenge_key(challenge_id: str) -> str:
+        return f"challenge:{challenge_id}"
+
+    @staticmethod
+    def _user_key(user_id: str) -> str:
+        return f"user_challenges:{user_id}"
+
+    async def create_challenge(
+        self,
+        user_id: str,
+        name: str,
+        metric: str,
+        category: Optional[str],
+        start_period: str,
+        end_period: str,
+    ) -> Challenge:
+        """Create a challenge with its creator as the first participant"""
+        row = await asyncio.to_thread(
+            self._insert_challenge,
+            {
+                "name": name,
+                "metric": metric,
+                "category": category,
+                "start_period": start_period,
+                "end_period": end_period,
+                "created_by": user_id,
+            },
+        )
+        challenge = Challenge.from_row(row)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(self._challenge_key(challenge.id), dumps(challenge.to_dict()))
+            pipe.sadd(ACTIVE_CHALLENGES_KEY, challenge.id)
+            await pipe.execute()
+        await self.join(challenge.id, user_id)
+        return challenge
+
+    async def get_challenge(self, challenge_id: str) -> Challenge:
+        raw = await self.redis.get(self._challenge_key(challenge_id))
+        if raw is not None:
+            return Challenge(**loads(raw))
+
+        row = await asyncio.to_thread(self._load_challenge, challenge_id)
+        if row is None:
+            raise ChallengeNotFoundError("Challenge not found")
+        challenge = Challenge.from_row(row)
+        await self.redis.set(
+            self._challenge_key(challenge_id), dumps(challenge.to_dict())
+        )
+        return challenge
+
+    async def user_challenges(self, user_id: str) -> List[Challenge]:
+        """Challenges the user takes part in"""
+        challenge_ids = sorted(await self.redis.smembers(self._user_key(user_id)))
+        return await self._definitions(challenge_ids)
+
+    async def _definitions(self, challenge_ids: Iterable[str]) -> List[Challenge]:
+        challenge_ids = list(challenge_ids)
+        if not challenge_ids:
+            return []
+        raw = await self.redis.mget(
+            [self._challenge_key(challenge_id) for challenge_id in challenge_ids]
+        )
+        challenges = []
+        for challenge_id, value in zip(challenge_ids, raw):
+            try:
+                challenges.append(
+                    Challenge(**loads(value))
+                    if value is not None
+                    else await self.get_challenge(challenge_id)
+                )
+            except ChallengeNotFoundError:
+                logger.warning("Dropping deleted challenge %s", challenge_id)
+        return challenges
+
+    async def join(self, challenge_id: str, user_id: str) -> Standing:
+        """
+        Add a user, scored from their budget totals so far.
+
+        Only the creator's friends may join.
+        """
+        challenge = await self.get_challenge(challenge_id)
+        if user_id != challenge.created_by:
+            friends = await friend_service.friends_of(challenge.created_by)
+            if user_id not in friends:
+                raise ChallengeAccessError(
+                    "Only friends of the creator can join this challenge"
+                )
+
+        await asyncio.to_thread(self._upsert_participant, challenge_id, user_id)
+        score = await self._score_from_totals(challenge, user_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(self._board_key(challenge_id), {user_id: score})
+            pipe.sadd(self._user_key(user_id), challenge_id)
+            await pipe.execute()
+        # A budget change in flight while joining is either missing from
+        # the seed or counted twice (in the totals and as an increment);
+        # recompute once it has landed
+        await self._schedule_rebuild(user_id)
+
+        await feed_service.publish(
+            user_id,
+            "challenge_joined",
+            {"challenge_id": challenge_id, "name": challenge.name},
+        )
+        return await self.standing(challenge_id, user_id)
+
+    async def leave(self, challenge_id: str, user_id: str):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zrem(self._board_key(challenge_id), user_id)
+            pipe.srem(self._user_key(user_id), challenge_id)
+            removed, _ = await pipe.execute()
+        if not removed:
+            raise ChallengeNotFoundError("Not a participant in this challenge")
+        await asyncio.to_thread(self._delete_participant, challenge_id, user_id)
+
+    async def _score_from_totals(self, challenge: Challenge, user_id: str) -> int:
+        last = min(challenge.end_period, period_of(date.today()))
+        periods = months(challenge.start_period, last)
+        totals = await asyncio.gather(
+            *(budget_service.get_totals(user_id, period) for period in periods)
+        )
+        return sum(
+            contribution(challenge, t.period, category, cents)
+            for t in totals
+            for category, cents in t.categories.items()
+        )
+
+    async def apply_changes(self, user_id: str, changes: List[CellDelta]):
+        """Move the user's score on every challenge the changes count toward"""
+        try:
+            await self._apply_changes(user_id, changes)
+        except Exception:
+            # The budget totals are already committed, so the changes won't
+            # come again; recompute the user's scores from them instead
+            logger.exception("Leaderboard update failed for user %s", user_id)
+            await self._schedule_rebuild(user_id)
+
+    async def _apply_changes(self, user_id: str, changes: List[CellDelta]):
+        challenge_ids = await self.redis.smembers(self._user_key(user_id))
+        if not challenge_ids:
+            return
+
+        challenges = await self._definitions(challenge_ids)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for challenge in challenges:
+                delta = sum(contribution(challenge, *change) for change in changes)
+                if delta:
+                    pipe.zadd(
+                        self._board_key(challenge.id),
+                        {user_id: delta},
+                        xx=True,
+                        incr=True,
+                    )
+            await pipe.execute()
+
+    async def _schedule_rebuild(self, user_id: str):
+        # Imported here: the task module imports this one
+        from app.tasks.leaderboards import rebuild_user_scores
+
+        try:
+            await enqueue_async(
+                rebuild_user_scores,
+                user_id,
+                dedup_key=f"leaderboard_user_rebuild:{user_id}",
+                dedup_ttl=60,
+                countdown=settings.leaderboard_rebuild_delay_seconds,
+            )
+        except Exception as e:
+            logger.error("Could not queue leaderboard rebuild for %s: %s", user_id, e)
+
+    async def rebuild_user(self, user_id: str) -> int:
+        """Recompute one user's score on every challenge they are in"""
+        challenge_ids = await asyncio.to_thread(self._load_user_challenges, user_id)
+        challenges = await self._definitions(challenge_ids)
+        scores = await asyncio.gather(
+            *(self._score_from_totals(challenge, user_id) for challenge in challenges)
+        )
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for challenge, score in zip(challenges, scores):
+                pipe.zadd(self._board_key(challenge.id), {user_id: score})
+                pipe.sadd(self._user_key(user_id), challenge.id)
+            await pipe.execute()
+        return len(challenges)
+
+    async def top(
+        self, challenge_id: str, limit: Optional[int] = 10
+    ) -> List[LeaderboardEntry]:
+        """The leading participants, or all of them with limit=None"""
+        stop = -1 if limit is None else limit - 1
+        flat = await self.redis.zrevrange(
+            self._board_key(challenge_id), 0, stop, withscores=True
+        )
+        return [
+            LeaderboardEntry(i + 1, user_id, round(score))
+            for i, (user_id, score) in enumerate(flat)
+        ]
+
+    async def standing(
+        self, challenge_id: str, user_id: str, around: int = 5
+    ) -> Standing:
+        """The user's rank and the `around` participants either side"""
+        rank, total, first, flat = await self._standing(
+            keys=[self._board_key(challenge_id)], args=[user_id, around]
+        )
+        if rank < 0:
+            return Standing(rank=None, participants=total, neighbors=[])
+        return Standing(
+            rank=rank + 1, participants=total, neighbors=_entries(first, flat)
+        )
+
+    async def is_participant(self, challenge_id: str, user_id: str) -> bool:
+        score = await self.redis.zscore(self._board_key(challenge_id), user_id)
+        return score is not None
+
+    async def rebuild(self, challenge_id: str) -> int:
+        """Recompute every participant's score from their budget totals"""
+        challenge = await self.get_challenge(challenge_id)
+        participants = await asyncio.to_thread(self._load_participants, challenge_id)
+        scores = await asyncio.gather(
+            *(self._score_from_totals(challenge, user_id) for user_id in participants)
+        )
+        key = self._board_key(challenge_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            if participants:
+                pipe.zadd(key, dict(zip(participants, scores)))
+            await pipe.execute()
+        return len(participants)
+
+    async def snapshot(self, challenge_id: str) -> int:
+        """Record the current standings; returns the number of participants"""
+        entries = await self.top(challenge_id, limit=None)
+        await asyncio.to_thread(
+            self._insert_snapshot,
+            {
+                "challenge_id": challenge_id,
+                "taken_at": datetime.now(timezone.utc).isoformat(),
+                "standings": [
+                    {"rank": e.rank, "user_id": e.user_id, "score": e.score}
+                    for e in entries
+                ],
+            },
+        )
+        return len(entries)
+
+    async def active_challenge_ids(self) -> List[str]:
+        return sorted(await self.redis.smembers(ACTIVE_CHALLENGES_KEY))
+
+    async def retire(self, challenge_id: str):
+        """Stop snapshotting a finished challenge; its board stays readable"""
+        await self.redis.srem(ACTIVE_CHALLENGES_KEY, challenge_id)
+
+    def _insert_challenge(self, row: dict) -> dict:
+        table = self.service_client.table(CHALLENGES_TABLE)
+        return table.insert(row).execute().data[0]
+
+    def _load_challenge(self, challenge_id: str) -> Optional[dict]:
+        response = (
+            self.service_client.table(CHALLENGES_TABLE)
+            .select("id,name,metric,category,start_period,end_period,created_by")
+            .eq("id", challenge_id)
+            .limit(1)
+            .execute()
+        )
+        return response.data[0] if response.data else None
+
+    def _load_participants(self, challenge_id: str) -> List[str]:
+        response = (
+            self.service_client.table(PARTICIPANTS_TABLE)
+            .select("user_id")
+            .eq("challenge_id", challenge_id)
+            .execute()
+        )
+        return [row["user_id"] for row in response.data or []]
+
+    def _load_user_challenges(self, user_id: str) -> List[str]:
+        response = (
+            self.service_client.table(PARTICIPANTS_TABLE)
+            .select("challenge_id")
+            .eq("user_id", user_id)
+            .execute()
+        )
+        return [row["challenge_id"] for row in response.data or []]
+
+    def _upsert_participant(self, challenge_id: str, user_id: str):
+        self.service_client.table(PARTICIPANTS_TABLE).upsert(
+            {"challenge_id": challenge_id, "user_id": user_id},
+            on_conflict="challenge_id,user_id",
+        ).execute()
+
+    def _delete_participant(self, challenge_id: str, user_id: str):
+        self.service_client.table(PARTICIPANTS_TABLE).delete().eq(
+            "challenge_id", challenge_id
+        ).eq("user_id", user_id).execute()
+
+    def _insert_snapshot(self, row: dict):
+        self.service_client.table(SNAPSHOTS_TABLE).insert(row).execute()
+
+
+# Singleton instance
+leaderboard_service = LeaderboardService(redis_client.client)
+budget_service.change_hooks.append(leaderboard_service.apply_changes)
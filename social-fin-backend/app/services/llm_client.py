@@ -0,0 +1,107 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+import httpx
+from app.config import settings
+from app.core.exceptions import LLMError
+
+logger = logging.getLogger(__name__)
+
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+
+class LLMClient:
+    """Minimal async client for an OpenAI-compatible chat completions API"""
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url or settings.openai_base_url or OPENAI_BASE_URL
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get the HTTP client (one keep-alive pool per process)"""
+        if not self._client:
+            headers = {}
+            if settings.openai_api_key:
+                headers["Authorization"] = f"Bearer {settings.openai_api_key}"
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=httpx.Timeout(settings.openai_timeout_seconds),
+                limits=httpx.Limits(max_keepalive_connections=20),
+            )
+        return self._client
+
+    @staticmethod
+    def _body(
+        messages: List[Dict[str, str]], max_tokens: int, stream: bool
+    ) -> Dict[str, Any]:
+        return {
+            "model": settings.openai_model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": 0.2,
+            "stream": stream,
+        }
+
+    @staticmethod
+    def _error(status_code: int, body: bytes) -> LLMError:
+        try:
+            message = json.loads(body)["error"]["message"]
+        except (ValueError, KeyError, TypeError):
+            message = "Completion request failed"
+        return LLMError(message, status_code=status_code)
+
+    @staticmethod
+    def _transport_error(error: httpx.HTTPError) -> LLMError:
+        logger.warning("Completion request failed: %r", error)
+        return LLMError("Completion service unreachable")
+
+    async def complete(self, messages: List[Dict[str, str]], max_tokens: int) -> str:
+        """Get a whole completion"""
+        try:
+            response = await self.client.post(
+                "/chat/completions",
+                json=self._body(messages, max_tokens, stream=False),
+            )
+        except httpx.HTTPError as e:
+            raise self._transport_error(e) from e
+        if response.status_code != 200:
+            raise self._error(response.status_code, response.content)
+        return response.json()["choices"][0]["message"]["content"] or ""
+
+    async def stream(
+        self, messages: List[Dict[str, str]], max_tokens: int
+    ) -> AsyncIterator[str]:
+        """Yield a completion's text as the server streams it"""
+        try:
+            async with self.client.stream(
+                "POST",
+                "/chat/completions",
+                json=self._body(messages, max_tokens, stream=True),
+            ) as response:
+                if response.status_code != 200:
+                    raise self._error(response.status_code, await response.aread())
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        return
+                    choices = json.loads(data).get("choices") or [{}]
+                    text = choices[0].get("delta", {}).get("content")
+                    if text:
+                        yield text
+        except httpx.HTTPError as e:
+            # Covers connection failures and the stream breaking midway
+            raise self._transport_error(e) from e
+
+    async def close(self):
+        """Close the HTTP client"""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+
+# Singleton instance
+llm_client = LLMClient()
@@ -0,0 +1,76 @@
+import logging
+from typing import Any, Dict, Optional
+import httpx
+from app.config import settings
+from app.core.exceptions import PlaidError
+
+logger = logging.getLogger(__name__)
+
+PLAID_ENVIRONMENTS = {
+    "sandbox": "https://sandbox.plaid.com",
+    "development": "https://development.plaid.com",
+    "production": "https://production.plaid.com",
+}
+
+
+class PlaidClient:
+    """Minimal async client for the Plaid endpoints the app uses"""
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = (
+            base_url
+            or settings.plaid_base_url
+            or PLAID_ENVIRONMENTS.get(settings.plaid_env, PLAID_ENVIRONMENTS["sandbox"])
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get the HTTP client (one keep-alive pool per process)"""
+        if not self._client:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(30.0),
+                limits=httpx.Limits(max_keepalive_connections=20),
+            )
+        return self._client
+
+    async def _post(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        payload = {
+            "client_id": settings.plaid_client_id,
+            "secret": settings.plaid_secret,
+            **body,
+        }
+        response = await self.client.post(path, json=payload)
+        data = response.json()
+        if response.status_code != 200:
+            raise PlaidError(
+                data.get("error_message", "Plaid request failed"),
+                error_code=data.get("error_code", ""),
+                status_code=response.status_code,
+            )
+        return data
+
+    async def transactions_sync(
+        self, access_token: str, cursor: Optional[str], count: int = 500
+    ) -> Dict[str, Any]:
+        """Fetch one page of /transactions/sync"""
+        body: Dict[str, Any] = {"access_token": access_token, "count": count}
+        if cursor:
+            body["cursor"] = cursor
+        return await self._post("/transactions/sync", body)
+
+    async def webhook_verification_key(self, key_id: str) -> Dict[str, Any]:
+        """Fetch the JWK that signs webhooks with the given key ID"""
+        data = await self._post("/webhook_verification_key/get", {"key_id": key_id})
+        return data["key"]
+
+    async def close(self):
+        """Close the HTTP client"""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+
+# Singleton instance
+plaid_client = PlaidClient()
@@ -0,0 +1,239 @@
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+)
+from app.config import settings
+from app.core.database import supabase
+from app.core.exceptions import PlaidError
+from app.models.plaid_item import PlaidItem
+from app.models.transaction import Transaction
+from app.services.plaid_client import PlaidClient, plaid_client
+
+logger = logging.getLogger(__name__)
+
+ITEMS_TABLE = "plaid_items"
+TRANSACTIONS_TABLE = "transactions"
+
+# Plaid asks clients to restart pagination from the original cursor
+MUTATION_DURING_PAGINATION = "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION"
+
+
+@dataclass
+class SyncPage:
+    """One /transactions/sync page, converted to app models"""
+
+    added: List[Transaction]
+    modified: List[Transaction]
+    removed: List[str]
+    next_cursor: str
+
+
+@dataclass
+class SyncResult:
+    """Counts for one item's sync run"""
+
+    item_id: str
+    added: int = 0
+    modified: int = 0
+    removed: int = 0
+    pages: int = 0
+    cursor: Optional[str] = None
+    error: Optional[str] = None
+
+
+# Called for every page, either before it is stored (processors, which may
+# rewrite its transactions) or after (hooks: budgets, search, ...)
+PageHook = Callable[[PlaidItem, SyncPage], Awaitable[None]]
+
+
+@dataclass
+class TransactionSyncEngine:
+    """
+    Cursor-based incremental transaction sync.
+
+    Pages are processed as they arrive and then dropped, so memory stays
+    flat however much history an item has. Upserts are idempotent; the
+    item's cursor is saved only once a run reaches the end, so a crash or
+    a pagination restart simply replays pages.
+    """
+
+    client: PlaidClient = plaid_client
+    page_size: int = settings.plaid_sync_page_size
+    chunk_size: int = settings.plaid_sync_upsert_chunk_size
+    concurrency: int = settings.plaid_sync_concurrency
+    per_institution_limit: int = settings.plaid_sync_per_institution_limit
+    page_processors: List[PageHook] = field(default_factory=list)
+    page_hooks: List[PageHook] = field(default_factory=list)
+
+    async def iter_pages(self, item: PlaidItem) -> AsyncIterator[SyncPage]:
+        """Stream sync pages for an item from its stored cursor"""
+        cursor = item.cursor
+        has_more = True
+        restarts = 0
+        while has_more:
+            try:
+                data = await self.client.transactions_sync(
+                    item.access_token, cursor, self.page_size
+                )
+            except PlaidError as e:
+                if e.error_code == MUTATION_DURING_PAGINATION and restarts < 3:
+                    logger.info("Restarting sync for item %s", item.id)
+                    cursor, restarts = item.cursor, restarts + 1
+                    continue
+                raise
+
+            yield SyncPage(
+                added=[
+                    Transaction.from_plaid(txn, item.user_id, item.id)
+                    for txn in data.get("added", [])
+                ],
+                modified=[
+                    Transaction.from_plaid(txn, item.user_id, item.id)
+                    for txn in data.get("modified", [])
+                ],
+                removed=[
+                    txn["transaction_id"] for txn in data.get("removed", [])
+                ],
+                next_cursor=data["next_cursor"],
+            )
+            cursor = data["next_cursor"]
+            has_more = data.get("has_more", False)
+
+    async def sync_item(self, item: PlaidItem) -> SyncResult:
+        """Sync one item to the end of its transaction feed"""
+        result = SyncResult(item_id=item.id)
+        async for page in self.iter_pages(item):
+            for process in self.page_processors:
+                await process(item, page)
+            await self._store_page(page)
+            for hook in self.page_hooks:
+                await hook(item, page)
+
+            result.pages += 1
+            result.added += len(page.added)
+            result.modified += len(page.modified)
+            result.removed += len(page.removed)
+            result.cursor = page.next_cursor
+
+        if result.cursor and result.cursor != item.cursor:
+            await asyncio.to_thread(self._save_cursor, item.id, result.cursor)
+            item.cursor = result.cursor
+        return result
+
+    async def sync_items(self, items: Sequence[PlaidItem]) -> List[SyncResult]:
+        """Sync many items concurrently, bounded overall and per institution"""
+        overall = asyncio.Semaphore(self.concurrency)
+        institution_limits: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(self.per_institution_limit)
+        )
+
+        async def run(item: PlaidItem) -> SyncResult:
+            institution = institution_limits[item.institution_id or "unknown"]
+            async with overall, institution:
+                try:
+                    return await self.sync_item(item)
+                except Exception as e:
+                    logger.error("Sync failed for item %s: %s", item.id, str(e))
+                    return SyncResult(item_id=item.id, error=str(e))
+
+        return list(await asyncio.gather(*[run(item) for item in items]))
+
+    async def sync_user(self, user_id: str) -> List[SyncResult]:
+        """Sync every item linked by a user"""
+        return await self.sync_items(await asyncio.to_thread(self._load_items, user_id))
+
+    async def _store_page(self, page: SyncPage):
+        rows = [txn.to_row() for txn in (*page.added, *page.modified)]
+        for start in range(0, len(rows), self.chunk_size):
+            await asyncio.to_thread(self._upsert, rows[start : start + self.chunk_size])
+        for start in range(0, len(page.removed), self.chunk_size):
+            await asyncio.to_thread(
+                self._delete, page.removed[start : start + self.chunk_size]
+            )
+
+    @staticmethod
+    def _upsert(rows: List[dict]):
+        supabase.service_client.table(TRANSACTIONS_TABLE).upsert(
+            rows, on_conflict="id"
+        ).execute()
+
+    @staticmethod
+    def _delete(transaction_ids: List[str]):
+        supabase.service_client.table(TRANSACTIONS_TABLE).delete().in_(
+            "id", transaction_ids
+        ).execute()
+
+    @staticmethod
+    def _save_cursor(item_id: str, cursor: str):
+        supabase.service_client.table(ITEMS_TABLE).update({"cursor": cursor}).eq(
+            "id", item_id
+        ).execute()
+
+    @staticmethod
+    def set_item_error(item_id: str, error_code: Optional[str]):
+        """Record (or clear) the error that needs user action on an item"""
+        supabase.service_client.table(ITEMS_TABLE).update(
+            {"error_code": error_code}
+        ).eq("id", item_id).execute()
+
+    @staticmethod
+    def _load_items(user_id: str) -> List[PlaidItem]:
+        response = (
+            supabase.service_client.table(ITEMS_TABLE)
+            .select("id,user_id,access_token,institution_id,cursor")
+            .eq("user_id", user_id)
+            .execute()
+        )
+        return [PlaidItem.from_row(row) for row in response.data or []]
+
+    @staticmethod
+    def linked_user_ids() -> List[str]:
+        """Users with at least one linked item"""
+        response = supabase.service_client.table(ITEMS_TABLE).select("user_id").execute()
+        return sorted({row["user_id"] for row in response.data or []})
+
+    @staticmethod
+    def iter_user_rows(
+        user_id: str, columns: str, page_size: int = 1000
+    ) -> Iterator[dict]:
+        """Stream a user's stored transactions with keyset pagination by ID"""
+        last_id: Optional[str] = None
+        while True:
+            query = (
+                supabase.service_client.table(TRANSACTIONS_TABLE)
+                .select(columns if "id" in columns.split(",") else f"id,{columns}")
+                .eq("user_id", user_id)
+            )
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            rows = query.order("id").limit(page_size).execute().data or []
+            yield from rows
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]["id"]
+
+    @staticmethod
+    def load_item(item_id: str) -> Optional[PlaidItem]:
+        """Load one item by its Plaid item ID"""
+        response = (
+            supabase.service_client.table(ITEMS_TABLE)
+            .select("id,user_id,access_token,institution_id,cursor")
+            .eq("id", item_id)
+            .limit(1)
+            .execute()
+        )
+        return PlaidItem.from_row(response.data[0]) if response.data else None
+
+
+# Shared engine; ingest consumers register page processors and hooks on it
+sync_engine = TransactionSyncEngine()
@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import time
+from typing import Any, Dict, Optional
+from jose import JWTError, jwt
+from app.config import settings
+from app.core.exceptions import PlaidError, WebhookVerificationError
+from app.core.jobs import enqueue_async, queue_depth
+from app.core.metrics import metrics
+from app.core.redis_client import redis_client
+from app.core.serialization import dumps
+from app.services.plaid_client import PlaidClient, plaid_client
+from app.tasks.plaid import process_plaid_webhook, queue_item_sync
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_STREAM = "plaid:webhooks"
+
+# Transaction webhooks that all mean "run /transactions/sync for this item"
+SYNC_WEBHOOK_CODES = {
+    "SYNC_UPDATES_AVAILABLE",
+    "INITIAL_UPDATE",
+    "HISTORICAL_UPDATE",
+    "DEFAULT_UPDATE",
+    "TRANSACTIONS_REMOVED",
+}
+
+
+class PlaidWebhookVerifier:
+    """
+    Checks the `Plaid-Verification` JWT on inbound webhooks.
+
+    The token is ES256-signed with a key Plaid publishes by key ID; keys
+    are fetched once and cached. The token must be recent and carry the
+    SHA-256 of the exact request body.
+    """
+
+    def __init__(self, client: PlaidClient = plaid_client):
+        self.client = client
+        self._keys: Dict[str, Dict[str, Any]] = {}
+
+    async def verify(self, body: bytes, token: Optional[str]):
+        if not token:
+            raise WebhookVerificationError("Missing Plaid-Verification header")
+
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise WebhookVerificationError("Malformed verification token") from e
+        if header.get("alg") != "ES256" or not header.get("kid"):
+            raise WebhookVerificationError("Unexpected verification token header")
+
+        key = await self._key(header["kid"])
+        try:
+            claims = jwt.decode(token, key, algorithms=["ES256"])
+        except JWTError as e:
+            raise WebhookVerificationError("Invalid webhook signature") from e
+
+        if time.time() - claims.get("iat", 0) > settings.plaid_webhook_max_age_seconds:
+            raise WebhookVerificationError("Webhook is too old")
+
+        digest = hashlib.sha256(body).hexdigest()
+        if not hmac.compare_digest(digest, str(claims.get("request_body_sha256", ""))):
+            raise WebhookVerificationError("Webhook body does not match signature")
+
+    async def _key(self, key_id: str) -> Dict[str, Any]:
+        key = self._keys.get(key_id)
+        if key is None:
+            try:
+                key = await self.client.webhook_verification_key(key_id)
+            except PlaidError as e:
+                raise WebhookVerificationError("Unknown verification key") from e
+            if key.get("expired_at"):
+                raise WebhookVerificationError("Verification key has expired")
+            self._keys[key_id] = key
+        return key
+
+
+class PlaidWebhookIntake:
+    """
+    Accepts webhooks quickly and leaves the work to the job queue.
+
+    Every event is appended to a capped Redis stream before it is
+    acknowledged, so nothing Plaid delivered is lost. Sync webhooks are
+    coalesced per item: while a sync job is queued, further updates for
+    that item are absorbed by it. The worker clears the flag as it
+    starts, so updates that arrive mid-run queue exactly one more sync.
+    Other webhooks are deduplicated by item and code, which also absorbs
+    Plaid's redeliveries.
+    """
+
+    def __init__(self, redis_client, stream: str = WEBHOOK_STREAM):
+        self.redis = redis_client
+        self.stream = stream
+
+    async def accept(self, webhook: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist a verified webhook and queue its processing"""
+        event_id = await self.redis.xadd(
+            self.stream,
+            {"payload": dumps(webhook)},
+            maxlen=settings.plaid_webhook_stream_maxlen,
+            approximate=True,
+        )
+        metrics.increment("plaid_webhooks_received")
+
+        queued = await self._dispatch(event_id, webhook)
+        if not queued:
+            metrics.increment("plaid_webhooks_coalesced")
+        return {"event_id": event_id, "queued": queued}
+
+    async def _dispatch(self, event_id: str, webhook: Dict[str, Any]) -> bool:
+        item_id = webhook.get("item_id")
+        webhook_type = webhook.get("webhook_type")
+        webhook_code = webhook.get("webhook_code")
+        if not item_id:
+            logger.info("Stored %s/%s webhook without item", webhook_type, webhook_code)
+            return False
+
+        if webhook_type == "TRANSACTIONS" and webhook_code in SYNC_WEBHOOK_CODES:
+            return await asyncio.to_thread(queue_item_sync, item_id)
+
+        return await enqueue_async(
+            process_plaid_webhook,
+            event_id,
+            webhook,
+            dedup_key=f"plaid_webhook:{item_id}:{webhook_type}:{webhook_code}",
+            dedup_ttl=settings.plaid_webhook_dedup_seconds,
+        )
+
+    async def stream_length(self) -> int:
+        return await self.redis.xlen(self.stream)
+
+
+# Singleton instances
+webhook_verifier = PlaidWebhookVerifier()
+webhook_intake = PlaidWebhookIntake(redis_client.client)
+metrics.gauge("plaid_webhook_stream_length", webhook_intake.stream_length)
+metrics.gauge("job_queue_depth", queue_depth)
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Sequence
+from app.core.cache import principal_cache, profile_cache
+from app.core.database import supabase
+from app.core.exceptions import UserNotFoundError
+from app.core.invalidation import InvalidationEvent, invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TABLE = "user_profiles"
+PROFILE_COLUMNS = ("id", "email", "first_name", "last_name", "phone", "updated_at")
+UPDATABLE_COLUMNS = ("first_name", "last_name", "phone")
+
+# Columns get_current_user needs to build a principal
+PRINCIPAL_COLUMNS = ("first_name", "last_name", "phone", "updated_at")
+
+# Striped locks serialize cache fills and writes for the same user
+_LOCK_STRIPES = 64
+
+
+class ProfileService:
+    def __init__(self):
+        self.service_client = supabase.service_client
+        self._locks = [asyncio.Lock() for _ in range(_LOCK_STRIPES)]
+
+    def _lock(self, user_id: str) -> asyncio.Lock:
+        return self._locks[hash(user_id) % _LOCK_STRIPES]
+
+    async def get_profile(
+        self, user_id: str, fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get a user's profile, limited to the requested columns.
+
+        Columns already cached are served from memory; only the missing
+        ones are selected from the database and merged into the cache.
+        """
+        wanted = list(fields or PROFILE_COLUMNS)
+        cached = profile_cache.get(user_id) or {}
+        missing = [column for column in wanted if column not in cached]
+        if not missing:
+            return {column: cached[column] for column in wanted}
+
+        async with self._lock(user_id):
+            # Another request may have filled the cache while we waited
+            cached = profile_cache.get(user_id) or {}
+            missing = [column for column in wanted if column not in cached]
+            if missing:
+                cache_version = profile_cache.version
+                response = (
+                    self.service_client.table(PROFILE_TABLE)
+                    .select(",".join(["id", *missing]))
+                    .eq("id", user_id)
+                    .limit(1)
+                    .execute()
+                )
+                if not response.data:
+                    raise UserNotFoundError("Profile not found")
+
+                cached = {**cached, **response.data[0]}
+                profile_cache.set(user_id, cached, version=cache_version)
+
+        return {column: cached.get(column) for column in wanted}
+
+    async def update_profile(
+        self, user_id: str, changes: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Apply a partial update in one round trip and write the stored row
+        through to the profile cache
+        """
+        data = {
+            column: value
+            for column, value in changes.items()
+            if column in UPDATABLE_COLUMNS
+        }
+        data["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+        async with self._lock(user_id):
+            response = (
+                self.service_client.table(PROFILE_TABLE)
+                .update(data)
+                .eq("id", user_id)
+                .execute()
+            )
+            if not response.data:
+                raise UserNotFoundError("Profile not found")
+
+            profile = {
+                column: response.data[0].get(column) for column in PROFILE_COLUMNS
+            }
+            profile_cache.set(user_id, profile)
+            principal_cache.delete(user_id)
+
+        # Other workers evict; this one already holds the new row
+        invalidation_bus.publish(InvalidationEvent.PROFILE_CHANGED, user_id, local=False)
+
+        return profile
+
+    def invalidate(self, user_id: str):
+        """Drop cached profile and principal state for a user on every worker"""
+        invalidation_bus.publish(InvalidationEvent.USER_UPDATED, user_id)
+
+
+# Shared instance so every caller sees the same locks
+profile_service = ProfileService()
@@ -0,0 +1,41 @@
+from typing import List
+from app.core.push import push_hub
+from app.models.activity import Activity
+from app.models.plaid_item import PlaidItem
+from app.services.budgets import CellDelta, budget_service
+from app.services.feed import feed_service
+from app.services.plaid_sync import SyncPage, sync_engine
+
+# Push messages for changes clients would otherwise poll for. They are
+# hints to refetch (a budget period, an item, the feed), so coalescing a
+# burst down to its latest message loses nothing. Importing this module
+# registers the hooks, in the API and in the sync worker alike.
+
+
+async def push_budget_changes(user_id: str, changes: List[CellDelta]):
+    for period in sorted({period for period, _, _ in changes}):
+        await push_hub.publish([user_id], "budget", {"period": period}, key=period)
+
+
+async def push_synced_transactions(item: PlaidItem, page: SyncPage):
+    if page.added or page.modified or page.removed:
+        await push_hub.publish(
+            [item.user_id], "transactions", {"item_id": item.id}, key=item.id
+        )
+
+
+async def push_feed_activity(activity: Activity, audience: List[str]):
+    await push_hub.publish(
+        audience,
+        "feed",
+        {
+            "activity_id": activity.id,
+            "actor_id": activity.actor_id,
+            "type": activity.type,
+        },
+    )
+
+
+budget_service.change_hooks.append(push_budget_changes)
+sync_engine.page_hooks.append(push_synced_transactions)
+feed_service.delivery_hooks.append(push_feed_activity)
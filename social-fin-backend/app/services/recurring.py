@@ -0,0 +1,389 @@
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import redis.asyncio as redis
+from app.config import settings
+from app.core.redis_client import redis_client
+from app.core.serialization import dumps, loads
+from app.models.plaid_item import PlaidItem
+from app.models.transaction import Transaction
+from app.services.budgets import NON_SPENDING_CATEGORIES
+from app.services.categorization import normalize_merchant
+from app.services.plaid_sync import SyncPage, sync_engine
+
+logger = logging.getLogger(__name__)
+
+# (name, shortest gap, longest gap) in days, sorted and non-overlapping
+CADENCES: Tuple[Tuple[str, int, int], ...] = (
+    ("weekly", 5, 9),
+    ("biweekly", 12, 16),
+    ("monthly", 27, 33),
+    ("quarterly", 85, 97),
+    ("yearly", 355, 375),
+)
+_CADENCE_NAMES = [name for name, _, _ in CADENCES]
+_CADENCE_LOW = np.array([low for _, low, _ in CADENCES])
+_CADENCE_HIGH = np.array([high for _, _, high in CADENCES])
+_YEARLY = _CADENCE_NAMES.index("yearly")
+
+# Only the most recent charges per merchant are judged, so price changes
+# and cancelled-then-renewed subscriptions settle quickly
+WINDOW = 12
+MIN_OCCURRENCES = 3
+MIN_REGULARITY = 0.75
+MIN_AMOUNT_STABILITY = 0.75
+AMOUNT_TOLERANCE = 0.15
+MIN_AMOUNT_TOLERANCE_CENTS = 100
+
+RECURRING_COLUMNS = "id,amount,date,category,merchant_name,name"
+
+# One stored occurrence: (transaction ID, date ordinal, cents)
+Charge = Tuple[str, int, int]
+
+
+@dataclass
+class RecurringCharge:
+    """A merchant that charges on a regular cadence for a stable amount"""
+
+    merchant: str
+    cadence: str
+    interval_days: float
+    occurrences: int
+    average_amount: float
+    last_amount: float
+    last_date: date
+    next_date: date
+    regularity: float
+    amount_stability: float
+
+    @property
+    def active(self) -> bool:
+        """Whether the next charge is not yet overdue"""
+        grace = max(3.0, self.interval_days * 0.5)
+        return date.today().toordinal() <= self.next_date.toordinal() + grace
+
+
+def _cadence_of(gaps: np.ndarray) -> np.ndarray:
+    """Cadence index for every gap, or -1 when it fits none"""
+    index = np.searchsorted(_CADENCE_LOW, gaps, side="right") - 1
+    fits = (index >= 0) & (gaps <= _CADENCE_HIGH[np.maximum(index, 0)])
+    return np.where(fits, index, -1)
+
+
+def detect_recurring(
+    keys: np.ndarray,
+    days: np.ndarray,
+    amounts: np.ndarray,
+    labels: Sequence[str],
+    window: int = WINDOW,
+) -> List[RecurringCharge]:
+    """
+    Find recurring charges among outflows grouped by merchant key.
+
+    `keys` index into `labels`; `days` are date ordinals and `amounts`
+    positive cents. Each merchant's latest `window` charges are tested
+    at once: the gaps between consecutive charges must mostly fall in one
+    cadence band, and the amounts mostly within a tolerance of their
+    median.
+    """
+    groups = len(labels)
+    if not len(keys) or not groups:
+        return []
+
+    order = np.lexsort((days, keys))
+    keys, days, amounts = keys[order], days[order], amounts[order]
+
+    # Keep each merchant's most recent charges
+    counts = np.bincount(keys, minlength=groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    from_end = counts[keys] - 1 - (np.arange(len(keys)) - starts[keys])
+    recent = from_end < window
+    keys, days, amounts = keys[recent], days[recent], amounts[recent]
+    counts = np.bincount(keys, minlength=groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    last = starts + counts - 1
+
+    # Interval regularity: share of gaps in the most common cadence band
+    same = keys[1:] == keys[:-1]
+    gap_keys = keys[1:][same]
+    gaps = np.diff(days)[same]
+    cadence = _cadence_of(gaps)
+    fits = cadence >= 0
+    per_cadence = np.bincount(
+        gap_keys[fits] * len(CADENCES) + cadence[fits],
+        minlength=groups * len(CADENCES),
+    ).reshape(groups, len(CADENCES))
+    best = per_cadence.argmax(axis=1)
+    best_hits = per_cadence.max(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        regularity = best_hits / np.maximum(counts - 1, 1)
+        on_cadence = fits & (cadence == best[gap_keys])
+        interval = np.bincount(
+            gap_keys[on_cadence], weights=gaps[on_cadence], minlength=groups
+        ) / np.maximum(best_hits, 1)
+
+    # Amount stability: share of charges near the merchant's median amount
+    by_amount = amounts[np.lexsort((amounts, keys))]
+    median = np.zeros(groups)
+    median[present] = (
+        by_amount[starts[present] + (counts[present] - 1) // 2]
+        + by_amount[starts[present] + counts[present] // 2]
+    ) / 2
+    tolerance = np.maximum(median * AMOUNT_TOLERANCE, MIN_AMOUNT_TOLERANCE_CENTS)
+    near = np.abs(amounts - median[keys]) <= tolerance[keys]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stability = np.bincount(keys, weights=near, minlength=groups) / counts
+        average = np.bincount(keys, weights=amounts, minlength=groups) / counts
+
+    required = np.where(best == _YEARLY, 2, MIN_OCCURRENCES)
+    recurring = (
+        present
+        & (counts >= required)
+        & (best_hits > 0)
+        & (regularity >= MIN_REGULARITY)
+        & (stability >= MIN_AMOUNT_STABILITY)
+    )
+
+    results = []
+    for group in np.flatnonzero(recurring).tolist():
+        last_day = int(days[last[group]])
+        results.append(
+            RecurringCharge(
+                merchant=labels[group],
+                cadence=_CADENCE_NAMES[best[group]],
+                interval_days=round(float(interval[group]), 1),
+                occurrences=int(counts[group]),
+                average_amount=round(float(average[group]) / 100, 2),
+                last_amount=round(float(amounts[last[group]]) / 100, 2),
+                last_date=date.fromordinal(last_day),
+                next_date=date.fromordinal(last_day + int(round(interval[group]))),
+                regularity=round(float(regularity[group]), 2),
+                amount_stability=round(float(stability[group]), 2),
+            )
+        )
+    return results
+
+
+def merge_charges(
+    windows: Dict[str, dict],
+    upserts: Iterable[Tuple[str, str, Charge]],
+    removed: Iterable[str] = (),
+    window: int = WINDOW,
+) -> List[str]:
+    """
+    Fold new charges into per-merchant windows in place.
+
+    `windows` maps a merchant key to {"label", "charges"}; `upserts` are
+    (merchant key, label, charge). A transaction ID appears in at most
+    one window, so modifications that change merchant, amount or date
+    move it. Returns the merchant keys whose windows changed.
+    """
+    upserts = list(upserts)
+    gone = set(removed) | {charge[0] for _, _, charge in upserts}
+    touched = set()
+    if gone:
+        for key, state in windows.items():
+            kept = [charge for charge in state["charges"] if charge[0] not in gone]
+            if len(kept) != len(state["charges"]):
+                state["charges"] = kept
+                touched.add(key)
+
+    for key, label, charge in upserts:
+        state = windows.setdefault(key, {"label": label, "charges": []})
+        state["charges"].append(list(charge))
+        touched.add(key)
+
+    for key in touched:
+        charges = sorted(windows[key]["charges"], key=lambda charge: charge[1])
+        windows[key]["charges"] = charges[-window:]
+    return sorted(touched)
+
+
+def detect_in_windows(
+    windows: Dict[str, dict], keys: Sequence[str]
+) -> Dict[str, Optional[RecurringCharge]]:
+    """Run the detector over the given merchants' windows in one pass"""
+    codes: List[int] = []
+    days: List[int] = []
+    cents: List[int] = []
+    for code, key in enumerate(keys):
+        for _, day, amount in windows[key]["charges"]:
+            codes.append(code)
+            days.append(day)
+            cents.append(amount)
+
+    found = detect_recurring(
+        np.asarray(codes, dtype=np.int64),
+        np.asarray(days, dtype=np.int64),
+        np.asarray(cents, dtype=np.int64),
+        list(keys),
+    )
+    results: Dict[str, Optional[RecurringCharge]] = {key: None for key in keys}
+    for charge in found:
+        # Labels were the keys; report the merchant's display name
+        key = charge.merchant
+        charge.merchant = windows[key]["label"]
+        results[key] = charge
+    return results
+
+
+def _charge(
+    txn_id: str, amount: float, day: date, category: Optional[str], label: str
+) -> Optional[Tuple[str, str, Charge]]:
+    """(merchant key, label, charge) for outflows that could recur"""
+    if amount <= 0 or category in NON_SPENDING_CATEGORIES:
+        return None
+    key = normalize_merchant(label)
+    if not key:
+        return None
+    return key, label, (txn_id, day.toordinal(), round(amount * 100))
+
+
+def _charge_of(txn: Transaction) -> Optional[Tuple[str, str, Charge]]:
+    return _charge(
+        txn.id, txn.amount, txn.date, txn.category, txn.merchant_name or txn.name
+    )
+
+
+class RecurringDetector:
+    """
+    Per-user recurring charges, maintained incrementally on ingest.
+
+    Redis holds each merchant's latest charges (a bounded window) and the
+    current detections. A sync page only reloads and re-tests the
+    merchants it touches, so cost follows the page, not the history.
+    rebuild() derives both from the full transaction history.
+    """
+
+    def __init__(self, redis_client, window: int = WINDOW):
+        self.redis = redis_client
+        self.window = window
+
+    @staticmethod
+    def _windows_key(user_id: str) -> str:
+        return f"recurring_windows:{{{user_id}}}"
+
+    @staticmethod
+    def _hits_key(user_id: str) -> str:
+        return f"recurring_hits:{{{user_id}}}"
+
+    async def apply(
+        self,
+        user_id: str,
+        added: Iterable[Transaction] = (),
+        modified: Iterable[Transaction] = (),
+        removed: Iterable[str] = (),
+    ) -> int:
+        """Fold a page of changes in; returns how many merchants were re-tested"""
+        added, modified, removed = list(added), list(modified), list(removed)
+        modified_ids = {txn.id for txn in modified}
+        charges = []
+        for txn in [*added, *modified]:
+            charge = _charge_of(txn)
+            if charge is not None:
+                charges.append(charge)
+            elif txn.id in modified_ids:
+                # No longer a candidate; drop it from whichever window has it
+                removed.append(txn.id)
+        if not charges and not removed:
+            return 0
+
+        # A modified or removed ID could sit in any merchant's window
+        load_all = bool(modified or removed)
+        windows_key = self._windows_key(user_id)
+        for _ in range(5):
+            async with self.redis.pipeline(transaction=True) as pipe:
+                try:
+                    await pipe.watch(windows_key)
+                    if load_all:
+                        raw = await pipe.hgetall(windows_key)
+                    else:
+                        keys = sorted({key for key, _, _ in charges})
+                        raw = dict(zip(keys, await pipe.hmget(windows_key, keys)))
+                    windows = {key: loads(value) for key, value in raw.items() if value}
+
+                    touched = merge_charges(windows, charges, removed, self.window)
+                    if not touched:
+                        return 0
+                    results = detect_in_windows(windows, touched)
+
+                    pipe.multi()
+                    self._write(pipe, user_id, windows, touched, results)
+                    await pipe.execute()
+                    return len(touched)
+                except redis.WatchError:
+                    # Another item of this user synced concurrently; retry
+                    continue
+        raise RuntimeError(f"Recurring state for user {user_id} kept changing")
+
+    def _write(self, pipe, user_id, windows, touched, results):
+        windows_key, hits_key = self._windows_key(user_id), self._hits_key(user_id)
+        for key in touched:
+            if windows[key]["charges"]:
+                pipe.hset(windows_key, key, dumps(windows[key]))
+            else:
+                pipe.hdel(windows_key, key)
+            if results.get(key):
+                pipe.hset(hits_key, key, dumps(asdict(results[key])))
+            else:
+                pipe.hdel(hits_key, key)
+
+    async def get(self, user_id: str) -> List[RecurringCharge]:
+        """Current detections, soonest next charge first"""
+        raw = await self.redis.hvals(self._hits_key(user_id))
+        charges = []
+        for value in raw:
+            data = loads(value)
+            data["last_date"] = date.fromisoformat(data["last_date"])
+            data["next_date"] = date.fromisoformat(data["next_date"])
+            charges.append(RecurringCharge(**data))
+        return sorted(charges, key=lambda charge: charge.next_date)
+
+    async def rebuild(self, user_id: str) -> int:
+        """Recompute windows and detections from the full history"""
+        windows = await asyncio.to_thread(self._windows_from_history, user_id)
+        results = detect_in_windows(windows, sorted(windows))
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._windows_key(user_id), self._hits_key(user_id))
+            self._write(pipe, user_id, windows, sorted(windows), results)
+            await pipe.execute()
+        return sum(1 for charge in results.values() if charge)
+
+    def _windows_from_history(self, user_id: str) -> Dict[str, dict]:
+        """Stream the history, trimming windows as it goes to bound memory"""
+        windows: Dict[str, dict] = {}
+        pending = []
+        for row in sync_engine.iter_user_rows(
+            user_id, RECURRING_COLUMNS, settings.transactions_read_page_size
+        ):
+            charge = _charge(
+                row["id"],
+                float(row["amount"]),
+                date.fromisoformat(row["date"]),
+                row.get("category"),
+                row.get("merchant_name") or row.get("name") or "",
+            )
+            if charge is not None:
+                pending.append(charge)
+            if len(pending) >= 10000:
+                merge_charges(windows, pending, window=self.window)
+                pending = []
+        merge_charges(windows, pending, window=self.window)
+        return windows
+
+
+async def _apply_sync_page(item: PlaidItem, page: SyncPage):
+    """Re-test the merchants a sync page touched"""
+    await recurring_detector.apply(
+        item.user_id, page.added, page.modified, page.removed
+    )
+
+
+# Singleton instance
+recurring_detector = RecurringDetector(redis_client.client)
+sync_engine.page_hooks.append(_apply_sync_page)
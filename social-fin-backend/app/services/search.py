@@ -0,0 +1,521 @@
+import asyncio
+import bisect
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from app.config import settings
+from app.core.database import supabase
+from app.core.invalidation import invalidation_bus
+from app.core.redis_client import redis_client
+from app.core.serialization import dumps, loads
+from app.models.plaid_item import PlaidItem
+from app.models.transaction import Transaction
+from app.services.plaid_sync import TRANSACTIONS_TABLE, SyncPage, sync_engine
+
+logger = logging.getLogger(__name__)
+
+INDEX_COLUMNS = "id,amount,date,name,merchant_name,category"
+RESULT_COLUMNS = "id,amount,date,name,merchant_name,category,pending,account_id"
+
+# Letters and digits; underscores split too, so FOOD_AND_DRINK is three terms
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+# Appends one page of changes to a user's change stream with the next
+# sequence number, atomically, so readers can tell a gap from a quiet spell.
+# The counter never expires: restarting it would look like old entries to
+# readers that are ahead of it.
+#
+# KEYS: stream, sequence counter
+# ARGV: max stream length, TTL seconds, changes (JSON)
+_APPEND_SCRIPT = """
+local seq = redis.call('INCR', KEYS[2])
+redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*',
+    'seq', seq, 'changes', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return seq
+"""
+
+
+def tokenize(*texts: Optional[str]) -> Set[str]:
+    """Lowercased word terms of the given texts"""
+    terms: Set[str] = set()
+    for text in texts:
+        if text:
+            terms.update(TOKEN_PATTERN.findall(text.lower()))
+    return terms
+
+
+@dataclass
+class SearchDoc:
+    """The indexed view of one transaction"""
+
+    id: str
+    amount_cents: int
+    day: int  # date ordinal
+    terms: Set[str]
+
+    @classmethod
+    def from_values(
+        cls,
+        txn_id: str,
+        amount: Any,
+        day: Any,
+        name: Optional[str],
+        merchant_name: Optional[str],
+        category: Optional[str],
+    ) -> "SearchDoc":
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        return cls(
+            id=txn_id,
+            amount_cents=round(float(amount) * 100),
+            day=day.toordinal(),
+            terms=tokenize(merchant_name, name, category),
+        )
+
+    @classmethod
+    def from_row(cls, row: dict) -> "SearchDoc":
+        return cls.from_values(
+            row["id"],
+            row["amount"],
+            row["date"],
+            row.get("name"),
+            row.get("merchant_name"),
+            row.get("category"),
+        )
+
+
+def _change_row(txn: Transaction) -> list:
+    return [
+        txn.id,
+        txn.amount,
+        txn.date.isoformat(),
+        txn.name,
+        txn.merchant_name,
+        txn.category,
+    ]
+
+
+def _stream_position(entry_id: str) -> Tuple[int, int]:
+    milliseconds, _, sequence = entry_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+def _encode(docs: np.ndarray) -> np.ndarray:
+    """Delta-encode ascending doc numbers in the narrowest unsigned dtype"""
+    deltas = np.diff(docs, prepend=0)
+    widest = int(deltas.max()) if len(deltas) else 0
+    if widest < 1 << 8:
+        return deltas.astype(np.uint8)
+    if widest < 1 << 16:
+        return deltas.astype(np.uint16)
+    return deltas.astype(np.uint32)
+
+
+class Postings:
+    """
+    Ascending doc numbers for one term: delta-encoded NumPy array plus a
+    short tail of plain ints appended since it was last packed
+    """
+
+    __slots__ = ("deltas", "tail", "last")
+
+    def __init__(self, docs: np.ndarray):
+        self.deltas = _encode(docs)
+        self.tail: List[int] = []
+        self.last = int(docs[-1]) if len(docs) else -1
+
+    def append(self, doc: int):
+        # Doc numbers only grow, so appending keeps the list sorted
+        self.tail.append(doc)
+        self.last = doc
+        if len(self.tail) >= settings.search_postings_tail:
+            self.deltas = _encode(self.docs())
+            self.tail = []
+
+    def docs(self) -> np.ndarray:
+        packed = np.cumsum(self.deltas, dtype=np.int64)
+        if not self.tail:
+            return packed
+        return np.concatenate((packed, np.asarray(self.tail, dtype=np.int64)))
+
+    @property
+    def nbytes(self) -> int:
+        return self.deltas.nbytes + 8 * len(self.tail) + 64
+
+
+class TransactionIndex:
+    """
+    One user's inverted index over merchant names, descriptions and
+    categories, with amount and date columns for range filters.
+
+    Docs are numbered in insertion order. An update tombstones the old
+    doc and appends a new one, so postings stay append-only; compact()
+    renumbers the live docs once tombstones pile up.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.doc_of: Dict[str, int] = {}
+        self.amount = np.zeros(0, dtype=np.int64)
+        self.day = np.zeros(0, dtype=np.int32)
+        self.live = np.zeros(0, dtype=bool)
+        self.postings: Dict[str, Postings] = {}
+        self.dead = 0
+        self._terms: Optional[List[str]] = None
+        # Position in the user's change stream
+        self.seq = 0
+        self.stream_id = "0-0"
+
+    @classmethod
+    def build(cls, docs: Iterable[SearchDoc]) -> "TransactionIndex":
+        index = cls()
+        amounts: List[int] = []
+        days: List[int] = []
+        postings: Dict[str, List[int]] = {}
+        for doc in docs:
+            if doc.id in index.doc_of:
+                continue
+            number = len(index.ids)
+            index.ids.append(doc.id)
+            index.doc_of[doc.id] = number
+            amounts.append(doc.amount_cents)
+            days.append(doc.day)
+            for term in doc.terms:
+                postings.setdefault(term, []).append(number)
+        index.amount = np.asarray(amounts, dtype=np.int64)
+        index.day = np.asarray(days, dtype=np.int32)
+        index.live = np.ones(len(index.ids), dtype=bool)
+        index.postings = {
+            term: Postings(np.asarray(docs, dtype=np.int64))
+            for term, docs in postings.items()
+        }
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ids) - self.dead
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held, for the LRU's byte budget"""
+        postings = sum(p.nbytes for p in self.postings.values())
+        terms = sum(50 + len(term) for term in self.postings)
+        # ID strings plus their doc_of entries
+        ids = len(self.ids) * 200
+        columns = self.amount.nbytes + self.day.nbytes + self.live.nbytes
+        return postings + terms + ids + columns
+
+    def _grow(self, size: int):
+        if size <= len(self.live):
+            return
+        capacity = max(size, 2 * len(self.live), 16)
+        for name in ("amount", "day", "live"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def upsert(self, doc: SearchDoc):
+        """Add a transaction, replacing any earlier version of it"""
+        self.remove(doc.id)
+        number = len(self.ids)
+        self._grow(number + 1)
+        self.ids.append(doc.id)
+        self.doc_of[doc.id] = number
+        self.amount[number] = doc.amount_cents
+        self.day[number] = doc.day
+        self.live[number] = True
+        for term in doc.terms:
+            postings = self.postings.get(term)
+            if postings is None:
+                self.postings[term] = Postings(np.asarray([number], dtype=np.int64))
+                self._terms = None
+            else:
+                postings.append(number)
+
+    def remove(self, txn_id: str):
+        number = self.doc_of.pop(txn_id, None)
+        if number is not None:
+            self.live[number] = False
+            self.dead += 1
+
+    def compact(self):
+        """Drop tombstoned docs and renumber the rest"""
+        size = len(self.ids)
+        live = self.live[:size]
+        renumber = np.cumsum(live) - 1
+        postings = {}
+        for term, old in self.postings.items():
+            docs = old.docs()
+            docs = docs[live[docs]]
+            if len(docs):
+                postings[term] = Postings(renumber[docs])
+        keep = np.flatnonzero(live)
+        self.ids = [self.ids[i] for i in keep.tolist()]
+        self.doc_of = {txn_id: i for i, txn_id in enumerate(self.ids)}
+        self.amount = self.amount[keep]
+        self.day = self.day[keep]
+        self.live = np.ones(len(keep), dtype=bool)
+        self.postings = postings
+        self.dead = 0
+        self._terms = None
+
+    def _matching(self, term: str, prefix: bool) -> np.ndarray:
+        """Docs containing the term (or any term it is a prefix of)"""
+        if not prefix:
+            postings = self.postings.get(term)
+            return postings.docs() if postings else np.zeros(0, dtype=np.int64)
+
+        if self._terms is None:
+            self._terms = sorted(self.postings)
+        start = bisect.bisect_left(self._terms, term)
+        end = bisect.bisect_left(self._terms, term + "\U0010ffff", lo=start)
+        lists = [self.postings[t].docs() for t in self._terms[start:end]]
+        if not lists:
+            return np.zeros(0, dtype=np.int64)
+        if len(lists) == 1:
+            return lists[0]
+        docs = np.sort(np.concatenate(lists))
+        return docs[np.concatenate(([True], docs[1:] != docs[:-1]))]
+
+    def search(
+        self,
+        query: str = "",
+        prefix: bool = True,
+        min_cents: Optional[int] = None,
+        max_cents: Optional[int] = None,
+        start_day: Optional[int] = None,
+        end_day: Optional[int] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[int, List[str]]:
+        """
+        Transactions with every query term, newest first, as (total, IDs).
+
+        With `prefix`, the last term also matches longer terms, for
+        type-ahead ("star" finds "starbucks").
+        """
+        terms = TOKEN_PATTERN.findall(query.lower())
+        if terms:
+            lists = [
+                self._matching(term, prefix and i == len(terms) - 1)
+                for i, term in enumerate(terms)
+            ]
+            lists.sort(key=len)
+            docs = lists[0]
+            for other in lists[1:]:
+                if not len(docs):
+                    break
+                docs = docs[np.isin(docs, other, assume_unique=True)]
+        else:
+            docs = np.arange(len(self.ids), dtype=np.int64)
+
+        mask = self.live[docs]
+        if min_cents is not None:
+            mask &= self.amount[docs] >= min_cents
+        if max_cents is not None:
+            mask &= self.amount[docs] <= max_cents
+        if start_day is not None:
+            mask &= self.day[docs] >= start_day
+        if end_day is not None:
+            mask &= self.day[docs] <= end_day
+        docs = docs[mask]
+
+        # Newest first; later docs first within a day
+        order = np.lexsort((-docs, -self.day[docs].astype(np.int64)))
+        page = docs[order[offset : offset + limit]]
+        return len(docs), [self.ids[i] for i in page.tolist()]
+
+
+@dataclass
+class SearchPage:
+    total: int
+    transactions: List[dict]
+
+
+class SearchService:
+    """
+    Per-user transaction search from in-memory inverted indexes.
+
+    Indexes are built on a user's first search and kept in an LRU bounded
+    by user count and approximate bytes, so inactive users cost nothing.
+    Sync appends each page's changes to a per-user Redis stream with a
+    sequence number; before searching, a worker applies whatever entries
+    its copy has not seen, so ingest updates indexes incrementally in
+    every API worker. A gap in the sequence (trimmed or expired stream)
+    means the index is rebuilt instead.
+    """
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self.service_client = supabase.service_client
+        self._indexes: "OrderedDict[str, TransactionIndex]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._append = self.redis.register_script(_APPEND_SCRIPT)
+
+    # User ID as a hash tag keeps a user's keys in one cluster slot
+    @staticmethod
+    def _stream_key(user_id: str) -> str:
+        return f"search_changes:{{{user_id}}}"
+
+    @staticmethod
+    def _seq_key(user_id: str) -> str:
+        return f"search_changes_seq:{{{user_id}}}"
+
+    async def record_changes(
+        self,
+        user_id: str,
+        upserts: Sequence[Transaction] = (),
+        removed: Sequence[str] = (),
+    ):
+        """Append changed transactions to the user's change stream"""
+        if not upserts and not removed:
+            return
+        changes = dumps(
+            {"upserts": [_change_row(txn) for txn in upserts], "removed": removed}
+        )
+        await self._append(
+            keys=[self._stream_key(user_id), self._seq_key(user_id)],
+            args=[
+                settings.search_changes_maxlen,
+                settings.search_changes_ttl_seconds,
+                changes,
+            ],
+        )
+
+    async def get_index(self, user_id: str) -> TransactionIndex:
+        """A user's index, loading it on a miss and applying new changes"""
+        index = self._indexes.get(user_id)
+        if index is not None:
+            self._indexes.move_to_end(user_id)
+            if await self._catch_up(user_id, index):
+                return index
+            # Changes were lost; start over from the database
+            self._indexes.pop(user_id, None)
+
+        loading = self._loading.get(user_id)
+        if loading is None:
+            loading = asyncio.ensure_future(self._load(user_id))
+            self._loading[user_id] = loading
+            loading.add_done_callback(lambda _: self._loading.pop(user_id, None))
+        return await asyncio.shield(loading)
+
+    async def _load(self, user_id: str) -> TransactionIndex:
+        # Note the stream position first: changes made while the rows are
+        # read are applied again afterwards, and upserts are idempotent
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.get(self._seq_key(user_id))
+            pipe.xrevrange(self._stream_key(user_id), count=1)
+            seq, last = await pipe.execute()
+
+        index = await asyncio.to_thread(self._build, user_id)
+        index.seq = int(seq or 0)
+        index.stream_id = last[0][0] if last else "0-0"
+        if not await self._catch_up(user_id, index):
+            logger.warning("Search changes for %s moved during load", user_id)
+
+        self._indexes[user_id] = index
+        self._indexes.move_to_end(user_id)
+        self._evict()
+        return index
+
+    @staticmethod
+    def _build(user_id: str) -> TransactionIndex:
+        rows = sync_engine.iter_user_rows(
+            user_id, INDEX_COLUMNS, settings.transactions_read_page_size
+        )
+        return TransactionIndex.build(SearchDoc.from_row(row) for row in rows)
+
+    async def _catch_up(self, user_id: str, index: TransactionIndex) -> bool:
+        """Apply unseen changes; False if some were lost"""
+        entries = await self.redis.xrange(
+            self._stream_key(user_id), min=f"({index.stream_id}"
+        )
+        for entry_id, fields in entries:
+            if _stream_position(entry_id) <= _stream_position(index.stream_id):
+                # Applied by a concurrent catch-up
+                continue
+            seq = int(fields["seq"])
+            if seq != index.seq + 1:
+                # Entries were trimmed, or the counter was reset
+                return False
+            changes = loads(fields["changes"])
+            for txn_id in changes["removed"]:
+                index.remove(txn_id)
+            for values in changes["upserts"]:
+                index.upsert(SearchDoc.from_values(*values))
+            index.seq = seq
+            index.stream_id = entry_id
+        if index.dead > settings.search_compact_ratio * max(len(index), 1):
+            index.compact()
+        return True
+
+    def _evict(self):
+        """Drop least recently used indexes beyond the count or byte budget"""
+        total = sum(index.nbytes for index in self._indexes.values())
+        while len(self._indexes) > 1 and (
+            len(self._indexes) > settings.search_index_max_users
+            or total > settings.search_index_max_bytes
+        ):
+            _, index = self._indexes.popitem(last=False)
+            total -= index.nbytes
+
+    def reset(self):
+        """Forget every index (rebuilt on next use)"""
+        self._indexes.clear()
+
+    async def search(
+        self,
+        user_id: str,
+        query: str = "",
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> SearchPage:
+        """Matching transactions, newest first, with the total match count"""
+        index = await self.get_index(user_id)
+        total, ids = index.search(
+            query,
+            min_cents=None if min_amount is None else round(min_amount * 100),
+            max_cents=None if max_amount is None else round(max_amount * 100),
+            start_day=start_date.toordinal() if start_date else None,
+            end_day=end_date.toordinal() if end_date else None,
+            limit=limit,
+            offset=offset,
+        )
+        if not ids:
+            return SearchPage(total=total, transactions=[])
+        rows = await asyncio.to_thread(self._load_rows, user_id, ids)
+        by_id = {row["id"]: row for row in rows}
+        return SearchPage(
+            total=total, transactions=[by_id[i] for i in ids if i in by_id]
+        )
+
+    def _load_rows(self, user_id: str, ids: List[str]) -> List[dict]:
+        response = (
+            self.service_client.table(TRANSACTIONS_TABLE)
+            .select(RESULT_COLUMNS)
+            .eq("user_id", user_id)
+            .in_("id", ids)
+            .execute()
+        )
+        return response.data or []
+
+
+async def _record_sync_page(item: PlaidItem, page: SyncPage):
+    await search_service.record_changes(
+        item.user_id, [*page.added, *page.modified], page.removed
+    )
+
+
+# Singleton instance
+search_service = SearchService(redis_client.client)
+sync_engine.page_hooks.append(_record_sync_page)
+invalidation_bus.on_reset(search_service.reset)
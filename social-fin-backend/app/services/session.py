@@ -0,0 +1,224 @@
+import logging
+import secrets
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from app.config import settings
+from app.core.exceptions import InvalidTokenError
+from app.core.invalidation import InvalidationEvent, invalidation_bus
+from app.core.redis_client import redis_client
+from app.core.revocation import revocation_list
+from app.core.security import security_utils
+from app.models.session import Session
+
+logger = logging.getLogger(__name__)
+
+SESSION_PREFIX = "session:"
+USER_SESSIONS_PREFIX = "user_sessions:"
+# Access JTIs a session has issued, scored by expiry
+SESSION_TOKENS_PREFIX = "session_tokens:"
+
+# Swap the refresh JTI only if the presented one is current; a stale JTI
+# means an old refresh token was replayed. The new access JTI joins the
+# session's token set, from which expired ones are pruned.
+#
+# KEYS: session, user's session index, session's token set
+# ARGV: presented refresh JTI, new refresh JTI, access JTI, access expiry,
+#       last used, TTL seconds, now (epoch seconds)
+_ROTATE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'refresh_jti') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'refresh_jti', ARGV[2], 'access_jti', ARGV[3],
+           'access_expires_at', ARGV[4], 'last_used_at', ARGV[5])
+redis.call('ZADD', KEYS[3], ARGV[4], ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', ARGV[7])
+redis.call('EXPIRE', KEYS[1], ARGV[6])
+redis.call('EXPIRE', KEYS[2], ARGV[6])
+redis.call('EXPIRE', KEYS[3], ARGV[6])
+return 1
+"""
+
+
+class SessionService:
+    """
+    Per-device refresh sessions in Redis.
+
+    Each session is a hash keyed by session ID; a per-user set indexes the
+    user's sessions so listing and bulk revocation never scan.
+    """
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self.ttl_seconds = settings.refresh_token_expire_days * 86400
+        self._rotate = self.redis.register_script(_ROTATE_SCRIPT)
+
+    @staticmethod
+    def _session_key(session_id: str) -> str:
+        return SESSION_PREFIX + session_id
+
+    @staticmethod
+    def _index_key(user_id: str) -> str:
+        return USER_SESSIONS_PREFIX + user_id
+
+    @staticmethod
+    def _tokens_key(session_id: str) -> str:
+        return SESSION_TOKENS_PREFIX + session_id
+
+    @staticmethod
+    def _issue(user_id: str, email: str, session_id: str) -> Tuple[str, dict, str, str]:
+        """Mint an access/refresh pair bound to a session"""
+        access_token = security_utils.create_access_token(
+            data={"sub": user_id, "email": email, "sid": session_id}
+        )
+        access_payload = security_utils.decode_token(access_token) or {}
+        refresh_jti = secrets.token_urlsafe(16)
+        refresh_token = security_utils.create_refresh_token(
+            data={"sub": user_id, "sid": session_id, "jti": refresh_jti}
+        )
+        return access_token, access_payload, refresh_token, refresh_jti
+
+    async def create(
+        self,
+        user_id: str,
+        email: str,
+        device: Optional[str] = None,
+        ip_address: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        """Start a session and return its access and refresh tokens"""
+        session_id = str(uuid.uuid4())
+        access_token, access_payload, refresh_token, refresh_jti = self._issue(
+            user_id, email, session_id
+        )
+        now = datetime.now(timezone.utc)
+        session = Session(
+            id=session_id,
+            user_id=user_id,
+            device=device,
+            ip_address=ip_address,
+            refresh_jti=refresh_jti,
+            access_jti=access_payload.get("jti"),
+            access_expires_at=access_payload.get("exp"),
+            created_at=now,
+            last_used_at=now,
+        )
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._session_key(session_id), mapping=session.to_redis())
+            pipe.expire(self._session_key(session_id), self.ttl_seconds)
+            pipe.sadd(self._index_key(user_id), session_id)
+            pipe.expire(self._index_key(user_id), self.ttl_seconds)
+            if session.access_jti and session.access_expires_at:
+                pipe.zadd(
+                    self._tokens_key(session_id),
+                    {session.access_jti: session.access_expires_at},
+                )
+                pipe.expire(self._tokens_key(session_id), self.ttl_seconds)
+            await pipe.execute()
+
+        return access_token, refresh_token
+
+    async def rotate(self, payload: dict, email: str) -> Tuple[str, str]:
+        """
+        Exchange a refresh token's claims for a new token pair.
+
+        Replaying an already-rotated refresh token revokes the session.
+        """
+        user_id = payload.get("sub")
+        session_id = payload.get("sid")
+        refresh_jti = payload.get("jti")
+        if not user_id or not session_id or not refresh_jti:
+            raise InvalidTokenError("Refresh token not bound to a session")
+
+        access_token, access_payload, refresh_token, new_jti = self._issue(
+            user_id, email, session_id
+        )
+        rotated = await self._rotate(
+            keys=[
+                self._session_key(session_id),
+                self._index_key(user_id),
+                self._tokens_key(session_id),
+            ],
+            args=[
+                refresh_jti,
+                new_jti,
+                access_payload.get("jti", ""),
+                access_payload.get("exp", 0),
+                datetime.now(timezone.utc).isoformat(),
+                self.ttl_seconds,
+                int(time.time()),
+            ],
+        )
+        if not rotated:
+            if await self.redis.exists(self._session_key(session_id)):
+                logger.warning("Refresh token reuse detected for session %s", session_id)
+                await self.revoke(user_id, session_id)
+            raise InvalidTokenError("Refresh token not found or invalid")
+
+        return access_token, refresh_token
+
+    async def list_sessions(self, user_id: str) -> List[Session]:
+        """List a user's live sessions, pruning expired index entries"""
+        session_ids = list(await self.redis.smembers(self._index_key(user_id)))
+        if not session_ids:
+            return []
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hgetall(self._session_key(session_id))
+            records = await pipe.execute()
+
+        sessions, expired = [], []
+        for session_id, record in zip(session_ids, records):
+            if record:
+                sessions.append(Session.from_redis(record))
+            else:
+                expired.append(session_id)
+        if expired:
+            await self.redis.srem(self._index_key(user_id), *expired)
+
+        return sorted(sessions, key=lambda s: s.last_used_at, reverse=True)
+
+    async def revoke(self, user_id: str, session_id: str) -> bool:
+        """Revoke one session; False if it doesn't belong to the user"""
+        if not await self.redis.sismember(self._index_key(user_id), session_id):
+            return False
+        await self._revoke_many(user_id, [session_id])
+        return True
+
+    async def revoke_all(self, user_id: str, except_session_id: Optional[str] = None):
+        """Revoke every session for a user in three round trips"""
+        session_ids = [
+            session_id
+            for session_id in await self.redis.smembers(self._index_key(user_id))
+            if session_id != except_session_id
+        ]
+        if session_ids:
+            await self._revoke_many(user_id, session_ids)
+
+    async def _revoke_many(self, user_id: str, session_ids: List[str]):
+        now = int(time.time())
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for session_id in session_ids:
+                pipe.zrangebyscore(
+                    self._tokens_key(session_id), now, "+inf", withscores=True
+                )
+                pipe.delete(
+                    self._session_key(session_id), self._tokens_key(session_id)
+                )
+            pipe.srem(self._index_key(user_id), *session_ids)
+            results = await pipe.execute()
+
+        # Cut off every access token the sessions issued that is still live
+        await revocation_list.revoke_many(
+            (access_jti, int(expires_at))
+            for tokens in results[0:-1:2]
+            for access_jti, expires_at in tokens
+        )
+
+        invalidation_bus.publish(InvalidationEvent.SESSION_REVOKED, user_id)
+
+
+# Singleton instance
+session_service = SessionService(redis_client.client)
@@ -0,0 +1,33 @@
+from .email import (
+    send_welcome_email,
+    send_password_reset_email,
+    send_verification_email,
+    send_email_batch,
+)
+from .plaid import sync_plaid_item, process_plaid_webhook
+from .budgets import reconcile_user_budgets, reconcile_all_budgets
+from .recurring import rebuild_recurring_charges
+from .leaderboards import (
+    snapshot_leaderboard,
+    snapshot_all_leaderboards,
+    rebuild_leaderboard,
+)
+from .groups import rebuild_group_balances
+from .insights import generate_all_insights
+
+__all__ = [
+    "send_welcome_email",
+    "send_password_reset_email",
+    "send_verification_email",
+    "send_email_batch",
+    "sync_plaid_item",
+    "process_plaid_webhook",
+    "reconcile_user_budgets",
+    "reconcile_all_budgets",
+    "rebuild_recurring_charges",
+    "snapshot_leaderboard",
+    "snapshot_all_leaderboards",
+    "rebuild_leaderboard",
+    "rebuild_group_balances",
+    "generate_all_insights",
+]
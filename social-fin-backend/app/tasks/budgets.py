@@ -0,0 +1,36 @@
+import asyncio
+from dataclasses import asdict
+from app.core.jobs import RETRY_POLICY, celery_app, enqueue
+from app.core.redis_client import redis_client
+from app.services.budgets import budget_service
+from app.services.plaid_sync import sync_engine
+
+
+async def _reconcile(user_id: str, repair: bool) -> dict:
+    try:
+        report = await budget_service.reconcile(user_id, repair=repair)
+        return {**asdict(report), "has_drift": report.has_drift}
+    finally:
+        # The Redis pool is bound to this event loop
+        await redis_client.close()
+
+
+@celery_app.task(name="budgets.reconcile_user", **RETRY_POLICY)
+def reconcile_user_budgets(user_id: str, repair: bool = True) -> dict:
+    """Recompute one user's budget totals from scratch and report drift"""
+    return asyncio.run(_reconcile(user_id, repair))
+
+
+@celery_app.task(name="budgets.reconcile_all", **RETRY_POLICY)
+def reconcile_all_budgets(repair: bool = True) -> int:
+    """Queue a reconciliation for every user with linked accounts"""
+    queued = 0
+    for user_id in sync_engine.linked_user_ids():
+        queued += enqueue(
+            reconcile_user_budgets,
+            user_id,
+            repair=repair,
+            dedup_key=f"budget_reconcile:{user_id}",
+            dedup_ttl=3600,
+        )
+    return queued
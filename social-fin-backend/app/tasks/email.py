@@ -0,0 +1,54 @@
+from typing import Dict, List
+from urllib.parse import urlencode
+from celery.utils.time import get_exponential_backoff_interval
+from app.config import settings
+from app.core.jobs import RETRY_POLICY, celery_app
+from app.services.email import email_dispatcher
+
+
+@celery_app.task(name="email.send_welcome", **RETRY_POLICY)
+def send_welcome_email(email: str, first_name: str):
+    """Send the welcome email after registration"""
+    email_dispatcher.send("welcome", email, {"first_name": first_name})
+
+
+@celery_app.task(name="email.send_password_reset", **RETRY_POLICY)
+def send_password_reset_email(email: str, reset_token: str):
+    """Send a password reset link"""
+    reset_url = f"{settings.password_reset_url}?{urlencode({'token': reset_token})}"
+    email_dispatcher.send("password_reset", email, {"reset_url": reset_url})
+
+
+@celery_app.task(name="email.send_verification", **RETRY_POLICY)
+def send_verification_email(email: str, code: str):
+    """Send an email verification code"""
+    email_dispatcher.send(
+        "email_verification",
+        email,
+        {
+            "code": code,
+            "expires_minutes": str(settings.verification_code_ttl_seconds // 60),
+        },
+    )
+
+
+# Not RETRY_POLICY: retrying the whole batch would resend delivered mail
+@celery_app.task(
+    name="email.send_batch", bind=True, max_retries=settings.job_max_retries
+)
+def send_email_batch(self, template: str, recipients: List[Dict[str, str]]):
+    """Send one template to many recipients; each item needs an "email" key"""
+    batch = email_dispatcher.send_batch(
+        (template, recipient["email"], recipient) for recipient in recipients
+    )
+    if batch.unsent:
+        # Retry only the recipients that were not reached
+        raise self.retry(
+            args=(template, [recipients[i] for i in batch.unsent]),
+            countdown=get_exponential_backoff_interval(
+                factor=1,
+                retries=self.request.retries,
+                maximum=settings.job_retry_backoff_max_seconds,
+                full_jitter=True,
+            ),
+        )
@@ -0,0 +1,18 @@
+import asyncio
+from app.core.jobs import RETRY_POLICY, celery_app
+from app.core.redis_client import redis_client
+from app.services.groups import group_service
+
+
+async def _rebuild(group_id: str) -> int:
+    try:
+        return await group_service.rebuild(group_id)
+    finally:
+        # The Redis pool is bound to this event loop
+        await redis_client.close()
+
+
+@celery_app.task(name="groups.rebuild_balances", **RETRY_POLICY)
+def rebuild_group_balances(group_id: str) -> int:
+    """Recompute a group's balances from its expenses"""
+    return asyncio.run(_rebuild(group_id))
@@ -0,0 +1,23 @@
+import asyncio
+from typing import Dict
+from app.core.jobs import RETRY_POLICY, celery_app
+from app.core.redis_client import redis_client
+from app.services.insights import insight_service
+from app.services.llm_client import llm_client
+from app.services.plaid_sync import sync_engine
+
+
+async def _generate_all() -> Dict[str, int]:
+    try:
+        user_ids = await asyncio.to_thread(sync_engine.linked_user_ids)
+        return await insight_service.generate_all(user_ids)
+    finally:
+        # The Redis pool and HTTP client are bound to this event loop
+        await redis_client.close()
+        await llm_client.close()
+
+
+@celery_app.task(name="insights.generate_all", **RETRY_POLICY)
+def generate_all_insights() -> Dict[str, int]:
+    """Refresh cached insights for every user with linked accounts"""
+    return asyncio.run(_generate_all())
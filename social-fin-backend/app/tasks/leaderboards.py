@@ -0,0 +1,73 @@
+import asyncio
+from datetime import date
+from typing import List
+from app.core.jobs import RETRY_POLICY, celery_app, enqueue
+from app.core.redis_client import redis_client
+from app.services.budgets import period_of
+from app.services.leaderboards import leaderboard_service
+
+
+async def _snapshot(challenge_id: str) -> int:
+    try:
+        challenge = await leaderboard_service.get_challenge(challenge_id)
+        participants = await leaderboard_service.snapshot(challenge_id)
+        # One last snapshot once the final month is over
+        if challenge.end_period < period_of(date.today()):
+            await leaderboard_service.retire(challenge_id)
+        return participants
+    finally:
+        # The Redis pool is bound to this event loop
+        await redis_client.close()
+
+
+async def _active_challenge_ids() -> List[str]:
+    try:
+        return await leaderboard_service.active_challenge_ids()
+    finally:
+        await redis_client.close()
+
+
+async def _rebuild_user(user_id: str) -> int:
+    try:
+        return await leaderboard_service.rebuild_user(user_id)
+    finally:
+        await redis_client.close()
+
+
+async def _rebuild(challenge_id: str) -> int:
+    try:
+        return await leaderboard_service.rebuild(challenge_id)
+    finally:
+        await redis_client.close()
+
+
+@celery_app.task(name="leaderboards.snapshot", **RETRY_POLICY)
+def snapshot_leaderboard(challenge_id: str) -> int:
+    """Record one challenge's standings for its history"""
+    return asyncio.run(_snapshot(challenge_id))
+
+
+@celery_app.task(name="leaderboards.snapshot_all", **RETRY_POLICY)
+def snapshot_all_leaderboards() -> int:
+    """Queue a snapshot of every running challenge"""
+    queued = 0
+    for challenge_id in asyncio.run(_active_challenge_ids()):
+        queued += enqueue(
+            snapshot_leaderboard,
+            challenge_id,
+            dedup_key=f"leaderboard_snapshot:{challenge_id}",
+            dedup_ttl=300,
+        )
+    return queued
+
+
+@celery_app.task(name="leaderboards.rebuild", **RETRY_POLICY)
+def rebuild_leaderboard(challenge_id: str) -> int:
+    """Recompute a challenge's scores from participants' budget totals"""
+    return asyncio.run(_rebuild(challenge_id))
+
+
+@celery_app.task(name="leaderboards.rebuild_user", **RETRY_POLICY)
+def rebuild_user_scores(user_id: str) -> int:
+    """Recompute one user's scores after an incremental update was lost"""
+    return asyncio.run(_rebuild_user(user_id))
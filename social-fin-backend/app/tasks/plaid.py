@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from app.config import settings
+from app.core.jobs import (
+    RETRY_POLICY,
+    celery_app,
+    enqueue,
+    exclusive,
+    release_dedup_key,
+)
+from app.core.redis_client import redis_client
+from app.services.plaid_client import plaid_client
+from app.services.plaid_sync import sync_engine
+
+# Modules that register sync page processors and hooks on the engine
+from app.services import (  # noqa: F401
+    analytics,
+    budgets,
+    categorization,
+    leaderboards,
+    push_events,
+    recurring,
+    search,
+)
+
+logger = logging.getLogger(__name__)
+
+# Item webhooks that mean the user has to relink or re-consent
+ITEM_ERROR_CODES = {"ERROR", "PENDING_EXPIRATION", "USER_PERMISSION_REVOKED"}
+
+
+def sync_pending_key(item_id: str) -> str:
+    """Dedup key held while a sync job for the item is waiting to run"""
+    return f"plaid_sync:{item_id}"
+
+
+def queue_item_sync(item_id: str) -> bool:
+    """Queue a sync unless one for the item is already waiting"""
+    return enqueue(
+        sync_plaid_item,
+        item_id,
+        dedup_key=sync_pending_key(item_id),
+        dedup_ttl=settings.plaid_sync_lock_seconds,
+    )
+
+
+async def _sync_item(item_id: str) -> dict:
+    try:
+        item = await asyncio.to_thread(sync_engine.load_item, item_id)
+        if item is None:
+            return {"item_id": item_id, "error": "Item not found"}
+        result = await sync_engine.sync_item(item)
+        return result.__dict__
+    finally:
+        # The HTTP and Redis pools are bound to this event loop
+        await plaid_client.close()
+        await redis_client.close()
+
+
+@celery_app.task(name="plaid.sync_item", bind=True, **RETRY_POLICY)
+def sync_plaid_item(self, item_id: str) -> dict:
+    """Pull new, modified and removed transactions for one item"""
+    lock_key = f"plaid_sync:{item_id}"
+    with exclusive(lock_key, settings.plaid_sync_lock_seconds) as acquired:
+        if not acquired:
+            # Another worker is mid-sync; run after it so nothing it missed is lost
+            raise self.retry(countdown=30, max_retries=None)
+
+        # Updates arriving from here on queue another run
+        release_dedup_key(sync_pending_key(item_id))
+        return asyncio.run(_sync_item(item_id))
+
+
+@celery_app.task(name="plaid.process_webhook", **RETRY_POLICY)
+def process_plaid_webhook(event_id: str, webhook: dict) -> dict:
+    """Act on a non-sync webhook stored at `event_id` in the webhook stream"""
+    item_id = webhook["item_id"]
+    webhook_type = webhook.get("webhook_type")
+    webhook_code = webhook.get("webhook_code")
+
+    if webhook_type == "ITEM" and webhook_code in ITEM_ERROR_CODES:
+        error_code = (webhook.get("error") or {}).get("error_code") or webhook_code
+        sync_engine.set_item_error(item_id, error_code)
+        return {"event_id": event_id, "item_id": item_id, "error_code": error_code}
+
+    if webhook_type == "ITEM" and webhook_code == "LOGIN_REPAIRED":
+        sync_engine.set_item_error(item_id, None)
+        queue_item_sync(item_id)
+        return {"event_id": event_id, "item_id": item_id, "repaired": True}
+
+    logger.info("No handler for %s/%s webhook %s", webhook_type, webhook_code, event_id)
+    return {"event_id": event_id, "item_id": item_id, "ignored": True}
@@ -0,0 +1,18 @@
+import asyncio
+from app.core.jobs import RETRY_POLICY, celery_app
+from app.core.redis_client import redis_client
+from app.services.recurring import recurring_detector
+
+
+async def _rebuild(user_id: str) -> int:
+    try:
+        return await recurring_detector.rebuild(user_id)
+    finally:
+        # The Redis pool is bound to this event loop
+        await redis_client.close()
+
+
+@celery_app.task(name="recurring.rebuild_user", **RETRY_POLICY)
+def rebuild_recurring_charges(user_id: str) -> int:
+    """Recompute a user's recurring charges from full history"""
+    return asyncio.run(_rebuild(user_id))
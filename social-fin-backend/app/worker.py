@@ -0,0 +1,19 @@
+"""
+Background job worker.
+
+Run with either of:
+
+    celery -A app.worker worker --loglevel=info
+    python -m app.worker
+"""
+
+from app.core.jobs import celery_app
+import app.tasks  # noqa: F401  (registers tasks)
+
+
+def main():
+    celery_app.worker_main(["worker", "--loglevel=info"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Vectorized spending analytics at 10k, 100k and 1M transactions.
+
+Times building a TransactionFrame from raw columns and each aggregate,
+and compares category-by-month totals with a per-row Python loop (which
+is also used to check the vectorized result).
+
+    python -m benchmarks.bench_analytics
+"""
+
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+import numpy as np
+from app.services.analytics import (
+    TransactionFrame,
+    category_percentiles,
+    daily_series,
+    monthly_summary,
+    spending_by_category_month,
+    top_merchants,
+)
+
+SIZES = (10_000, 100_000, 1_000_000)
+CATEGORIES = [
+    "FOOD_AND_DRINK",
+    "GENERAL_MERCHANDISE",
+    "TRANSPORTATION",
+    "RENT_AND_UTILITIES",
+    "ENTERTAINMENT",
+    "TRAVEL",
+    "INCOME",
+    None,
+]
+
+
+def _columns(n: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    start = date(2022, 1, 1)
+    amounts = np.round(rng.lognormal(3, 1, n), 2)
+    amounts[rng.random(n) < 0.05] *= -20  # paychecks and refunds
+    dates = [
+        (start + timedelta(days=int(d))).isoformat()
+        for d in rng.integers(0, 3 * 365, n)
+    ]
+    categories = [CATEGORIES[i] for i in rng.integers(0, len(CATEGORIES), n)]
+    merchants = [f"merchant-{i}" for i in rng.zipf(1.5, n) % 5000]
+    return amounts.tolist(), dates, categories, merchants
+
+
+def _naive_category_month(amounts, dates, categories):
+    totals = defaultdict(int)
+    for amount, day, category in zip(amounts, dates, categories):
+        if amount > 0:
+            totals[(day[:7], category or "UNCATEGORIZED")] += round(amount * 100)
+    return totals
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    for n in SIZES:
+        amounts, dates, categories, merchants = _columns(n)
+        frame, build_ms = _timed(
+            TransactionFrame.from_columns, amounts, dates, categories, merchants
+        )
+        grouped, grouped_ms = _timed(spending_by_category_month, frame)
+        naive, naive_ms = _timed(_naive_category_month, amounts, dates, categories)
+
+        vectorized = {
+            (row["month"], row["category"]): round(row["total"] * 100)
+            for row in grouped
+        }
+        assert vectorized == naive, "category totals disagree with the loop"
+
+        _, monthly_ms = _timed(monthly_summary, frame)
+        _, daily_ms = _timed(daily_series, frame, 30)
+        _, pct_ms = _timed(category_percentiles, frame)
+        _, top_ms = _timed(top_merchants, frame, 10)
+
+        print(
+            f"{n:>9,} txns  build {build_ms:8.1f} ms  "
+            f"by-category {grouped_ms:7.2f} ms (loop {naive_ms:8.1f} ms, "
+            f"{naive_ms / grouped_ms:5.1f}x)  monthly {monthly_ms:6.2f} ms  "
+            f"daily {daily_ms:6.2f} ms  percentiles {pct_ms:6.2f} ms  "
+            f"merchants {top_ms:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Email dispatcher throughput against a local SMTP sink.
+
+Start a sink that accepts and discards mail, e.g.
+
+    python -m aiosmtpd -n -l localhost:1025
+
+then run
+
+    python -m benchmarks.bench_email --messages 2000 --pool-size 4
+"""
+
+import argparse
+from app.services.email import DomainRateLimiter, EmailDispatcher, SMTPConnectionPool
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--domains", type=int, default=10)
+    parser.add_argument("--domain-rate", type=float, default=0, help="0 = unlimited")
+    args = parser.parse_args()
+
+    pool = SMTPConnectionPool(
+        args.host, args.port, use_tls=False, size=args.pool_size
+    )
+    dispatcher = EmailDispatcher(
+        pool=pool, rate_limiter=DomainRateLimiter(args.domain_rate)
+    )
+    emails = [
+        ("welcome", f"user{i}@domain{i % args.domains}.test", {"first_name": f"User{i}"})
+        for i in range(args.messages)
+    ]
+
+    stats = dispatcher.send_batch(emails)
+    pool.close()
+    print(
+        f"sent={stats.sent} failed={stats.failed} "
+        f"elapsed={stats.elapsed:.2f}s rate={stats.messages_per_second:.1f} msg/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Export memory and throughput by history size.
+
+Runs each export format over synthetic transaction histories of growing
+size, reading rows from a generator the way keyset pagination yields
+them, and discards the output as a client would receive it. Reports
+throughput, output size and peak Python heap during the export
+(tracemalloc), plus Arrow's peak allocation for Parquet. Peak memory
+should stay flat as the history grows.
+
+    python -m benchmarks.bench_export
+"""
+
+import random
+import time
+import tracemalloc
+import uuid
+from datetime import date, timedelta
+from typing import Dict, Iterator
+from app.services.export import FORMATTERS, parquet_available
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
+SIZES = [100_000, 300_000, 1_000_000]
+MERCHANTS = ["Coffee Shop", "Grocer", "Airline", "Landlord", "Streaming Co", None]
+CATEGORIES = ["FOOD_AND_DRINK", "TRAVEL", "RENT_AND_UTILITIES", "ENTERTAINMENT"]
+
+
+def _rows(count: int, seed: int = 7) -> Iterator[Dict[str, object]]:
+    rng = random.Random(seed)
+    start = date(2015, 1, 1)
+    account_id, item_id = str(uuid.uuid4()), str(uuid.uuid4())
+    for i in range(count):
+        day = (start + timedelta(days=i * 3650 // count)).isoformat()
+        merchant = rng.choice(MERCHANTS)
+        yield {
+            "id": f"txn-{i:09d}",
+            "date": day,
+            "authorized_date": day if rng.random() < 0.8 else None,
+            "amount": round(rng.uniform(-3000, 500), 2),
+            "iso_currency_code": "USD",
+            "name": f"{merchant or 'Transfer'} #{rng.randint(1, 9999)}",
+            "merchant_name": merchant,
+            "category": rng.choice(CATEGORIES),
+            "category_detailed": None,
+            "pending": False,
+            "account_id": account_id,
+            "item_id": item_id,
+        }
+
+
+def main():
+    formats = [f for f in FORMATTERS if f != "parquet" or parquet_available()]
+    for export_format in formats:
+        peaks = []
+        for size in SIZES:
+            tracemalloc.start()
+            started = time.perf_counter()
+            output = 0
+            for chunk in FORMATTERS[export_format](_rows(size)):
+                output += len(chunk)
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            peaks.append(peak)
+
+            arrow = ""
+            if export_format == "parquet":
+                arrow = (
+                    f", Arrow peak {pa.default_memory_pool().max_memory() / 1e6:.1f} MB"
+                )
+            print(
+                f"{export_format:<8} {size:>9,} rows: {size / elapsed:>9,.0f} rows/s, "
+                f"{output / 1e6:7.1f} MB out, "
+                f"peak heap {peak / 1e6:5.1f} MB{arrow}"
+            )
+        print(
+            f"{export_format:<8} peak growth {SIZES[0]:,} -> {SIZES[-1]:,} rows: "
+            f"{peaks[-1] / peaks[0]:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
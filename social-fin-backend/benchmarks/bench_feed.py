@@ -0,0 +1,149 @@
+"""
+Feed publish and read throughput against a local Redis.
+
+Builds a random friend graph (plus a few authors with audiences above
+the fan-out threshold), publishes activities from random authors and
+reads first and deeper pages from random users, concurrently. The same
+workload then runs pull-only (every author merged at read) for
+comparison.
+
+Uses BENCH_REDIS_URL (default redis://localhost:6379/15) and FLUSHES
+that database, so point it at a scratch one.
+
+    python -m benchmarks.bench_feed
+"""
+
+import asyncio
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, FrozenSet, List
+import redis.asyncio as redis
+from app.config import settings
+from app.services.feed import FeedService
+
+USERS = 20000
+AVERAGE_FRIENDS = 100
+LARGE_AUTHORS = 10
+LARGE_AUDIENCE = 5000
+PUBLISHES = 5000
+READS = 5000
+DEEP_PAGES = 5
+CONCURRENCY = 64
+
+
+class StaticFriends:
+    """Friend sets held in memory, standing in for FriendService"""
+
+    def __init__(self, graph: Dict[str, FrozenSet[str]]):
+        self.graph = graph
+
+    async def friends_of(self, user_id: str) -> FrozenSet[str]:
+        return self.graph.get(user_id, frozenset())
+
+
+def _graph(seed: int = 7) -> Dict[str, FrozenSet[str]]:
+    rng = random.Random(seed)
+    users = [f"user-{i}" for i in range(USERS)]
+    friends: Dict[str, set] = {user: set() for user in users}
+    for _ in range(USERS * AVERAGE_FRIENDS // 2):
+        a, b = rng.sample(users, 2)
+        friends[a].add(b)
+        friends[b].add(a)
+    for author in users[:LARGE_AUTHORS]:
+        for other in rng.sample(users[LARGE_AUTHORS:], LARGE_AUDIENCE):
+            friends[author].add(other)
+            friends[other].add(author)
+    return {user: frozenset(ids) for user, ids in friends.items()}
+
+
+async def _run(
+    count: int, op: Callable[[int], Awaitable[None]]
+) -> List[float]:
+    """Run `count` operations with bounded concurrency; per-op seconds"""
+    latencies: List[float] = []
+    gate = asyncio.Semaphore(CONCURRENCY)
+
+    async def timed(i: int):
+        async with gate:
+            started = time.perf_counter()
+            await op(i)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(timed(i) for i in range(count)))
+    return latencies
+
+
+def _report(label: str, latencies: List[float], elapsed: float):
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2] * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    print(
+        f"  {label:<24} {len(ordered) / elapsed:>9,.0f} ops/s  "
+        f"p50 {p50:6.2f} ms  p99 {p99:6.2f} ms"
+    )
+
+
+async def _workload(service: FeedService, graph: Dict[str, FrozenSet[str]]):
+    rng = random.Random(11)
+    users = list(graph)
+    authors = [rng.choice(users) for _ in range(PUBLISHES)]
+    # Large authors post as often as everyone else put together would
+    for i in range(0, PUBLISHES, 50):
+        authors[i] = users[rng.randrange(LARGE_AUTHORS)]
+    readers = [rng.choice(users) for _ in range(READS)]
+
+    async def publish(i: int):
+        await service.publish(authors[i], "savings_milestone", {"amount": i})
+
+    async def read_first(i: int):
+        await service.read(readers[i])
+
+    async def read_deep(i: int):
+        page = await service.read(readers[i])
+        for _ in range(DEEP_PAGES - 1):
+            if page.next_cursor is None:
+                break
+            page = await service.read(readers[i], page.next_cursor)
+
+    for label, count, op in (
+        ("publish", PUBLISHES, publish),
+        ("read first page", READS, read_first),
+        (f"read {DEEP_PAGES} pages", READS // 5, read_deep),
+    ):
+        started = time.perf_counter()
+        latencies = await _run(count, op)
+        _report(label, latencies, time.perf_counter() - started)
+
+    deliveries = sum(
+        len(graph[author])
+        for author in authors
+        if len(graph[author]) <= settings.feed_fanout_threshold
+    )
+    print(f"  timeline writes          {deliveries:>9,}")
+
+
+async def main():
+    url = os.environ.get("BENCH_REDIS_URL", "redis://localhost:6379/15")
+    client = redis.from_url(url, encoding="utf-8", decode_responses=True)
+    graph = _graph()
+    service = FeedService(client, StaticFriends(graph))
+    threshold = settings.feed_fanout_threshold
+
+    try:
+        for label, fanout_threshold in (
+            (f"hybrid (fan-out up to {threshold} friends)", threshold),
+            ("pull only (merge every friend at read)", -1),
+        ):
+            await client.flushdb()
+            settings.feed_fanout_threshold = fanout_threshold
+            print(label)
+            await _workload(service, graph)
+    finally:
+        settings.feed_fanout_threshold = threshold
+        await client.flushdb()
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""
+Friend-graph memory and query latency at 1M users.
+
+Generates a clustered graph (most friends inside a ~200-person
+community, the rest random) and reports build time and index size, then
+latency for UUID lookups, mutual-friend counts, suggestions and
+incremental adds and removes, plus the cost of compacting them back into
+the CSR arrays. Mutual counts are also timed against Python sets for the
+sampled users, with their memory extrapolated to the whole graph.
+
+    python -m benchmarks.bench_friend_graph
+"""
+
+import sys
+import time
+import uuid
+from typing import Callable, List
+import numpy as np
+from app.services.friend_graph import FriendGraph
+
+USERS = 1_000_000
+AVERAGE_FRIENDS = 40
+COMMUNITY = 200
+LOCAL_SHARE = 0.8
+SAMPLES = 10000
+
+
+def _graph(seed: int = 7):
+    rng = np.random.default_rng(seed)
+    edges = USERS * AVERAGE_FRIENDS // 2
+    src = rng.integers(0, USERS, edges)
+    local = rng.random(edges) < LOCAL_SHARE
+    neighbor = src // COMMUNITY * COMMUNITY + rng.integers(0, COMMUNITY, edges)
+    dst = np.where(
+        local, np.minimum(neighbor, USERS - 1), rng.integers(0, USERS, edges)
+    )
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+    halves = np.frombuffer(rng.bytes(16 * USERS), dtype=">u8").reshape(-1, 2)
+    uuids = [(high << 64) | low for high, low in halves.tolist()]
+    return uuids, np.concatenate((src, dst)), np.concatenate((dst, src))
+
+
+def _latency(label: str, samples: int, op: Callable[[int], object]):
+    timings: List[float] = []
+    for i in range(samples):
+        started = time.perf_counter()
+        op(i)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    p50 = timings[len(timings) // 2] * 1e6
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+    print(f"{label:<34} p50 {p50:8.1f} us  p99 {p99:8.1f} us")
+
+
+def main():
+    uuids, sources, targets = _graph()
+    started = time.perf_counter()
+    graph = FriendGraph.from_codes(uuids, sources, targets)
+    build = time.perf_counter() - started
+    edges = graph.edge_count
+    print(
+        f"{graph.user_count:,} users, {edges // 2:,} friendships: "
+        f"built in {build:.1f} s, {graph.nbytes / 1e6:.0f} MB "
+        f"({graph.nbytes / edges:.1f} bytes per directed edge)"
+    )
+
+    rng = np.random.default_rng(11)
+    users = rng.integers(0, USERS, SAMPLES).tolist()
+    names = [graph.uuid_of(i) for i in users]
+    # Pairs two hops apart, the case mutual-friend badges are shown for
+    pairs = []
+    for i in users:
+        friends = graph.neighbors(i)
+        via = int(friends[rng.integers(len(friends))])
+        hop = graph.neighbors(via)
+        pairs.append((i, int(hop[rng.integers(len(hop))])))
+
+    _latency("UUID -> ID", SAMPLES, lambda k: graph.id_of(names[k]))
+    _latency(
+        "mutual count (sorted arrays)",
+        SAMPLES,
+        lambda k: len(graph.mutual(*pairs[k])),
+    )
+
+    sets = {}
+    for a, b in pairs:
+        for i in (a, b):
+            sets[i] = set(graph.neighbors(i).tolist())
+    _latency(
+        "mutual count (Python sets)",
+        SAMPLES,
+        lambda k: len(sets[pairs[k][0]] & sets[pairs[k][1]]),
+    )
+    # Set table plus one int object per member
+    per_user = sum(sys.getsizeof(s) + 28 * len(s) for s in sets.values()) / len(sets)
+    print(f"{'Python sets, extrapolated':<34} {per_user * USERS / 1e6:8.0f} MB")
+
+    _latency("suggestions (top 20)", 1000, lambda k: graph.suggestions(users[k]))
+
+    adds = [
+        (graph.uuid_of(int(a)), graph.uuid_of(int(b)))
+        for a, b in rng.integers(0, USERS, (SAMPLES, 2))
+    ]
+    _latency("add friend", SAMPLES, lambda k: graph.add(*adds[k]))
+    _latency("remove friend", SAMPLES // 2, lambda k: graph.remove(*adds[k]))
+
+    rows = graph.changed_rows()
+    started = time.perf_counter()
+    indptr, indices = graph.compacted(rows)
+    compact = time.perf_counter() - started
+    graph.install(rows, indptr, indices)
+    print(f"compact {len(rows):,} changed rows             {compact * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Push connections per worker against a local Redis.
+
+Opens CONNECTIONS in-process client connections on one PushHub (one
+event loop, as in a single API worker) and serves each with the same
+loop the WebSocket endpoint uses, writing frames to an in-memory sink.
+A share of the clients never finish reading, to exercise the
+slow-consumer policy. Publishers then send bursts of updates to random
+users. Reports memory per connection, publish-to-send latency, delivered
+and coalesced message counts, and disconnected slow consumers.
+
+Uses BENCH_REDIS_URL (default redis://localhost:6379/15).
+
+    python -m benchmarks.bench_push
+"""
+
+import asyncio
+import os
+import random
+import time
+import tracemalloc
+from typing import List
+import redis.asyncio as redis
+from app.config import settings
+from app.core.metrics import metrics
+from app.core.push import PushHub
+
+CONNECTIONS = 10000
+SLOW_SHARE = 0.01
+BURSTS = 2000
+BURST_SIZE = 5  # Updates per burst, to the same key
+USERS_PER_BURST = 20
+PUBLISHERS = 8
+
+
+async def _serve(
+    hub: PushHub, user_id: str, slow: bool, opened: List[str], closed: List[int]
+):
+    connection = await hub.connect(user_id)
+    opened.append(user_id)
+
+    async def send(frame: str):
+        if slow:
+            await asyncio.sleep(3600)
+
+    try:
+        code, _ = await hub.serve(connection, send, time.time() + 3600)
+        closed.append(code)
+    finally:
+        await hub.disconnect(connection)
+
+
+async def _publish(hub: PushHub, users: List[str], bursts: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(bursts):
+        targets = rng.sample(users, USERS_PER_BURST)
+        period = f"2026-{rng.randint(1, 12):02d}"
+        for i in range(BURST_SIZE):
+            await hub.publish(targets, "budget", {"period": period}, key=period)
+
+
+async def main():
+    url = os.environ.get("BENCH_REDIS_URL", "redis://localhost:6379/15")
+    client = redis.from_url(url, decode_responses=True)
+    settings.push_send_timeout_seconds = 1.0
+    hub = PushHub(client)
+    hub.start()
+
+    users = [f"user-{i}" for i in range(CONNECTIONS)]
+    slow = set(random.Random(3).sample(users, int(CONNECTIONS * SLOW_SHARE)))
+    opened: List[str] = []
+    closed: List[int] = []
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(_serve(hub, user_id, user_id in slow, opened, closed))
+        for user_id in users
+    ]
+    # Subscribed once connect() returns
+    while len(opened) < CONNECTIONS:
+        await asyncio.sleep(0.01)
+    connect = time.perf_counter() - started
+    per_connection = (tracemalloc.get_traced_memory()[0] - before) / CONNECTIONS
+    tracemalloc.stop()
+    print(
+        f"{CONNECTIONS:,} connections: opened in {connect:.2f} s, "
+        f"{per_connection / 1024:.1f} KiB each (hub and task, not the socket)"
+    )
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _publish(hub, users, BURSTS // PUBLISHERS, seed)
+            for seed in range(PUBLISHERS)
+        )
+    )
+    published = time.perf_counter() - started
+    # Wait for delivery to go quiet and slow sends to time out
+    handled = -1
+    while True:
+        await asyncio.sleep(settings.push_send_timeout_seconds + 0.5)
+        counters = (await metrics.snapshot())["counters"]
+        now_handled = sum(counters.values())
+        if now_handled == handled:
+            break
+        handled = now_handled
+    drained = time.perf_counter() - started
+
+    messages = BURSTS * BURST_SIZE * USERS_PER_BURST
+    snapshot = await metrics.snapshot()
+    fanout = snapshot["latencies"]["push.fanout"]
+    print(
+        f"published {messages:,} messages in {published:.2f} s "
+        f"({messages / published:,.0f}/s), all handled within {drained:.1f} s"
+    )
+    print(
+        f"delivered {counters.get('push.messages_sent', 0):,}, "
+        f"coalesced {counters.get('push.coalesced', 0):,}; "
+        f"fan-out p50 {fanout['p50_ms']} ms, p99 {fanout['p99_ms']} ms"
+    )
+    print(
+        f"slow consumers disconnected: "
+        f"{counters.get('push.slow_consumer_disconnects', 0)} of {len(slow)}"
+    )
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await hub.stop()
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""
+Transaction search latency and index size by history size.
+
+Builds a per-user index over synthetic histories and times type-ahead
+queries (prefix on the last word), multi-word queries and amount/date
+range filters, against a linear scan over the same rows that matches
+the way a substring ILIKE would. Also times incremental upserts as sync
+pages arrive, and reports the index's approximate footprint next to
+the same postings held as Python lists.
+
+    python -m benchmarks.bench_search
+"""
+
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from typing import List
+from app.services.search import SearchDoc, TransactionIndex
+
+SIZES = [10_000, 100_000, 500_000]
+REPEATS = 50
+MERCHANTS = [
+    "Starbucks",
+    "Star Market",
+    "Whole Foods Market",
+    "Trader Joe's",
+    "Uber",
+    "Uber Eats",
+    "Shell",
+    "Amazon",
+    "Netflix",
+    "Delta Air Lines",
+]
+CATEGORIES = ["FOOD_AND_DRINK", "TRAVEL", "GENERAL_MERCHANDISE", "ENTERTAINMENT"]
+QUERIES = ["sta", "starbucks", "uber ea", "whole foods", "delta air l"]
+
+
+def _rows(count: int, seed: int = 11) -> List[dict]:
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    rows = []
+    for i in range(count):
+        merchant = rng.choice(MERCHANTS)
+        rows.append(
+            {
+                "id": f"txn-{i:09d}",
+                "amount": round(rng.uniform(-500, 500), 2),
+                "date": (start + timedelta(days=i * 2000 // count)).isoformat(),
+                "name": f"{merchant} #{rng.randint(1, 9999)}",
+                "merchant_name": merchant,
+                "category": rng.choice(CATEGORIES),
+            }
+        )
+    return rows
+
+
+def _scan(rows: List[dict], query: str, min_amount: float = None) -> List[str]:
+    needle = query.lower()
+    matches = [
+        row
+        for row in rows
+        if needle in f"{row['merchant_name']} {row['name']} {row['category']}".lower()
+        and (min_amount is None or row["amount"] >= min_amount)
+    ]
+    matches.sort(key=lambda row: row["date"], reverse=True)
+    return [row["id"] for row in matches[:20]]
+
+
+def _ms(fn) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    for size in SIZES:
+        rows = _rows(size)
+        started = time.perf_counter()
+        index = TransactionIndex.build(SearchDoc.from_row(row) for row in rows)
+        build = time.perf_counter() - started
+        as_lists = sum(
+            56 + 8 * len(postings.docs()) + 28 * len(postings.docs())
+            for postings in index.postings.values()
+        )
+        postings = sum(postings.nbytes for postings in index.postings.values())
+        print(
+            f"{size:>9,} transactions: built in {build:.2f} s, "
+            f"index ~{index.nbytes / 1e6:.1f} MB; postings {postings / 1e6:.2f} MB "
+            f"vs {as_lists / 1e6:.1f} MB as Python lists"
+        )
+
+        indexed = statistics.median(_ms(lambda q=q: index.search(q)) for q in QUERIES)
+        ranged = _ms(
+            lambda: index.search(
+                "market",
+                min_cents=0,
+                start_day=date(2022, 1, 1).toordinal(),
+                end_day=date(2023, 12, 31).toordinal(),
+            )
+        )
+        scan = _ms(lambda: _scan(rows, "starbucks", 0)) if size <= 100_000 else None
+        scanned = f"{scan:.2f} ms" if scan is not None else "skipped"
+        print(
+            f"{'':>9}  query p50 {indexed:.3f} ms, with ranges {ranged:.3f} ms, "
+            f"linear scan {scanned}"
+        )
+
+        rng = random.Random(size)
+        updates = _rows(1000, seed=size)
+        for row in updates:
+            row["id"] = f"txn-{rng.randrange(size):09d}"  # Mostly modifications
+        started = time.perf_counter()
+        for row in updates:
+            index.upsert(SearchDoc.from_row(row))
+        upsert = (time.perf_counter() - started) / len(updates) * 1e6
+        started = time.perf_counter()
+        index.compact()
+        compact = time.perf_counter() - started
+        print(
+            f"{'':>9}  upsert {upsert:.1f} us each, compaction {compact * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Serialization cost of typical API payloads.
+
+Compares the stdlib encoder used previously against the fast JSON backend
+behind FastJSONResponse, for a Token, a UserResponse and a 1k-item list.
+
+    python -m benchmarks.bench_serialization
+"""
+
+import json
+import timeit
+from datetime import datetime, timezone
+from app.core.serialization import dumps_bytes
+from app.schemas.auth import Token, UserResponse
+
+
+def _user(i: int) -> UserResponse:
+    now = datetime.now(timezone.utc)
+    return UserResponse(
+        id=f"00000000-0000-0000-0000-{i:012d}",
+        email=f"user{i}@example.com",
+        first_name="Ada",
+        last_name="Lovelace",
+        phone="+15555550100",
+        is_verified=True,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _payloads() -> dict:
+    token = Token(access_token="a" * 180, refresh_token="r" * 160, expires_in=1800)
+    return {
+        "token": token.model_dump(mode="json"),
+        "user": _user(1).model_dump(mode="json"),
+        "users_1k": [_user(i).model_dump(mode="json") for i in range(1000)],
+    }
+
+
+def _stdlib(obj) -> bytes:
+    return json.dumps(
+        obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def main():
+    for name, payload in _payloads().items():
+        number = 200 if name == "users_1k" else 50000
+        baseline = min(timeit.repeat(lambda: _stdlib(payload), number=number, repeat=5))
+        fast = min(timeit.repeat(lambda: dumps_bytes(payload), number=number, repeat=5))
+        print(
+            f"{name:<10} stdlib {baseline / number * 1e6:9.2f} us  "
+            f"fast {fast / number * 1e6:9.2f} us  "
+            f"speedup {baseline / fast:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Group balances and settle-up at scale.
+
+Builds groups of increasing size with many random expenses, then
+compares recomputing balances by replaying every expense against reading
+the incrementally maintained totals, and times settle_up() on the result.
+Also reports how many transfers it needs against the n - 1 upper bound.
+
+    python -m benchmarks.bench_settle_up
+"""
+
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List
+from app.models.group import GroupExpense
+from app.services.groups import balance_changes, settle_up, split_equally
+
+SIZES = [(10, 5000), (100, 20000), (1000, 100000)]  # (members, expenses)
+
+
+def _expenses(members: List[str], count: int, seed: int) -> List[GroupExpense]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    expenses = []
+    for _ in range(count):
+        amount = rng.randint(100, 50000)
+        participants = rng.sample(members, min(len(members), rng.randint(2, 8)))
+        expenses.append(
+            GroupExpense(
+                id=str(uuid.uuid4()),
+                group_id="bench",
+                paid_by=rng.choice(participants),
+                amount_cents=amount,
+                shares=split_equally(amount, participants),
+                description=None,
+                kind="expense",
+                created_at=now,
+            )
+        )
+    return expenses
+
+
+def _replay(expenses: List[GroupExpense]) -> Dict[str, int]:
+    balances: Dict[str, int] = defaultdict(int)
+    for expense in expenses:
+        for user_id, cents in balance_changes(expense).items():
+            balances[user_id] += cents
+    return balances
+
+
+def main():
+    for size, count in SIZES:
+        members = [str(uuid.uuid4()) for _ in range(size)]
+        expenses = _expenses(members, count, seed=size)
+
+        started = time.perf_counter()
+        balances = _replay(expenses)
+        replay = time.perf_counter() - started
+
+        # What the service does per expense instead: fold in one more
+        extra = _expenses(members, 1, seed=size + 1)[0]
+        updated = dict(balances)
+        started = time.perf_counter()
+        for user_id, cents in balance_changes(extra).items():
+            updated[user_id] += cents
+        incremental = time.perf_counter() - started
+
+        started = time.perf_counter()
+        transfers = settle_up(balances)
+        settle = time.perf_counter() - started
+
+        remaining: Dict[str, int] = dict(balances)
+        for debtor, creditor, cents in transfers:
+            remaining[debtor] += cents
+            remaining[creditor] -= cents
+        assert not any(remaining.values())
+
+        debtors = sum(1 for cents in balances.values() if cents)
+        print(
+            f"{size:>5} members, {count:>6} expenses: "
+            f"replay {replay * 1000:7.1f} ms, "
+            f"incremental {incremental * 1e6:5.1f} us, "
+            f"settle-up {settle * 1000:6.2f} ms, "
+            f"{len(transfers)} transfers (bound {max(debtors - 1, 0)})"
+        )
+
+
+if __name__ == "__main__":
+    main()
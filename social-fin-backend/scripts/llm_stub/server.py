@@ -0,0 +1,93 @@
+"""
+Local stand-in for an OpenAI-compatible chat completions endpoint.
+
+Answers /v1/chat/completions deterministically from the prompt (so the
+same input gets the same text) and supports `"stream": true` with
+server-sent chunks. LLM_STUB_TOKEN_DELAY sets the seconds between
+streamed tokens, and LLM_STUB_LATENCY the delay before any answer, to
+mimic a real model.
+
+    uvicorn scripts.llm_stub.server:app --port 8200
+    OPENAI_BASE_URL=http://localhost:8200/v1 uvicorn app.main:app
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import AsyncIterator, List
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+
+TOKEN_DELAY = float(os.environ.get("LLM_STUB_TOKEN_DELAY", "0.02"))
+LATENCY = float(os.environ.get("LLM_STUB_LATENCY", "0.2"))
+
+app = FastAPI(title="LLM stand-in")
+
+
+def _answer(messages: List[dict], max_tokens: int) -> List[str]:
+    prompt = messages[-1].get("content", "") if messages else ""
+    digest = hashlib.sha256(prompt.encode()).hexdigest()[:8]
+    try:
+        summary = json.loads(prompt)
+        categories = [c["category"] for c in summary.get("categories", [])]
+    except (ValueError, AttributeError, TypeError, KeyError):
+        categories = []
+    lines = [f"Insight {digest}:"]
+    for category in categories[:3] or ["everyday purchases"]:
+        lines.append(
+            f"- Spending on {category} is worth a look; "
+            f"try setting a monthly limit for it."
+        )
+    words = " ".join(lines).split(" ")
+    return [word if i == 0 else f" {word}" for i, word in enumerate(words)][:max_tokens]
+
+
+def _chunk(completion_id: str, delta: dict, finish_reason=None) -> str:
+    body = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": "stub",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(body)}\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(body: dict):
+    messages = body.get("messages")
+    if not isinstance(messages, list):
+        return JSONResponse(
+            status_code=400,
+            content={"error": {"message": "messages is required"}},
+        )
+    tokens = _answer(messages, int(body.get("max_tokens") or 256))
+    completion_id = f"chatcmpl-stub-{time.time_ns()}"
+    await asyncio.sleep(LATENCY)
+
+    if not body.get("stream"):
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "stub",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+
+    async def stream() -> AsyncIterator[str]:
+        yield _chunk(completion_id, {"role": "assistant"})
+        for token in tokens:
+            await asyncio.sleep(TOKEN_DELAY)
+            yield _chunk(completion_id, {"content": token})
+        yield _chunk(completion_id, {}, finish_reason="stop")
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
@@ -0,0 +1,59 @@
+"""
+Local stand-in for the Plaid endpoints used by the sync pipeline.
+
+Replays recorded /transactions/sync responses from fixtures/<access_token>.json.
+Each fixture maps the request cursor ("" for the first call) to a recorded
+response page; unknown cursors return an empty, fully-synced page.
+
+    uvicorn scripts.plaid_stub.server:app --port 8100
+    PLAID_BASE_URL=http://localhost:8100 python -m scripts.run_plaid_sync ...
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+app = FastAPI(title="Plaid stand-in")
+
+
+@lru_cache()
+def _load_fixture(access_token: str) -> dict:
+    path = FIXTURES_DIR / f"{access_token}.json"
+    if not path.is_file():
+        return {}
+    return json.loads(path.read_text())
+
+
+def _error(status_code: int, error_code: str, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "error_type": "INVALID_INPUT",
+            "error_code": error_code,
+            "error_message": message,
+        },
+    )
+
+
+@app.post("/transactions/sync")
+async def transactions_sync(body: dict):
+    fixture = _load_fixture(body.get("access_token", ""))
+    if not fixture:
+        return _error(400, "INVALID_ACCESS_TOKEN", "unknown access token")
+
+    cursor = body.get("cursor") or ""
+    page = fixture["pages"].get(cursor)
+    if page is None:
+        return {
+            "added": [],
+            "modified": [],
+            "removed": [],
+            "next_cursor": cursor,
+            "has_more": False,
+            "request_id": "stub",
+        }
+    return {**page, "request_id": "stub"}
@@ -0,0 +1,67 @@
+"""
+Run the transaction sync engine for one item.
+
+Against the local stand-in (no database writes):
+
+    PLAID_BASE_URL=http://localhost:8100 \
+        python -m scripts.run_plaid_sync --access-token access-sandbox-demo --dry-run
+
+Against a real item stored in `plaid_items`:
+
+    python -m scripts.run_plaid_sync --item-id <item_id>
+"""
+
+import argparse
+import asyncio
+from typing import List
+from app.models.plaid_item import PlaidItem
+from app.services.plaid_client import plaid_client
+from app.services.plaid_sync import SyncPage, TransactionSyncEngine
+
+
+class DryRunSyncEngine(TransactionSyncEngine):
+    """Sync engine that reports pages instead of writing them"""
+
+    async def _store_page(self, page: SyncPage):
+        print(
+            f"page: +{len(page.added)} ~{len(page.modified)} -{len(page.removed)} "
+            f"next_cursor={page.next_cursor}"
+        )
+
+    @staticmethod
+    def _save_cursor(item_id: str, cursor: str):
+        print(f"cursor for {item_id} -> {cursor}")
+
+
+async def main(args: argparse.Namespace):
+    engine = DryRunSyncEngine() if args.dry_run else TransactionSyncEngine()
+    if args.item_id:
+        item = await asyncio.to_thread(engine.load_item, args.item_id)
+        if item is None:
+            raise SystemExit(f"Item {args.item_id} not found")
+        items: List[PlaidItem] = [item]
+    else:
+        items = [
+            PlaidItem(
+                id="item-local",
+                user_id="user-local",
+                access_token=args.access_token,
+                institution_id="ins_local",
+                cursor=args.cursor,
+            )
+        ]
+
+    try:
+        for result in await engine.sync_items(items):
+            print(result)
+    finally:
+        await plaid_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--item-id")
+    parser.add_argument("--access-token", default="access-sandbox-demo")
+    parser.add_argument("--cursor")
+    parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(main(parser.parse_args()))
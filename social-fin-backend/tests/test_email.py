@@ -0,0 +1,125 @@
+"""Pooled email sending and batch retries against a local SMTP sink"""
+
+import socket
+import pytest
+from app.services.email import DomainRateLimiter, EmailDispatcher, SMTPConnectionPool
+from app.tasks import email as email_tasks
+
+controller = pytest.importorskip("aiosmtpd.controller")
+
+
+class Sink:
+    """Accepts mail, remembering which connection delivered each message"""
+
+    def __init__(self):
+        self.delivered = []
+        self.fail_on = set()
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        if self.received in self.fail_on:
+            return "451 Try again later"
+        self.delivered.append((id(session), envelope.rcpt_tos[0]))
+        return "250 OK"
+
+    @property
+    def recipients(self):
+        return [recipient for _, recipient in self.delivered]
+
+    @property
+    def connections(self):
+        return len({session for session, _ in self.delivered})
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def sink():
+    handler = Sink()
+    server = controller.Controller(handler, hostname="127.0.0.1", port=_free_port())
+    server.start()
+    handler.port = server.port
+    yield handler
+    server.stop()
+
+
+def _dispatcher(sink: Sink, size: int, per_connection: int = 100) -> EmailDispatcher:
+    pool = SMTPConnectionPool(
+        "127.0.0.1",
+        sink.port,
+        use_tls=False,
+        size=size,
+        max_messages_per_connection=per_connection,
+        timeout=5,
+    )
+    return EmailDispatcher(pool=pool, rate_limiter=DomainRateLimiter(0))
+
+
+def _emails(count: int):
+    return [
+        ("welcome", f"user{i}@example.test", {"first_name": f"User{i}"})
+        for i in range(count)
+    ]
+
+
+def test_batch_is_split_across_pooled_connections(sink):
+    dispatcher = _dispatcher(sink, size=2)
+
+    stats = dispatcher.send_batch(_emails(10))
+    dispatcher.pool.close()
+
+    assert (stats.sent, stats.failed, stats.unsent) == (10, 0, [])
+    assert sorted(sink.recipients) == sorted(to for _, to, _ in _emails(10))
+    assert sink.connections == 2
+
+
+def test_single_sends_reuse_a_connection_until_its_message_limit(sink):
+    dispatcher = _dispatcher(sink, size=1, per_connection=3)
+
+    for template, to, context in _emails(5):
+        dispatcher.send(template, to, context)
+    dispatcher.pool.close()
+
+    assert len(sink.recipients) == 5
+    assert sink.connections == 2
+
+
+def test_transient_error_reports_the_rest_of_the_share_unsent(sink):
+    sink.fail_on = {3}
+    dispatcher = _dispatcher(sink, size=1)
+
+    stats = dispatcher.send_batch(_emails(5))
+
+    assert stats.sent == 2
+    assert stats.unsent == [2, 3, 4]
+
+
+def test_batch_task_retries_only_unsent_recipients(sink, monkeypatch):
+    sink.fail_on = {3}
+    monkeypatch.setattr(email_tasks, "email_dispatcher", _dispatcher(sink, size=1))
+    retries = []
+
+    class Retry(Exception):
+        pass
+
+    def retry(args, countdown):
+        retries.append(args)
+        return Retry()
+
+    monkeypatch.setattr(email_tasks.send_email_batch, "retry", retry)
+    recipients = [
+        {"email": to, "first_name": context["first_name"]}
+        for _, to, context in _emails(5)
+    ]
+
+    with pytest.raises(Retry):
+        email_tasks.send_email_batch.run("welcome", recipients)
+    assert retries == [("welcome", recipients[2:])]
+
+    email_tasks.send_email_batch.run(*retries[0])
+    assert sorted(sink.recipients) == sorted(r["email"] for r in recipients)
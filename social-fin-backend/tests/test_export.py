@@ -0,0 +1,78 @@
+"""Export memory stays flat however long the transaction history is"""
+
+import random
+import tracemalloc
+from datetime import date, timedelta
+from typing import Dict, Iterator
+import pytest
+from app.config import settings
+from app.services.export import (
+    csv_chunks,
+    ndjson_chunks,
+    parquet_available,
+    parquet_chunks,
+)
+
+SMALL = 5_000
+LARGE = 40_000  # Eight times as many rows
+
+
+def _rows(count: int) -> Iterator[Dict[str, object]]:
+    rng = random.Random(7)
+    start = date(2015, 1, 1)
+    for i in range(count):
+        day = (start + timedelta(days=i * 3650 // count)).isoformat()
+        yield {
+            "id": f"txn-{i:09d}",
+            "date": day,
+            "authorized_date": day,
+            "amount": round(rng.uniform(-3000, 500), 2),
+            "iso_currency_code": "USD",
+            "name": f"Coffee Shop #{rng.randint(1, 9999)}",
+            "merchant_name": "Coffee Shop",
+            "category": "FOOD_AND_DRINK",
+            "category_detailed": None,
+            "pending": False,
+            "account_id": "account-1",
+            "item_id": "item-1",
+        }
+
+
+def _peak_bytes(formatter, count: int) -> int:
+    """Peak traced heap while the export is consumed and discarded"""
+    tracemalloc.start()
+    try:
+        for _ in formatter(_rows(count)):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    # Several chunks and row groups even at the small size
+    monkeypatch.setattr(settings, "export_chunk_rows", 500)
+    monkeypatch.setattr(settings, "export_parquet_row_group_rows", 1000)
+
+
+@pytest.mark.parametrize(
+    "formatter",
+    [
+        pytest.param(csv_chunks, id="csv"),
+        pytest.param(ndjson_chunks, id="ndjson"),
+        pytest.param(
+            parquet_chunks,
+            id="parquet",
+            marks=pytest.mark.skipif(
+                not parquet_available(), reason="pyarrow is not installed"
+            ),
+        ),
+    ],
+)
+def test_peak_memory_does_not_grow_with_rows(formatter):
+    _peak_bytes(formatter, SMALL)  # Warm up imports and caches
+    small = _peak_bytes(formatter, SMALL)
+    large = _peak_bytes(formatter, LARGE)
+    # Buffering the output would grow about eightfold
+    assert large <= small * 1.5, f"peak grew from {small:,} to {large:,} bytes"
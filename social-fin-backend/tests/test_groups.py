@@ -0,0 +1,77 @@
+"""Group balance rebuilds racing expense writes, and unknown groups"""
+
+import asyncio
+from datetime import datetime, timezone
+import fakeredis
+import pytest
+from app.models.group import GroupExpense
+from app.services.groups import _APPLY_SCRIPT, GroupService, _entry, balance_changes
+
+GROUP_ID = "group-1"
+
+
+def _expense(expense_id: str, paid_by: str, owed_by: str, cents: int):
+    return GroupExpense(
+        id=expense_id,
+        group_id=GROUP_ID,
+        paid_by=paid_by,
+        amount_cents=cents,
+        shares={owed_by: cents},
+        description=None,
+        kind="expense",
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def groups(server):
+    return GroupService(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+
+
+def test_rebuild_keeps_an_expense_applied_while_history_loads(groups, server):
+    database = {"members": ["a", "b"], "expenses": [_expense("e1", "a", "b", 500)]}
+    writer = fakeredis.FakeRedis(server=server, decode_responses=True)
+    loads = []
+
+    def load_history(group_id):
+        history = database["members"], list(database["expenses"])
+        if not loads:
+            # Another request inserts and applies an expense meanwhile
+            late = _expense("e2", "b", "a", 200)
+            database["expenses"].append(late)
+            writer.eval(
+                _APPLY_SCRIPT,
+                2,
+                groups._balances_key(GROUP_ID),
+                groups._ledger_key(GROUP_ID),
+                late.id,
+                1,
+                _entry(balance_changes(late)),
+            )
+        loads.append(group_id)
+        return history
+
+    groups._load_history = load_history
+    assert asyncio.run(groups.rebuild(GROUP_ID)) == 2
+
+    assert len(loads) == 2
+    assert asyncio.run(groups.get_balances(GROUP_ID)) == {"a": 300, "b": -300}
+
+
+def test_unknown_group_is_not_reloaded_on_every_call(groups):
+    loads = []
+
+    def load_history(group_id):
+        loads.append(group_id)
+        return [], []
+
+    groups._load_history = load_history
+    for _ in range(3):
+        assert asyncio.run(groups.get_balances(GROUP_ID)) == {}
+
+    assert loads == [GROUP_ID]
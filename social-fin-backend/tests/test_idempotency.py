@@ -0,0 +1,84 @@
+"""Idempotency-Key replay, credential withholding and Redis failures"""
+
+import pytest
+import redis.asyncio as redis
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from app.core.idempotency import InMemoryIdempotencyStore
+from app.middleware.idempotency import IdempotencyMiddleware
+
+
+class FailingCompleteStore(InMemoryIdempotencyStore):
+    async def complete(self, key, record, ttl):
+        raise redis.ConnectionError("Redis went away")
+
+
+def _client(store) -> TestClient:
+    app = FastAPI()
+    calls = {"count": 0}
+
+    @app.post("/api/v1/things")
+    async def create_thing(response: Response):
+        calls["count"] += 1
+        response.set_cookie("a", "1")
+        response.set_cookie("b", "2")
+        return {"count": calls["count"]}
+
+    @app.post("/api/v1/auth/refresh")
+    async def refresh():
+        calls["count"] += 1
+        return {"access_token": f"token-{calls['count']}"}
+
+    app.add_middleware(IdempotencyMiddleware, store=store, include_paths=["/api/v1/"])
+    client = TestClient(app)
+    client.calls = calls
+    return client
+
+
+@pytest.fixture
+def store():
+    return InMemoryIdempotencyStore()
+
+
+def test_replay_returns_first_response_with_every_header(store):
+    client = _client(store)
+    headers = {"Idempotency-Key": "k1"}
+
+    first = client.post("/api/v1/things", headers=headers)
+    second = client.post("/api/v1/things", headers=headers)
+
+    assert client.calls["count"] == 1
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    cookies = second.headers.get_list("set-cookie")
+    assert len(cookies) == 2
+    assert {cookie.split(";")[0] for cookie in cookies} == {"a=1", "b=2"}
+
+
+def test_credential_responses_are_not_replayed(store):
+    client = _client(store)
+    headers = {"Idempotency-Key": "k2"}
+
+    first = client.post("/api/v1/auth/refresh", headers=headers)
+    second = client.post("/api/v1/auth/refresh", headers=headers)
+
+    assert first.json() == {"access_token": "token-1"}
+    assert second.status_code == 409
+    assert "token" not in second.text
+    assert client.calls["count"] == 1
+    stored = store._records[next(iter(store._records))][1]
+    assert stored.withheld and stored.body == b"" and stored.headers == []
+
+
+def test_failure_to_store_returns_real_response_and_frees_key():
+    store = FailingCompleteStore()
+    client = _client(store)
+    headers = {"Idempotency-Key": "k3"}
+
+    response = client.post("/api/v1/things", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json() == {"count": 1}
+    assert store._records == {}
+    # The key is free, so a retry runs instead of waiting on a dead claim
+    assert client.post("/api/v1/things", headers=headers).json() == {"count": 2}
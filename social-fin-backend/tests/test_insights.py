@@ -0,0 +1,32 @@
+"""Batch insight generation"""
+
+import asyncio
+from datetime import datetime, timezone
+from app.config import settings
+from app.services.insights import Insight, InsightService
+
+
+def test_generate_all_runs_a_bounded_pool_over_every_user(monkeypatch):
+    monkeypatch.setattr(settings, "insights_batch_concurrency", 3)
+    service = InsightService(redis_client=None)
+    running = {"now": 0, "peak": 0}
+    seen = []
+
+    async def get_insight(user_id: str) -> Insight:
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0)
+        running["now"] -= 1
+        seen.append(user_id)
+        if user_id == "u3":
+            raise RuntimeError("Model unavailable")
+        return Insight("text", datetime.now(timezone.utc), cached=user_id == "u0")
+
+    service.get_insight = get_insight
+    user_ids = (f"u{i}" for i in range(10))
+
+    counts = asyncio.run(service.generate_all(user_ids))
+
+    assert counts == {"generated": 8, "cached": 1, "failed": 1}
+    assert sorted(seen) == sorted(f"u{i}" for i in range(10))
+    assert running["peak"] == 3
@@ -0,0 +1,87 @@
+"""Per-key cache versions and invalidation sequence gaps"""
+
+import fakeredis
+import pytest
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.invalidation import InvalidationBus, InvalidationEvent
+from app.core.serialization import dumps
+
+
+def test_delete_refuses_only_loads_of_that_key():
+    cache = TTLCache()
+    version = cache.version
+
+    cache.delete("a")
+    cache.set("a", 1, version=version)
+    cache.set("b", 2, version=version)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_clear_refuses_every_earlier_load():
+    cache = TTLCache()
+    version = cache.version
+
+    cache.clear()
+    cache.set("a", 1, version=version)
+    cache.set("a", 1, version=cache.version)
+
+    assert cache.get("a") == 1
+    cache.clear()
+    assert "a" not in cache
+
+
+def test_forgotten_deletes_still_refuse_earlier_loads():
+    cache = TTLCache(maxsize=2)
+    version = cache.version
+
+    for key in ("a", "b", "c"):
+        cache.delete(key)
+    cache.set("a", 1, version=version)
+
+    assert cache.get("a") is None
+
+
+@pytest.fixture
+def bus():
+    bus = InvalidationBus(fakeredis.FakeAsyncRedis(decode_responses=True))
+    bus.cache = TTLCache()
+    bus.register_cache(bus.cache, InvalidationEvent.PROFILE_CHANGED)
+    return bus
+
+
+def _deliver(bus, seq: int, key: str = "other"):
+    bus._receive(
+        dumps(
+            {
+                "origin": "elsewhere",
+                "seq": seq,
+                "events": [[InvalidationEvent.PROFILE_CHANGED.value, key]],
+            }
+        )
+    )
+
+
+def test_out_of_order_messages_keep_caches(bus, monkeypatch):
+    monkeypatch.setattr(settings, "invalidation_gap_grace_seconds", 0)
+    bus.cache.set("kept", 1)
+    _deliver(bus, 1)
+    _deliver(bus, 3)
+    _deliver(bus, 2)
+
+    bus._check_gaps()
+
+    assert bus.cache.get("kept") == 1
+
+
+def test_lost_message_clears_caches_after_grace(bus, monkeypatch):
+    monkeypatch.setattr(settings, "invalidation_gap_grace_seconds", 0)
+    bus.cache.set("kept", 1)
+    _deliver(bus, 1)
+    _deliver(bus, 3)
+
+    bus._check_gaps()
+
+    assert bus.cache.get("kept") is None
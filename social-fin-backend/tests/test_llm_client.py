@@ -0,0 +1,114 @@
+"""LLM client against the local stand-in, failures, and the insights SSE stream"""
+
+import asyncio
+import json
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1 import insights
+from app.core.exceptions import LLMError
+from app.dependencies import get_current_user
+from app.services.llm_client import LLMClient
+from scripts.llm_stub import server as llm_stub
+
+MESSAGES = [{"role": "user", "content": json.dumps({"categories": []})}]
+
+
+def _client(transport: httpx.AsyncBaseTransport) -> LLMClient:
+    client = LLMClient(base_url="http://llm.test/v1")
+    client._client = httpx.AsyncClient(base_url=client.base_url, transport=transport)
+    return client
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setattr(llm_stub, "LATENCY", 0)
+    monkeypatch.setattr(llm_stub, "TOKEN_DELAY", 0)
+    return _client(httpx.ASGITransport(app=llm_stub.app))
+
+
+async def _collect(client: LLMClient, max_tokens: int = 64) -> str:
+    return "".join([text async for text in client.stream(MESSAGES, max_tokens)])
+
+
+def test_complete_and_stream_return_the_same_text(stub):
+    async def run():
+        whole = await stub.complete(MESSAGES, 64)
+        streamed = await _collect(stub)
+        await stub.close()
+        return whole, streamed
+
+    whole, streamed = asyncio.run(run())
+
+    assert whole.startswith("Insight ")
+    assert streamed == whole
+
+
+def test_error_responses_carry_the_service_message():
+    def reject(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, json={"error": {"message": "Slow down"}})
+
+    client = _client(httpx.MockTransport(reject))
+
+    with pytest.raises(LLMError) as complete_error:
+        asyncio.run(client.complete(MESSAGES, 64))
+    with pytest.raises(LLMError) as stream_error:
+        asyncio.run(_collect(client))
+
+    for error in (complete_error.value, stream_error.value):
+        assert str(error) == "Slow down"
+        assert error.status_code == 429
+
+
+def test_transport_failures_become_llm_errors():
+    def unreachable(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    client = _client(httpx.MockTransport(unreachable))
+
+    with pytest.raises(LLMError, match="unreachable"):
+        asyncio.run(client.complete(MESSAGES, 64))
+    with pytest.raises(LLMError, match="unreachable"):
+        asyncio.run(_collect(client))
+
+
+def test_stream_breaking_midway_becomes_an_llm_error():
+    class BrokenStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b'data: {"choices": [{"delta": {"content": "Hi"}}]}\n\n'
+            raise httpx.ReadError("Connection reset")
+
+    def broken(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, stream=BrokenStream())
+
+    client = _client(httpx.MockTransport(broken))
+    received = []
+
+    async def run():
+        async for text in client.stream(MESSAGES, 64):
+            received.append(text)
+
+    with pytest.raises(LLMError, match="unreachable"):
+        asyncio.run(run())
+    assert received == ["Hi"]
+
+
+def test_sse_stream_ends_with_an_error_event(monkeypatch):
+    async def failing_stream(user_id: str):
+        yield "Partial"
+        raise LLMError("Completion service unreachable")
+
+    monkeypatch.setattr(insights.insight_service, "stream_insight", failing_stream)
+    app = FastAPI()
+    app.include_router(insights.router)
+    app.dependency_overrides[get_current_user] = lambda: type("U", (), {"id": "u"})
+
+    response = TestClient(app).get("/insights/stream")
+
+    assert response.status_code == 200
+    events = response.text.strip().split("\n\n")
+    assert events[0] == 'data: {"text": "Partial"}'
+    assert events[-1] == (
+        'event: error\ndata: {"detail": "Insights are unavailable right now"}'
+    )
@@ -0,0 +1,119 @@
+"""Transaction sync pagination and cursors against the recorded Plaid stand-in"""
+
+import asyncio
+import httpx
+import pytest
+from app.core.exceptions import PlaidError
+from app.models.plaid_item import PlaidItem
+from app.services.plaid_client import PlaidClient
+from app.services.plaid_sync import MUTATION_DURING_PAGINATION, TransactionSyncEngine
+from scripts.plaid_stub import server as plaid_stub
+
+ACCESS_TOKEN = "access-sandbox-demo"
+
+
+class RecordingClient(PlaidClient):
+    """The real client over the stand-in, recording each requested cursor"""
+
+    def __init__(self):
+        super().__init__(base_url="http://plaid.test")
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url, transport=httpx.ASGITransport(app=plaid_stub.app)
+        )
+        self.cursors = []
+        self.fail_calls = set()
+
+    async def transactions_sync(self, access_token, cursor, count=500):
+        self.cursors.append(cursor)
+        if len(self.cursors) in self.fail_calls:
+            raise PlaidError(
+                "Data changed during pagination",
+                error_code=MUTATION_DURING_PAGINATION,
+                status_code=400,
+            )
+        return await super().transactions_sync(access_token, cursor, count)
+
+
+@pytest.fixture
+def engine():
+    engine = TransactionSyncEngine(client=RecordingClient())
+    engine.stored = {"upserted": [], "deleted": [], "cursors": []}
+    engine._upsert = engine.stored["upserted"].extend
+    engine._delete = engine.stored["deleted"].extend
+    engine._save_cursor = lambda item_id, cursor: engine.stored["cursors"].append(
+        (item_id, cursor)
+    )
+    return engine
+
+
+def _item(cursor=None, access_token=ACCESS_TOKEN) -> PlaidItem:
+    return PlaidItem(
+        id="item-1",
+        user_id="user-1",
+        access_token=access_token,
+        institution_id="ins_1",
+        cursor=cursor,
+    )
+
+
+def test_first_sync_follows_every_page_and_saves_the_last_cursor(engine):
+    item = _item()
+
+    result = asyncio.run(engine.sync_item(item))
+
+    assert engine.client.cursors == [None, "cursor_page_2", "cursor_page_3"]
+    assert result.pages == 3
+    assert (result.added, result.modified, result.removed) == (6, 1, 1)
+    assert len(engine.stored["upserted"]) == 7
+    assert len(engine.stored["deleted"]) == 1
+    assert engine.stored["cursors"] == [("item-1", "cursor_synced")]
+    assert item.cursor == "cursor_synced"
+
+
+def test_sync_resumes_from_the_stored_cursor(engine):
+    result = asyncio.run(engine.sync_item(_item(cursor="cursor_page_3")))
+
+    assert engine.client.cursors == ["cursor_page_3"]
+    assert (result.pages, result.added, result.removed) == (1, 1, 1)
+
+
+def test_synced_item_does_not_rewrite_its_cursor(engine):
+    result = asyncio.run(engine.sync_item(_item(cursor="cursor_synced")))
+
+    assert result.pages == 1
+    assert result.added == 0
+    assert engine.stored["cursors"] == []
+
+
+def test_mutation_during_pagination_restarts_from_the_original_cursor(engine):
+    engine.client.fail_calls = {3}
+
+    result = asyncio.run(engine.sync_item(_item()))
+
+    assert engine.client.cursors == [
+        None,
+        "cursor_page_2",
+        "cursor_page_3",
+        None,
+        "cursor_page_2",
+        "cursor_page_3",
+    ]
+    # Replayed pages are upserted again, which is harmless
+    assert result.pages == 5
+    assert result.cursor == "cursor_synced"
+    assert engine.stored["cursors"] == [("item-1", "cursor_synced")]
+
+
+def test_repeated_mutations_give_up_without_saving_a_cursor(engine):
+    engine.client.fail_calls = {2, 3, 4, 5}
+
+    with pytest.raises(PlaidError):
+        asyncio.run(engine.sync_item(_item()))
+    assert engine.stored["cursors"] == []
+
+
+def test_plaid_errors_are_reported_per_item(engine):
+    results = asyncio.run(engine.sync_items([_item(access_token="access-unknown")]))
+
+    assert results[0].error == "unknown access token"
+    assert engine.stored["cursors"] == []
@@ -0,0 +1,105 @@
+"""Session revocation, refresh-token reuse detection and the auth dependency"""
+
+import asyncio
+from types import SimpleNamespace
+import fakeredis
+import pytest
+from fastapi import HTTPException
+from app.core.cache import principal_cache
+from app.core.exceptions import InvalidTokenError
+from app.core.revocation import revocation_list
+from app.core.security import security_utils
+from app.dependencies import get_current_user
+from app.services.session import SessionService
+
+USER_ID = "user-1"
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(revocation_list, "redis", client)
+    monkeypatch.setattr(revocation_list, "_loaded", False)
+    yield SessionService(client)
+    principal_cache.clear()
+
+
+def _authenticate(token: str):
+    # Revocation evicts the principal; only the token itself should decide
+    principal_cache.set(USER_ID, SimpleNamespace(id=USER_ID))
+    request = SimpleNamespace(state=SimpleNamespace())
+    return asyncio.run(get_current_user(request, token))
+
+
+def _accepted(token: str) -> bool:
+    try:
+        _authenticate(token)
+    except HTTPException as exc:
+        assert exc.status_code == 401
+        return False
+    return True
+
+
+def _rotate(sessions: SessionService, refresh_token: str):
+    payload = security_utils.decode_token(refresh_token)
+    return asyncio.run(sessions.rotate(payload, "user@example.com"))
+
+
+def _session_id(token: str) -> str:
+    return security_utils.decode_token(token)["sid"]
+
+
+def test_revoking_a_session_rejects_every_access_token_it_issued(sessions):
+    first_access, refresh = asyncio.run(sessions.create(USER_ID, "user@example.com"))
+    second_access, refresh = _rotate(sessions, refresh)
+    third_access, _ = _rotate(sessions, refresh)
+    assert all(_accepted(t) for t in (first_access, second_access, third_access))
+
+    assert asyncio.run(sessions.revoke(USER_ID, _session_id(first_access)))
+
+    assert not any(_accepted(t) for t in (first_access, second_access, third_access))
+
+
+def test_refresh_token_reuse_revokes_the_session(sessions):
+    first_access, first_refresh = asyncio.run(
+        sessions.create(USER_ID, "user@example.com")
+    )
+    second_access, second_refresh = _rotate(sessions, first_refresh)
+
+    with pytest.raises(InvalidTokenError):
+        _rotate(sessions, first_refresh)
+
+    assert not _accepted(first_access)
+    assert not _accepted(second_access)
+    # The legitimate holder's refresh token died with the session
+    with pytest.raises(InvalidTokenError):
+        _rotate(sessions, second_refresh)
+
+
+def test_revoke_all_keeps_the_current_session(sessions):
+    current_access, _ = asyncio.run(sessions.create(USER_ID, "user@example.com"))
+    other_access, other_refresh = asyncio.run(
+        sessions.create(USER_ID, "user@example.com")
+    )
+    rotated_access, _ = _rotate(sessions, other_refresh)
+
+    asyncio.run(
+        sessions.revoke_all(USER_ID, except_session_id=_session_id(current_access))
+    )
+
+    assert _accepted(current_access)
+    assert not _accepted(other_access)
+    assert not _accepted(rotated_access)
+    remaining = asyncio.run(sessions.list_sessions(USER_ID))
+    assert [s.id for s in remaining] == [_session_id(current_access)]
+
+
+def test_dependency_skips_redis_for_unrevoked_tokens_once_loaded(sessions):
+    access, _ = asyncio.run(sessions.create(USER_ID, "user@example.com"))
+    asyncio.run(revocation_list.load())
+
+    async def unreachable(*args, **kwargs):
+        raise AssertionError("Redis consulted for an unrevoked token")
+
+    sessions.redis.exists = unreachable
+    assert _authenticate(access).id == USER_ID
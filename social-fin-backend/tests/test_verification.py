@@ -0,0 +1,90 @@
+"""Verification code resend"""
+
+import asyncio
+from types import SimpleNamespace
+import fakeredis
+import pytest
+from app.core.exceptions import VerificationResendThrottledError
+from app.core.verification import VerificationCodeStore
+from app.services.auth import AuthService
+
+
+class FakeTable:
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = {}
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def limit(self, count):
+        return self
+
+    def execute(self):
+        data = [
+            {"id": row["id"]}
+            for row in self.rows
+            if all(row.get(k) == v for k, v in self.filters.items())
+        ]
+        return SimpleNamespace(data=data)
+
+
+class FakeServiceClient:
+    def __init__(self, users):
+        self.users = users
+        self.auth = SimpleNamespace(
+            admin=SimpleNamespace(
+                get_user_by_id=lambda user_id: SimpleNamespace(
+                    user=self.users[user_id]
+                ),
+                list_users=self._no_scan,
+            )
+        )
+
+    @staticmethod
+    def _no_scan():
+        raise AssertionError("resend must not scan every user")
+
+    def table(self, name):
+        assert name == "user_profiles"
+        return FakeTable(
+            [{"id": user_id, "email": u.email} for user_id, u in self.users.items()]
+        )
+
+
+@pytest.fixture
+def service():
+    service = AuthService()
+    service.verification_codes = VerificationCodeStore(
+        fakeredis.FakeAsyncRedis(decode_responses=True)
+    )
+    service.service_client = FakeServiceClient(
+        {
+            "u1": SimpleNamespace(email="new@example.com", email_confirmed_at=None),
+            "u2": SimpleNamespace(email="done@example.com", email_confirmed_at="x"),
+        }
+    )
+    service.sent = []
+
+    async def send(email, user_id):
+        service.sent.append((email, user_id))
+
+    service._send_verification_code = send
+    return service
+
+
+def test_resend_issues_code_only_to_unverified_accounts(service):
+    for email in ("new@example.com", "done@example.com", "nobody@example.com"):
+        asyncio.run(service.resend_verification_code(email))
+    assert service.sent == [("new@example.com", "u1")]
+
+
+def test_resend_is_throttled_per_address(service):
+    asyncio.run(service.resend_verification_code("new@example.com"))
+    with pytest.raises(VerificationResendThrottledError):
+        asyncio.run(service.resend_verification_code("new@example.com"))
+    assert len(service.sent) == 1